@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import os
+
+from api.scrapers import vlr_live_score
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two scrapes of the live scores while anyone is subscribed.
+LIVE_POLL_INTERVAL = float(os.environ.get("VLR_LIVE_POLL_INTERVAL", 5))
+# Events buffered per subscriber before a slow one is resynced with a snapshot.
+SUBSCRIBER_BUFFER = 64
+
+# Fields of a live match that change while it is being played.
+TRACKED_FIELDS = (
+    "score1",
+    "score2",
+    "team1_round_ct",
+    "team1_round_t",
+    "team2_round_ct",
+    "team2_round_t",
+    "current_map",
+    "map_number",
+)
+
+
+def diff_live_scores(previous, current):
+    """
+    Compare two live score snapshots.
+
+    Args:
+        previous (dict): Match page URL to LiveMatch, as of the last poll
+        current (dict): Match page URL to LiveMatch, as of this poll
+
+    Returns:
+        dict: "added" matches, "removed" match pages and "changed" entries holding
+            only the TRACKED_FIELDS that differ, or None if nothing changed
+    """
+    added = [match for url, match in current.items() if url not in previous]
+    removed = [url for url in previous if url not in current]
+    changed = []
+    for url, match in current.items():
+        before = previous.get(url)
+        if before is None:
+            continue
+        fields = {
+            field: getattr(match, field)
+            for field in TRACKED_FIELDS
+            if getattr(match, field) != getattr(before, field)
+        }
+        if fields:
+            changed.append({"match_page": url, "fields": fields})
+    if not (added or removed or changed):
+        return None
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+class LiveFeed:
+    """
+    Scrape live scores once per interval and push the differences to subscribers.
+
+    The poller starts with the first subscriber and stops after the last one
+    leaves. A new subscriber first receives a "snapshot" event with every live
+    match, then an "update" event whenever a poll finds a difference.
+    """
+
+    def __init__(self, interval=LIVE_POLL_INTERVAL):
+        self.interval = interval
+        self._subscribers = set()
+        self._snapshot = None
+        self._task = None
+
+    def _snapshot_event(self):
+        return {"type": "snapshot", "matches": list(self._snapshot.values())}
+
+    def subscribe(self):
+        """Register a subscriber and return the asyncio.Queue its events arrive on."""
+        queue = asyncio.Queue(SUBSCRIBER_BUFFER)
+        self._subscribers.add(queue)
+        if self._snapshot is not None:
+            queue.put_nowait(self._snapshot_event())
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return queue
+
+    def unsubscribe(self, queue):
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+            # The next subscriber must not be sent a snapshot that is out of date
+            self._snapshot = None
+
+    def _publish(self, event):
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # The subscriber fell behind; replace its backlog with the current state
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._snapshot_event())
+
+    async def poll(self):
+        """Scrape the live scores once and publish what changed since the last poll."""
+        data = await vlr_live_score()
+        current = {match.match_page: match for match in data["data"]["segments"]}
+        previous = self._snapshot
+        self._snapshot = current
+        if previous is None:
+            self._publish(self._snapshot_event())
+            return
+        changes = diff_live_scores(previous, current)
+        if changes is not None:
+            self._publish({"type": "update", **changes})
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.warning("Live score poll failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    async def stop(self):
+        """Stop the poller; called on application shutdown."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+live_feed = LiveFeed()
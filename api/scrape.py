@@ -1,8 +1,14 @@
+import asyncio
+
 from api.scrapers import (
     check_health,
     vlr_live_score,
     vlr_match_details,
+    vlr_match_details_batch,
+    vlr_match_details_stream,
+    vlr_match_map,
     vlr_match_results,
+    vlr_match_results_stream,
     vlr_news,
     vlr_rankings,
     vlr_stats,
@@ -12,37 +18,53 @@ from api.scrapers import (
 
 class Vlr:
     @staticmethod
-    def vlr_news():
-        return vlr_news()
+    async def vlr_news():
+        return await vlr_news()
+
+    @staticmethod
+    async def vlr_rankings(region):
+        return await vlr_rankings(region)
+
+    @staticmethod
+    async def vlr_stats(region: str, timespan: str):
+        return await vlr_stats(region, timespan)
+
+    @staticmethod
+    async def vlr_upcoming_matches(num_pages=1, from_page=None, to_page=None):
+        return await vlr_upcoming_matches(num_pages, from_page, to_page)
+
+    @staticmethod
+    async def vlr_live_score(num_pages=1, from_page=None, to_page=None):
+        return await vlr_live_score(num_pages, from_page, to_page)
 
     @staticmethod
-    def vlr_rankings(region):
-        return vlr_rankings(region)
+    async def vlr_match_results(num_pages=1, from_page=None, to_page=None, max_retries=3, request_delay=1.0, timeout=30, concurrency=None):
+        return await vlr_match_results(num_pages, from_page, to_page, max_retries, request_delay, timeout, concurrency)
 
     @staticmethod
-    def vlr_stats(region: str, timespan: str):
-        return vlr_stats(region, timespan)
+    async def vlr_match_results_stream(num_pages=1, from_page=None, to_page=None, max_retries=3, request_delay=1.0, timeout=30, concurrency=None):
+        return await vlr_match_results_stream(num_pages, from_page, to_page, max_retries, request_delay, timeout, concurrency)
 
     @staticmethod
-    def vlr_upcoming_matches(num_pages=1, from_page=None, to_page=None):
-        return vlr_upcoming_matches(num_pages, from_page, to_page)
+    async def vlr_match_details(match_url, compact=False, include=None):
+        return await vlr_match_details(match_url, compact, include)
 
     @staticmethod
-    def vlr_live_score(num_pages=1, from_page=None, to_page=None):
-        return vlr_live_score(num_pages, from_page, to_page)
+    async def vlr_match_map(match_url, game_id, compact=False, include=None):
+        return await vlr_match_map(match_url, game_id, compact, include)
 
     @staticmethod
-    def vlr_match_results(num_pages=1, from_page=None, to_page=None, max_retries=3, request_delay=1.0, timeout=30):
-        return vlr_match_results(num_pages, from_page, to_page, max_retries, request_delay, timeout)
+    async def vlr_match_details_batch(match_urls, concurrency=None):
+        return await vlr_match_details_batch(match_urls, concurrency)
 
     @staticmethod
-    def vlr_match_details(match_url):
-        return vlr_match_details(match_url)
+    def vlr_match_details_stream(match_urls, concurrency=None):
+        return vlr_match_details_stream(match_urls, concurrency)
 
     @staticmethod
-    def check_health():
-        return check_health()
+    async def check_health():
+        return await check_health()
 
 
 if __name__ == "__main__":
-    print(Vlr.vlr_live_score())
+    print(asyncio.run(Vlr.vlr_live_score()))
@@ -1,6 +1,6 @@
 from .news import vlr_news
 from .rankings import vlr_rankings
 from .stats import vlr_stats
-from .matches import vlr_upcoming_matches, vlr_live_score, vlr_match_results
-from .matchDetails import vlr_match_details
+from .matches import vlr_upcoming_matches, vlr_live_score, vlr_match_results, vlr_match_results_stream
+from .matchDetails import vlr_match_details, vlr_match_map, vlr_match_details_batch, vlr_match_details_stream
 from .health import check_health
@@ -0,0 +1,248 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
+from selectolax.lexbor import LexborHTMLParser
+
+from utils import timing
+from utils.fetch import fetch
+from utils.metrics import CACHE_LOOKUPS, PARSE_LATENCY, page_type
+from utils.singleflight import flights
+
+# Maximum number of pages of a single match fetched at the same time.
+MATCH_FETCH_CONCURRENCY = int(os.environ.get("VLR_MATCH_FETCH_CONCURRENCY", 5))
+# Seconds a parsed page is shared by every request of the process, so e.g.
+# single-map requests for each map of a match fetch its main page once.
+DOCUMENT_TTL = float(os.environ.get("VLR_DOCUMENT_TTL", 15))
+# Parsed pages kept at most; a match page tree takes a few MB.
+DOCUMENT_CACHE_SIZE = int(os.environ.get("VLR_DOCUMENT_CACHE_SIZE", 32))
+
+
+def parse_html(text):
+    return LexborHTMLParser(text)
+
+
+# selectolax includes the node itself in css()/css_first() results when it
+# matches the selector; the extractors only ever want its descendants.
+def descendants(node, selector):
+    """Return the descendants of node matching selector, excluding node itself."""
+    own_id = getattr(node, "mem_id", None)
+    return [n for n in node.css(selector) if n.mem_id != own_id]
+
+
+def first_descendant(node, selector):
+    """Return the first descendant of node matching selector, or None."""
+    own_id = getattr(node, "mem_id", None)
+    for n in node.css(selector):
+        if n.mem_id != own_id:
+            return n
+    return None
+
+
+def child_elements(node, tag=None):
+    """Return the element children of node, optionally only those with a given tag."""
+    return [
+        n for n in node.iter()
+        if not n.tag.startswith("-") and (tag is None or n.tag == tag)
+    ]
+
+
+def class_list(node):
+    """Return the class list of node."""
+    return (node.attributes.get("class") or "").split()
+
+
+def performance_url(match_url, game_id=None):
+    """Build the performance tab URL of a match, for one game or for all of them."""
+    base = match_url.split("?")[0]
+    return f"{base}?tab=performance&game={game_id or 'all'}"
+
+
+class MatchIndex:
+    """
+    The per-map elements of a match page, keyed by data-game-id.
+
+    One selector pass finds every stats div, nav item and rounds block; the
+    header and rounds of each map are then looked up inside its own stats
+    div. Extractors read maps from these dicts instead of re-running
+    document-wide selectors for every map.
+    """
+
+    __slots__ = ("games", "nav_items", "headers", "rounds", "_all_rounds")
+
+    def __init__(self, document):
+        self.games = {}
+        self.nav_items = {}
+        self.headers = {}
+        self.rounds = {}
+        self._all_rounds = []
+        for node in document.css(".vm-stats-game, .vm-stats-gamesnav-item, .vlr-rounds"):
+            classes = class_list(node)
+            if "vm-stats-game" in classes:
+                self.games.setdefault(node.attributes.get("data-game-id"), node)
+            elif "vm-stats-gamesnav-item" in classes:
+                self.nav_items.setdefault(node.attributes.get("data-game-id"), node)
+            else:
+                self._all_rounds.append(node)
+        for game_id, game in self.games.items():
+            self.headers[game_id] = first_descendant(game, ".vm-stats-game-header")
+            self.rounds[game_id] = first_descendant(game, ".vlr-rounds")
+
+    def map_tabs(self):
+        """Return the nav items of the maps (or their stats divs if there are none), in page order."""
+        for tabs in (self.nav_items, self.games):
+            found = [node for game_id, node in tabs.items() if game_id != "all"]
+            if found:
+                return found
+        return []
+
+    def rounds_for(self, game_id):
+        """Return the .vlr-rounds block of a map, or None."""
+        rounds = self.rounds.get(game_id)
+        if rounds is not None or not self._all_rounds:
+            return rounds
+        # Rounds outside the map's stats div are assumed to be in map order
+        if len(self._all_rounds) > 1 and game_id and game_id.isdigit():
+            index = int(game_id) - 1
+            if index < len(self._all_rounds):
+                return self._all_rounds[index]
+        return self._all_rounds[0]
+
+
+class SharedDocuments:
+    """
+    Parsed pages shared between requests for DOCUMENT_TTL seconds.
+
+    Documents are only read by the extractors, never modified, so the same
+    tree can serve any number of requests at once.
+    """
+
+    def __init__(self, ttl=DOCUMENT_TTL, max_size=DOCUMENT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        # (url, parse) -> (expiry, document)
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() > entry[0]:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key, document):
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, document)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+shared_documents = SharedDocuments()
+
+
+class DocumentCache:
+    """
+    Fetch and parse each URL at most once for the lifetime of one request.
+
+    get_match_details creates one of these and hands it to every extractor,
+    so the main page and each performance tab are downloaded and parsed a
+    single time no matter how many extractors read them. Concurrent lookups
+    of the same URL share one fetch.
+
+    Pages are also looked up in shared_documents first, and concurrent
+    requests loading the same page share one fetch and parse.
+
+    URLs whose last fetch failed (an error or a status other than 200) are
+    listed in `failed`, so the caller can tell an incomplete response from a
+    complete one.
+    """
+
+    def __init__(self, parse=parse_html):
+        self._parse = parse
+        self._pending = {}
+        self._indexes = {}
+        self.failed = set()
+
+    async def get(self, url):
+        """
+        Return (status_code, document) for url.
+
+        The document is None when the status code is not 200. Network errors
+        propagate to the caller and are not cached.
+        """
+        task = self._pending.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._load(url))
+            self._pending[url] = task
+        try:
+            status, document = await task
+        except Exception:
+            self.failed.add(url)
+            if self._pending.get(url) is task:
+                del self._pending[url]
+            raise
+        if document is None:
+            self.failed.add(url)
+        else:
+            self.failed.discard(url)
+        return status, document
+
+    def index(self, document):
+        """Return the MatchIndex of a document, built the first time it is asked for."""
+        entry = self._indexes.get(id(document))
+        if entry is None:
+            # The document is kept with its index so its id() cannot be reused
+            entry = self._indexes[id(document)] = (document, MatchIndex(document))
+        return entry[1]
+
+    async def prefetch(self, urls, concurrency=None):
+        """
+        Fetch and parse several URLs concurrently, at most `concurrency` at a time.
+
+        Failures are swallowed here; a later get() of the same URL retries it
+        and reports the error to the extractor that needs the page.
+        """
+        semaphore = asyncio.Semaphore(concurrency or MATCH_FETCH_CONCURRENCY)
+
+        async def load(url):
+            async with semaphore:
+                try:
+                    await self.get(url)
+                except Exception:
+                    pass
+
+        await asyncio.gather(*(load(url) for url in dict.fromkeys(urls)))
+
+    async def _load(self, url):
+        if timing.current() is not None:
+            # A timed request fetches and parses its own pages
+            return await self._fetch(url)
+        key = (url, self._parse)
+        document = shared_documents.get(key)
+        if document is not None:
+            CACHE_LOOKUPS.labels("document", page_type(url), "hit").inc()
+            return 200, document
+        CACHE_LOOKUPS.labels("document", page_type(url), "miss").inc()
+        status, document = await flights.do(("document",) + key, lambda: self._fetch(url))
+        if document is not None:
+            shared_documents.set(key, document)
+        return status, document
+
+    async def _fetch(self, url):
+        resp = await fetch(url)
+        if resp.status_code != 200:
+            return resp.status_code, None
+        with PARSE_LATENCY.labels(page_type(url)).time(), timing.parsing(url):
+            return resp.status_code, self._parse(resp.text)
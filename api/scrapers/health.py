@@ -1,16 +1,24 @@
-import requests
+import asyncio
 
+import httpx
 
-def check_health():
+from utils.fetch import fetch
+
+
+async def _check(site):
+    # Health probes skip the upstream concurrency cap so they are not
+    # queued behind batch scrapes holding every slot
+    try:
+        response = await fetch(site, timeout=5, limited=False)
+    except httpx.HTTPError:
+        return {"status": "Unhealthy", "status_code": None}
+    return {
+        "status": "Healthy" if response.status_code == 200 else "Unhealthy",
+        "status_code": response.status_code,
+    }
+
+
+async def check_health():
     sites = ["https://vlrggapi.vercel.app", "https://vlr.gg"]
-    results = {}
-    for site in sites:
-        try:
-            response = requests.get(site, timeout=5)
-            results[site] = {
-                "status": "Healthy" if response.status_code == 200 else "Unhealthy",
-                "status_code": response.status_code,
-            }
-        except requests.RequestException:
-            results[site] = {"status": "Unhealthy", "status_code": None}
-    return results
+    results = await asyncio.gather(*(_check(site) for site in sites))
+    return dict(zip(sites, results))
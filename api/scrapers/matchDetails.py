@@ -1,20 +1,34 @@
 
-import requests
-from bs4 import BeautifulSoup
+import asyncio
 import logging
-from utils.utils import headers
-from api.scrapers.matrix_extractor import extract_player_matrix, get_performance_data
+import os
+from collections import deque
+from api.scrapers.documents import DocumentCache, MatchIndex, class_list, performance_url
+from api.scrapers.models import Agent, PlayerStats, SideStat
+from utils.cache import cached
+from utils.singleflight import coalesce
+from utils.store import persisted, ttl_for
+from utils.timing import timed
+from api.scrapers.matrix_extractor import dense_matrix, extract_player_matrix, get_performance_data
 import re
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("scraper_debug.log", mode="w"),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger('matchDetails')
+logger = logging.getLogger(__name__)
+
+# Matches of one batch request scraped at the same time. Their page fetches
+# also count against the process-wide VLR_UPSTREAM_CONCURRENCY.
+BATCH_CONCURRENCY = int(os.environ.get("VLR_BATCH_CONCURRENCY", 8))
+
+# Parts of /match/{match_id} a client can ask for with include=. The header
+# (teams, score, tournament, date, patch, notes) comes from the match page
+# alone and is always returned; "maps" are the per-map scoreboards. "rounds"
+# and the performance tab data ("matrix", "adv_stats") are added to each map
+# and imply "maps"; the performance tabs are only fetched for those two.
+MATCH_SECTIONS = ("header", "stats", "maps", "rounds", "matrix", "adv_stats", "debug")
+ALL_SECTIONS = frozenset(MATCH_SECTIONS)
+# Sections built from the map tabs of the page
+MAP_SECTIONS = frozenset(("maps", "rounds", "matrix", "adv_stats"))
+# Sections that only exist once a match has started
+PLAYED_SECTIONS = MAP_SECTIONS | {"stats"}
 
 def extract_map_stats(map_div):
     """Extrair estatísticas detalhadas de um mapa específico."""
@@ -22,135 +36,249 @@ def extract_map_stats(map_div):
     if not map_div:
         return stats
     
-    for table in map_div.select('table.wf-table-inset.mod-overview'):
-        for row in table.select('tbody tr'):
-            player = {}
-            player_name_div = row.select_one('.mod-player .text-of')
-            player['player'] = player_name_div.get_text(strip=True) if player_name_div else None
-            team_div = row.select_one('.mod-player .ge-text-light')
-            player['team'] = team_div.get_text(strip=True) if team_div else None
+    for table in map_div.css('table.wf-table-inset.mod-overview'):
+        for row in table.css('tbody tr'):
+            player_name_div = row.css_first('.mod-player .text-of')
+            team_div = row.css_first('.mod-player .ge-text-light')
             agents = []
-            for agent_span in row.select('.mod-agents img'):
-                agent_name = agent_span.get('alt')
-                agent_img = 'https://www.vlr.gg' + agent_span.get('src') if agent_span.get('src', '').startswith('/') else agent_span.get('src')
-                agents.append({'name': agent_name, 'img': agent_img})
-            player['agents'] = agents
+            for agent_span in row.css('.mod-agents img'):
+                agent_name = agent_span.attributes.get('alt')
+                agent_src = agent_span.attributes.get('src') or ''
+                agent_img = 'https://www.vlr.gg' + agent_src if agent_src.startswith('/') else agent_span.attributes.get('src')
+                agents.append(Agent(agent_name, agent_img))
             
             def get_stat(td, side):
-                span = td.select_one(f'.side.mod-side.mod-{side}')
+                span = td.css_first(f'.side.mod-side.mod-{side}')
                 if not span:
-                    span = td.select_one(f'.side.mod-{side}')
-                return span.get_text(strip=True) if span else None
+                    span = td.css_first(f'.side.mod-{side}')
+                return span.text(strip=True) if span else None
                 
-            stat_cols = row.select('td.mod-stat, td.mod-stat.mod-vlr-kills, td.mod-stat.mod-vlr-deaths, td.mod-stat.mod-vlr-assists, td.mod-stat.mod-kd-diff, td.mod-stat.mod-fb, td.mod-stat.mod-fd, td.mod-stat.mod-fk-diff')
+            stat_cols = row.css('td.mod-stat')
             stat_map = [
                 ('rating', 0), ('acs', 1), ('kills', 2), ('deaths', 3), ('assists', 4), ('kd_diff', 5),
                 ('kast', 6), ('adr', 7), ('hs_pct', 8), ('fk', 9), ('fd', 10), ('fk_diff', 11)
             ]
+            player_stats = {}
             for stat, idx in stat_map:
                 if idx < len(stat_cols):
-                    player[stat] = {
-                        'both': get_stat(stat_cols[idx], 'both'),
-                        'attack': get_stat(stat_cols[idx], 't'),
-                        'defend': get_stat(stat_cols[idx], 'ct')
-                    }
+                    player_stats[stat] = SideStat(
+                        both=get_stat(stat_cols[idx], 'both'),
+                        attack=get_stat(stat_cols[idx], 't'),
+                        defend=get_stat(stat_cols[idx], 'ct')
+                    )
                 else:
-                    player[stat] = {'both': None, 'attack': None, 'defend': None}
-            stats.append(player)
+                    player_stats[stat] = SideStat(None, None, None)
+            stats.append(PlayerStats(
+                player=player_name_div.text(strip=True) if player_name_div else None,
+                team=team_div.text(strip=True) if team_div else None,
+                agents=agents,
+                **player_stats
+            ))
     return stats
 
-def extract_all_map_stats(soup):
+@timed
+def extract_all_map_stats(soup, index=None):
     """Extrair estatísticas gerais (todos os mapas)."""
     stats = []
-    stats_game = soup.select_one('.vm-stats-game[data-game-id="all"]')
+    if index is None:
+        index = MatchIndex(soup)
+    stats_game = index.games.get("all")
     if not stats_game:
         return stats
     
     return extract_map_stats(stats_game)
 
-def get_match_details(match_url):
-    # Function to extract match details from the given URL
+def extract_match_status(soup):
+    """Upcoming, Live or Completed, from the note under the match score."""
+    if soup.css_first(".match-header-vs-note.match-header-vs-note-upcoming"):
+        return "Upcoming"
+    if soup.css_first(".match-header-vs-note.match-header-vs-note-live"):
+        return "Live"
+    return "Completed"
+
+def extract_match_teams(soup):
+    """Extrair os times do cabeçalho da partida e o placar da série, na ordem da página."""
+    names = [
+        name.text(strip=True) or None
+        for name in soup.css('.match-header-vs-team .match-header-vs-team-name')
+    ][:2]
+    scores = []
+    score_container = soup.css_first('.match-header-vs-score')
+    if score_container:
+        for span in score_container.css('.match-header-vs-score-winner, .match-header-vs-score-loser'):
+            try:
+                scores.append(int(span.text(strip=True)))
+            except ValueError:
+                scores.append(None)
+    return [
+        {'name': name, 'score': scores[i] if i < len(scores) else None}
+        for i, name in enumerate(names)
+    ]
+
+def extract_match_streams(soup):
+    """Extrair as transmissões listadas na página da partida, como [{'name', 'link'}]."""
+    streams = []
+    for button in soup.css('.match-streams .match-streams-btn'):
+        # Botões com player embutido levam o link externo num <a> interno
+        anchor = button if button.tag == 'a' else button.css_first('a.match-streams-btn-external')
+        streams.append({
+            'name': button.text(strip=True) or None,
+            'link': anchor.attributes.get('href') if anchor else None,
+        })
+    return streams
+
+def plan_sections(match_status, sections):
+    """
+    Reduce the requested sections to those the page can have in match_status.
+
+    An upcoming match has no stats or maps yet, so only its header (and the
+    debug info) is built, from the main page alone. Live and completed
+    matches keep every requested section; extract_match_maps skips the maps
+    of a live match that have not started.
+    """
+    if match_status == "Upcoming":
+        return sections - PLAYED_SECTIONS
+    return sections
+
+def normalize_match_url(match_url):
+    """Turn a match ID, path or full URL into the absolute match page URL."""
     if match_url.isdigit():
-        url = f"https://www.vlr.gg/{match_url}"
+        return f"https://www.vlr.gg/{match_url}"
     elif not match_url.startswith("https://"):
-        url = f"https://www.vlr.gg{match_url}"
-    else:
-        url = match_url
+        return f"https://www.vlr.gg{match_url}"
+    return match_url
+
+def match_sections(include):
+    """
+    Parse an include= value such as "maps,rounds".
+
+    Returns:
+        frozenset: The sections to build, or None (everything) when include is
+            empty or names every section
+
+    Raises:
+        ValueError: If a name is not in MATCH_SECTIONS
+    """
+    if not include:
+        return None
+    sections = frozenset(name.strip() for name in include.split(",") if name.strip())
+    unknown = sections - ALL_SECTIONS
+    if unknown:
+        raise ValueError(f"Unknown match sections: {', '.join(sorted(unknown))}")
+    if sections == ALL_SECTIONS:
+        return None
+    return sections
+
+def _match_store_key(match_url, sections=None):
+    # Only complete payloads are persisted
+    if sections is not None:
+        return None
+    match_id = re.sub(r'[^0-9]', '', normalize_match_url(match_url).split("/")[3])
+    return match_id or None
+
+def _is_degraded(documents, match_maps, sections):
+    # A resposta está incompleta se alguma página (abas de performance)
+    # falhou, ou se um mapa jogado ficou sem matriz
+    if documents.failed:
+        return True
+    if "matrix" not in sections:
+        return False
+    return any(
+        map_data.get('rounds') and not (map_data.get('performance') or {}).get('player_matrix')
+        for map_data in match_maps
+    )
+
+def _match_store_ttl(data):
+    details = data["data"].get("match_details")
+    if details is None:
+        # Failed fetches are never persisted
+        return False
+    if details["match_status"] == "Live":
+        return ttl_for("live")
+    # Incomplete payloads (an upstream page failed) are kept only briefly,
+    # so the next scrape after the outage can replace them
+    if data["data"].get("degraded"):
+        return ttl_for("degraded")
+    # Completed matches never change upstream; keep them forever
+    if details["match_status"] == "Completed":
+        return None
+    return ttl_for("upcoming")
+
+def _match_cache_ttl(data):
+    details = data["data"].get("match_details")
+    # Live matches change between polls and incomplete payloads should be
+    # retried; the store already bounds their age
+    if details is None or details["match_status"] == "Live" or data["data"].get("degraded"):
+        return False
+    return None
+
+@persisted("match", key=_match_store_key, ttl=_match_store_ttl)
+@coalesce("match_details", key=lambda match_url, sections=None: (normalize_match_url(match_url), sections))
+async def get_match_details(match_url, sections=None):
+    # Function to extract match details from the given URL; sections (see
+    # match_sections) limits the work to the parts asked for
+    url = normalize_match_url(match_url)
+    if sections is None:
+        sections = ALL_SECTIONS
         
-    logger.info(f"Making request to: {url}")
-    resp = requests.get(url, headers=headers)
-    logger.info(f"Response status code: {resp.status_code}")
-    if resp.status_code != 200:
+    # Every page of this match (main page and performance tabs) is fetched
+    # and parsed at most once while building the response
+    documents = DocumentCache()
+    logger.debug("Making request to: %s", url)
+    status, soup = await documents.get(url)
+    logger.debug("Response status code: %s", status)
+    if status != 200:
         error = {
             "data": {
-                "status": resp.status_code,
-                "error": f"Failed to fetch match details. Status code: {resp.status_code}"
+                "status": status,
+                "error": f"Failed to fetch match details. Status code: {status}"
             }
         }
         return error
-    soup = BeautifulSoup(resp.text, 'html.parser')
-    status = resp.status_code
-    match_status = "Unknown"
-    if soup.select_one(".match-header-vs-note.match-header-vs-note-upcoming"):
-        match_status = "Upcoming"
-    elif soup.select_one(".match-header-vs-note.match-header-vs-note-live"):
-        match_status = "Live"
-    else:
-        match_status = "Completed"
+    match_status = extract_match_status(soup)
+    # Only the sections the match can have in its current state are built;
+    # the others asked for come back empty
+    plan = plan_sections(match_status, sections)
     tournament_name = None
-    tournament_element = soup.select_one(".match-header-event div[style='font-weight: 700;']")
+    tournament_element = soup.css_first(".match-header-event div[style='font-weight: 700;']")
     if tournament_element:
-        tournament_name = tournament_element.get_text(strip=True)
+        tournament_name = tournament_element.text(strip=True)
     tournament_stage = None
-    stage_element = soup.select_one(".match-header-event-series")
+    stage_element = soup.css_first(".match-header-event-series")
     if stage_element:
-        tournament_stage = stage_element.get_text(strip=True)
-    logger.info(f"Tournament Name: {tournament_name}")
-    logger.info(f"Tournament Stage: {tournament_stage}")
+        tournament_stage = stage_element.text(strip=True)
+    logger.debug("Tournament Name: %s", tournament_name)
+    logger.debug("Tournament Stage: %s", tournament_stage)
     match_date = None
     match_time = None
-    date_div = soup.select_one(".match-header-date .moment-tz-convert[data-moment-format='dddd, MMMM Do']")
+    date_div = soup.css_first(".match-header-date .moment-tz-convert[data-moment-format='dddd, MMMM Do']")
     if date_div:
-        match_date = date_div.get("data-utc-ts")
-    time_div = soup.select_one(".match-header-date .moment-tz-convert[data-moment-format='h:mm A z']")
+        match_date = date_div.attributes.get("data-utc-ts")
+    time_div = soup.css_first(".match-header-date .moment-tz-convert[data-moment-format='h:mm A z']")
     if time_div:
-        match_time = time_div.get("data-utc-ts")
+        match_time = time_div.attributes.get("data-utc-ts")
     patch = None
-    patch_div = soup.select_one(".match-header-date [style*='font-style: italic']")
+    patch_div = soup.css_first(".match-header-date [style*='font-style: italic']")
     if patch_div:
-        patch = patch_div.get_text(strip=True)
-    logger.info(f"Match Date: {match_date}")
-    logger.info(f"Patch: {patch}")
+        patch = patch_div.text(strip=True)
+    logger.debug("Match Date: %s", match_date)
+    logger.debug("Patch: %s", patch)
     match_notes = None
-    notes_div = soup.select_one(".match-header-note")
+    notes_div = soup.css_first(".match-header-note")
     if notes_div:
-        match_notes = notes_div.get_text(strip=True)
-    logger.info(f"Match Notes: {match_notes}")
-    stats = extract_all_map_stats(soup)
-    match_maps = extract_match_maps(soup, url)
-    
-    # Add debug info
-    debug_info = {
-        "url": url,
-        "match_maps_count": len(match_maps),
-        "players_count": len(stats),
-        "status_code": resp.status_code,
-        "has_matrix": any(map_data.get('performance', {}).get('player_matrix', {}).get('column_players') for map_data in match_maps),
-        "map_ids": [m.get('game_id') for m in match_maps],
-        "matrix_sizes": [
-            {
-                "game_id": m.get('game_id'),
-                "columns": len(m.get('performance', {}).get('player_matrix', {}).get('column_players', [])),
-                "rows": len(m.get('performance', {}).get('player_matrix', {}).get('row_players', []))
-            } 
-            for m in match_maps
-        ]
-    }
+        match_notes = notes_div.text(strip=True)
+    logger.debug("Match Notes: %s", match_notes)
+    stats = extract_all_map_stats(soup, documents.index(soup)) if "stats" in plan else []
+    match_maps = []
+    if not plan.isdisjoint(MAP_SECTIONS):
+        match_maps = await extract_match_maps(soup, url, documents, plan, match_status=match_status)
     
     result = {
         "status": status,
         "match_id": re.sub(r'[^0-9]', '', url.split("/")[3]),
         "match_status": match_status,
+        "teams": extract_match_teams(soup),
+        "streams": extract_match_streams(soup),
         "tournament": {
             "name": tournament_name,
             "stage": tournament_stage
@@ -158,63 +286,224 @@ def get_match_details(match_url):
         "match_date": match_date,
         "patch": patch,
         "notes": match_notes,
-        "stats": stats,
-        "match_maps": match_maps,
-        "debug_info": debug_info
     }
+    # Sections left out of include= are left out of the response
+    if "stats" in sections:
+        result["stats"] = stats
+    if not sections.isdisjoint(MAP_SECTIONS):
+        result["match_maps"] = match_maps
+    
+    # Add debug info
+    if "debug" in sections:
+        matrices = [(m.get('performance') or {}).get('player_matrix') or {} for m in match_maps]
+        result["debug_info"] = {
+            "url": url,
+            "match_maps_count": len(match_maps),
+            "players_count": len(stats),
+            "status_code": status,
+            "has_matrix": any(matrix.get('column_players') for matrix in matrices),
+            "map_ids": [m.get('game_id') for m in match_maps],
+            "matrix_sizes": [
+                {
+                    "game_id": m.get('game_id'),
+                    "columns": len(matrix.get('column_players', [])),
+                    "rows": len(matrix.get('row_players', []))
+                } 
+                for m, matrix in zip(match_maps, matrices)
+            ]
+        }
+    
     segments = {"status": status, "match_details": result}
+    if _is_degraded(documents, match_maps, plan):
+        segments["degraded"] = True
     data = {"data": segments}
     return data
 
-def extract_match_maps(soup, match_url):
+@timed
+def extract_map_rounds(index, game_id, teams, map_name):
+    """Extrair os rounds de um mapa do elemento vlr-rounds correspondente."""
+    rounds_data = []
+    
+    # Encontrar o vlr-rounds correspondente ao mapa atual (MatchIndex)
+    target_vlr_rounds = index.rounds_for(game_id)
+    
+    if target_vlr_rounds:
+        # Extrair os times
+        team_elements = target_vlr_rounds.css('.team')
+        round_teams = []
+        for team_elem in team_elements:
+            team_name = team_elem.text(strip=True)
+            team_img = None
+            img_elem = team_elem.css_first('img')
+            if img_elem:
+                team_img = img_elem.attributes.get('src')
+                if team_img and team_img.startswith('//'):
+                    team_img = 'https:' + team_img
+            round_teams.append({
+                'name': team_name,
+                'img': team_img
+            })
+        
+        # Extrair os rounds
+        round_cols = target_vlr_rounds.css('.vlr-rounds-row-col:not(.mod-spacing)')
+        
+        for col in round_cols:
+            # Pular a coluna de rótulos de times
+            if not col.css_first('.rnd-num'):
+                continue
+            
+            round_num = col.css_first('.rnd-num')
+            if not round_num:
+                continue
+            
+            round_data = {
+                'round_number': round_num.text(strip=True),
+                'title': col.attributes.get('title') or '',
+                'winner': None,
+                'winner_team': None,
+                'win_type': None,
+                'win_side': None
+            }
+            
+            # Procurar pelo quadrado vencedor
+            win_square = col.css_first('.rnd-sq.mod-win')
+            if win_square:
+                # Determinar o time vencedor
+                winner_index = None
+                win_classes = class_list(win_square)
+                if 'mod-t' in win_classes:
+                    round_data['win_side'] = 'attack'
+                    winner_index = 0 if win_square.mem_id == col.css_first('.rnd-sq').mem_id else 1
+                elif 'mod-ct' in win_classes:
+                    round_data['win_side'] = 'defense'
+                    winner_index = 0 if win_square.mem_id == col.css_first('.rnd-sq').mem_id else 1
+                
+                # Definir o índice do vencedor e o nome do time vencedor
+                if winner_index is not None:
+                    round_data['winner'] = winner_index
+                    if winner_index < len(teams):
+                        round_data['winner_team'] = teams[winner_index]
+                
+                # Extrair o tipo de vitória com base na imagem
+                img_elem = win_square.css_first('img')
+                if img_elem:
+                    img_src = img_elem.attributes.get('src') or ''
+                    if 'elim' in img_src:
+                        round_data['win_type'] = 'elimination'
+                    elif 'boom' in img_src:
+                        round_data['win_type'] = 'spike_detonation'
+                    elif 'defuse' in img_src:
+                        round_data['win_type'] = 'spike_defuse'
+                    elif 'time' in img_src:
+                        round_data['win_type'] = 'time_out'
+            
+            rounds_data.append(round_data)
+        
+        logger.debug("Extraídos %s rounds para o mapa %s", len(rounds_data), map_name)
+    else:
+        logger.debug("Não foi possível encontrar dados de rounds para o mapa %s", map_name)
+    return rounds_data
+
+def _tab_game_id(tab):
+    # O tab pode ser um nó selectolax ou um dicionário (no caso do fallback)
+    if isinstance(tab, dict):
+        return tab.get('data-game-id')
+    return tab.attributes.get('data-game-id')
+
+@timed
+async def extract_match_maps(soup, match_url, documents=None, sections=ALL_SECTIONS, only_game=None, match_status=None):
     match_maps = []
+    want_rounds = "rounds" in sections
+    want_matrix = "matrix" in sections
+    want_adv_stats = "adv_stats" in sections
+    if documents is None:
+        documents = DocumentCache()
+    
+    # Os elementos de cada mapa (div de stats, aba, cabeçalho, rounds) vêm do
+    # índice da página, montado uma única vez por documento
+    index = documents.index(soup)
     
     # Extrair informações dos mapas a partir das abas na página principal
-    # Tentando vários seletores para garantir que encontramos os mapas
-    map_tabs = soup.select('.vm-stats-gamesnav-item:not([data-game-id="all"])')
+    # (ou das divs de stats, se não houver abas)
+    map_tabs = index.map_tabs()
     
-    # Se não encontrou, tente outros seletores na página principal
-    if not map_tabs:
-        map_tabs = soup.select('.vm-stats-game:not([data-game-id="all"])')
+    # Tentar extrair informações dos times do cabeçalho da partida
+    teams = []
+    team_elements = soup.css('.match-header-vs-team')
+    for team in team_elements:
+        team_name = team.css_first('.match-header-vs-team-name')
+        team_name_text = team_name.text(strip=True) if team_name else None
+        if team_name_text:
+            teams.append(team_name_text)
     
-    # Se ainda não encontrou, tente um seletor mais genérico
-    if not map_tabs:
-        map_tabs = soup.select('.vm-stats-container .vm-stats-game')
-        # Filtra apenas os que têm game_id definido e não é "all"
-        map_tabs = [tab for tab in map_tabs if tab.get('data-game-id') and tab.get('data-game-id') != 'all']
+    logger.debug("Times extraídos do cabeçalho: %s", teams)
+    
+    # Se não conseguimos extrair os times do cabeçalho, tentar outros métodos
+    if not teams or len(teams) < 2:
+        # Tentar extrair de outros elementos
+        match_header = soup.css_first('.match-header')
+        if match_header:
+            team_names_alt = []
+            for team_name_elem in match_header.css('.wf-title-med'):
+                team_name_text = team_name_elem.text(strip=True)
+                if team_name_text and team_name_text not in team_names_alt:
+                    team_names_alt.append(team_name_text)
+            
+            if len(team_names_alt) >= 2:
+                teams = team_names_alt[:2]
+                logger.debug("Times extraídos de elementos alternativos: %s", teams)
+    
+    # Extrair a pontuação do cabeçalho (pontuação geral da partida)
+    match_scores = [None, None]  # [time1_score, time2_score]
+    
+    # Buscar no elemento match-header-vs-score
+    score_container = soup.css_first('.match-header-vs-score')
+    if score_container:
+        # Extrair pontuação do vencedor
+        winner_score = score_container.css_first('.match-header-vs-score-winner')
+        if winner_score:
+            try:
+                match_scores[0] = int(winner_score.text(strip=True))
+            except (ValueError, TypeError):
+                logger.warning("Não foi possível converter a pontuação do vencedor para inteiro")
+        
+        # Extrair pontuação do perdedor
+        loser_score = score_container.css_first('.match-header-vs-score-loser')
+        if loser_score:
+            try:
+                match_scores[1] = int(loser_score.text(strip=True))
+            except (ValueError, TypeError):
+                logger.warning("Não foi possível converter a pontuação do perdedor para inteiro")
+    
+    logger.debug("Pontuações extraídas do cabeçalho: %s", match_scores)
     
     # Se não encontrou na página principal, tenta extrair da aba de performance
     if not map_tabs:
-        logger.info("Não encontrou abas de mapas na página principal, buscando na aba de performance")
-        performance_soup = get_performance_data(match_url)
+        logger.debug("Não encontrou abas de mapas na página principal, buscando na aba de performance")
+        performance_soup = await get_performance_data(match_url, documents=documents)
         if performance_soup:
-            # Tenta vários seletores na aba de performance também
-            map_tabs = performance_soup.select('.vm-stats-gamesnav-item:not([data-game-id="all"])')
-            if not map_tabs:
-                map_tabs = performance_soup.select('.vm-stats-game:not([data-game-id="all"])')
-            if not map_tabs:
-                map_tabs = performance_soup.select('.vm-stats-container .vm-stats-game')
-                map_tabs = [tab for tab in map_tabs if tab.get('data-game-id') and tab.get('data-game-id') != 'all']
+            # Mesmos critérios na aba de performance
+            map_tabs = documents.index(performance_soup).map_tabs()
             
-            logger.info(f"Encontradas {len(map_tabs)} abas de mapas na aba de performance")
+            logger.debug("Encontradas %s abas de mapas na aba de performance", len(map_tabs))
     
     # Se mesmo assim não encontrou, vamos tentar um fallback para mapas únicos
     # Muitas vezes, partidas com um único mapa não têm as abas
     if not map_tabs:
-        logger.info("Nenhum mapa encontrado. Tentando fallback para mapa único")
+        logger.debug("Nenhum mapa encontrado. Tentando fallback para mapa único")
         
         # Criar um mapa "virtual" baseado nos dados disponíveis
         map_name = "Unknown"
         
         # Procurar o nome do mapa em algum lugar da página
-        map_name_elem = soup.select_one('.map-text')
+        map_name_elem = soup.css_first('.map-text')
         if map_name_elem:
-            map_name = map_name_elem.get_text(strip=True)
+            map_name = map_name_elem.text(strip=True)
         
         # Criar um mapa dummy para garantir pelo menos uma entrada
         map_data = {
             'map_name': map_name,
-            'score': team_scores,
+            'score': match_scores,
             'teams': teams,
             'game_id': "all",
             'player_stats': [],
@@ -225,65 +514,68 @@ def extract_match_maps(soup, match_url):
         }
         
         # Tentar obter dados de performance usando matrix_extractor
-        try:
-            matrix_data = get_performance_data(match_url, "all")
-            if matrix_data:
-                map_data['performance'] = matrix_data
-                logger.info(f"Matriz de jogador vs jogador extraída para o mapa {map_name}")
-                
-                # Se temos dados de matrix, usar nomes reais dos jogadores
-                player_stats = []
-                team1_players = []
-                team2_players = []
-                
-                # Extrair jogadores da linha (time 1)
-                for player in matrix_data.get('player_matrix', {}).get('row_players', []):
-                    if isinstance(player, dict) and 'name' in player:
-                        team1_players.append(player.get('name'))
-                    elif isinstance(player, str):
-                        team1_players.append(player)
-                
-                # Extrair jogadores da coluna (time 2)
-                for player in matrix_data.get('player_matrix', {}).get('column_players', []):
-                    if isinstance(player, dict) and 'name' in player:
-                        team2_players.append(player.get('name'))
-                    elif isinstance(player, str):
-                        team2_players.append(player)
-                
-                # Criar entradas de jogadores para o time 1
-                for player_name in team1_players:
-                    player_stats.append({
-                        'player_name': player_name,
-                        'team': teams[0] if len(teams) > 0 else "Team A",
-                        'agent': None,
-                        'stats': {
-                            'rating': {'both': None, 'attack': None, 'defend': None},
-                            'acs': {'both': None, 'attack': None, 'defend': None},
-                            'kills': {'both': None, 'attack': None, 'defend': None},
-                            'deaths': {'both': None, 'attack': None, 'defend': None},
-                            'assists': {'both': None, 'attack': None, 'defend': None}
-                        }
-                    })
-                
-                # Criar entradas de jogadores para o time 2
-                for player_name in team2_players:
-                    player_stats.append({
-                        'player_name': player_name,
-                        'team': teams[1] if len(teams) > 1 else "Team B",
-                        'agent': None,
-                        'stats': {
-                            'rating': {'both': None, 'attack': None, 'defend': None},
-                            'acs': {'both': None, 'attack': None, 'defend': None},
-                            'kills': {'both': None, 'attack': None, 'defend': None},
-                            'deaths': {'both': None, 'attack': None, 'defend': None},
-                            'assists': {'both': None, 'attack': None, 'defend': None}
-                        }
-                    })
-                
-                map_data['player_stats'] = player_stats
-                logger.info(f"Extraídos {len(player_stats)} jogadores das informações de matrix para o mapa {map_name}")
-        except Exception as e:
-            logger.error(f"Erro ao extrair dados de performance para o mapa {map_name}: {e}")
+        if want_matrix or want_adv_stats:
+            try:
+                matrix_data = await extract_player_matrix(
+                    None, "all", match_url, documents, matrix=want_matrix, adv_stats=want_adv_stats
+                )
+                if matrix_data:
+                    map_data['performance'] = {'player_matrix': matrix_data}
+                    logger.debug("Matriz de jogador vs jogador extraída para o mapa %s", map_name)
+                    
+                    # Se temos dados de matrix, usar nomes reais dos jogadores
+                    player_stats = []
+                    team1_players = []
+                    team2_players = []
+                    
+                    # Extrair jogadores da linha (time 1)
+                    for player in matrix_data.get('row_players', []):
+                        if isinstance(player, dict) and 'name' in player:
+                            team1_players.append(player.get('name'))
+                        elif isinstance(player, str):
+                            team1_players.append(player)
+                    
+                    # Extrair jogadores da coluna (time 2)
+                    for player in matrix_data.get('column_players', []):
+                        if isinstance(player, dict) and 'name' in player:
+                            team2_players.append(player.get('name'))
+                        elif isinstance(player, str):
+                            team2_players.append(player)
+                    
+                    # Criar entradas de jogadores para o time 1
+                    for player_name in team1_players:
+                        player_stats.append({
+                            'player_name': player_name,
+                            'team': teams[0] if len(teams) > 0 else "Team A",
+                            'agent': None,
+                            'stats': {
+                                'rating': {'both': None, 'attack': None, 'defend': None},
+                                'acs': {'both': None, 'attack': None, 'defend': None},
+                                'kills': {'both': None, 'attack': None, 'defend': None},
+                                'deaths': {'both': None, 'attack': None, 'defend': None},
+                                'assists': {'both': None, 'attack': None, 'defend': None}
+                            }
+                        })
+                    
+                    # Criar entradas de jogadores para o time 2
+                    for player_name in team2_players:
+                        player_stats.append({
+                            'player_name': player_name,
+                            'team': teams[1] if len(teams) > 1 else "Team B",
+                            'agent': None,
+                            'stats': {
+                                'rating': {'both': None, 'attack': None, 'defend': None},
+                                'acs': {'both': None, 'attack': None, 'defend': None},
+                                'kills': {'both': None, 'attack': None, 'defend': None},
+                                'deaths': {'both': None, 'attack': None, 'defend': None},
+                                'assists': {'both': None, 'attack': None, 'defend': None}
+                            }
+                        })
+                    
+                    map_data['player_stats'] = player_stats
+                    logger.debug("Extraídos %s jogadores das informações de matrix para o mapa %s", len(player_stats), map_name)
+            except Exception as e:
+                logger.error("Erro ao extrair dados de performance para o mapa %s: %s", map_name, e)
         
         # Adicionar o mapa aos dados e retornar
         result = []
@@ -293,74 +585,48 @@ def extract_match_maps(soup, match_url):
         # Criar um objeto para representar o mapa (este código nunca será executado)
         # map_tabs = [{'data-game-id': '1', 'text': map_name}]
         
-    logger.info(f"Encontradas {len(map_tabs)} abas de mapas")
-    
-    # Tentar extrair informações dos times do cabeçalho da partida
-    teams = []
-    team_elements = soup.select('.match-header-vs-team')
-    for team in team_elements:
-        team_name = team.select_one('.match-header-vs-team-name')
-        team_name_text = team_name.get_text(strip=True) if team_name else None
-        if team_name_text:
-            teams.append(team_name_text)
-    
-    logger.info(f"Times extraídos do cabeçalho: {teams}")
-    
-    # Se não conseguimos extrair os times do cabeçalho, tentar outros métodos
-    if not teams or len(teams) < 2:
-        # Tentar extrair de outros elementos
-        match_header = soup.select_one('.match-header')
-        if match_header:
-            team_names_alt = []
-            for team_name_elem in match_header.select('.wf-title-med'):
-                team_name_text = team_name_elem.get_text(strip=True)
-                if team_name_text and team_name_text not in team_names_alt:
-                    team_names_alt.append(team_name_text)
-            
-            if len(team_names_alt) >= 2:
-                teams = team_names_alt[:2]
-                logger.info(f"Times extraídos de elementos alternativos: {teams}")
-    
-    # Extrair a pontuação do cabeçalho (pontuação geral da partida)
-    match_scores = [None, None]  # [time1_score, time2_score]
+    logger.debug("Encontradas %s abas de mapas", len(map_tabs))
     
-    # Buscar no elemento match-header-vs-score
-    score_container = soup.select_one('.match-header-vs-score')
-    if score_container:
-        # Extrair pontuação do vencedor
-        winner_score = score_container.select_one('.match-header-vs-score-winner')
-        if winner_score:
-            try:
-                match_scores[0] = int(winner_score.get_text(strip=True))
-            except (ValueError, TypeError):
-                logger.warning("Não foi possível converter a pontuação do vencedor para inteiro")
-        
-        # Extrair pontuação do perdedor
-        loser_score = score_container.select_one('.match-header-vs-score-loser')
-        if loser_score:
-            try:
-                match_scores[1] = int(loser_score.get_text(strip=True))
-            except (ValueError, TypeError):
-                logger.warning("Não foi possível converter a pontuação do perdedor para inteiro")
     
-    logger.info(f"Pontuações extraídas do cabeçalho: {match_scores}")
+    # As abas de performance de cada mapa são independentes: buscar todas
+    # em paralelo antes do loop, que depois as lê do DocumentCache. Só são
+    # necessárias para a matriz e as estatísticas avançadas.
+    map_positions = list(enumerate(map_tabs, 1))
+    # Numa partida ao vivo, os mapas que ainda não começaram têm a aba
+    # desabilitada: não há rounds nem aba de performance para buscar
+    pending = set()
+    if match_status == "Live":
+        pending = {
+            position for position, tab in map_positions
+            if not isinstance(tab, dict) and 'mod-disabled' in class_list(tab)
+        }
+    if only_game is not None:
+        # Pedido de um único mapa: os demais não são buscados nem extraídos
+        map_positions = [
+            (position, tab) for position, tab in map_positions
+            if (_tab_game_id(tab) or str(position)) == only_game
+        ]
+    if want_matrix or want_adv_stats:
+        await documents.prefetch(
+            performance_url(match_url, _tab_game_id(tab) or str(position))
+            for position, tab in map_positions
+            if position not in pending
+        )
     
     # Para cada mapa, extrair detalhes
-    for tab in map_tabs:
-        # O tab pode ser um elemento BeautifulSoup ou um dicionário (no caso do fallback)
+    for position, tab in map_positions:
+        # O tab pode ser um nó selectolax ou um dicionário (no caso do fallback)
+        game_id = _tab_game_id(tab)
         if isinstance(tab, dict):
-            game_id = tab.get('data-game-id')
             tab_text = tab.get('text', '')
         else:
-            game_id = tab.get('data-game-id')
-            tab_text = tab.get_text(strip=True)
+            tab_text = tab.text(strip=True)
         
         # Se não temos game_id, gerar um
         if not game_id:
             # Usar o índice como ID
-            index = map_tabs.index(tab) + 1
-            game_id = str(index)
-            logger.info(f"Game ID não encontrado, usando índice: {game_id}")
+            game_id = str(position)
+            logger.debug("Game ID não encontrado, usando índice: %s", game_id)
         
         # O texto da aba geralmente está no formato "1Corrode", "2Icebox", etc.
         # Precisamos extrair o nome do mapa removendo o número do início
@@ -371,24 +637,24 @@ def extract_match_maps(soup, match_url):
             # Para tabs criados pelo fallback, não precisamos encontrar o div
             map_div = None
             using_performance_soup = False
-            logger.info(f"Usando mapa fallback: {map_name}")
+            logger.debug("Usando mapa fallback: %s", map_name)
         else:
             # Encontrar o div correspondente a este mapa
             # Primeiro, procurar na página principal
-            map_div = soup.select_one(f'.vm-stats-game[data-game-id="{game_id}"]')
+            map_div = index.games.get(game_id)
             using_performance_soup = False
             
             # Se não encontrou na página principal, procurar na aba de performance
             if not map_div:
-                logger.info(f"Div para o mapa {map_name} (ID: {game_id}) não encontrado na página principal, buscando na aba de performance")
-                performance_soup = get_performance_data(match_url)
+                logger.debug("Div para o mapa %s (ID: %s) não encontrado na página principal, buscando na aba de performance", map_name, game_id)
+                performance_soup = await get_performance_data(match_url, documents=documents)
                 if performance_soup:
-                    map_div = performance_soup.select_one(f'.vm-stats-game[data-game-id="{game_id}"]')
+                    map_div = documents.index(performance_soup).games.get(game_id)
                     using_performance_soup = True
                     if not map_div:
-                        logger.warning(f"Div para o mapa {map_name} (ID: {game_id}) não encontrado na aba de performance")
+                        logger.warning("Div para o mapa %s (ID: %s) não encontrado na aba de performance", map_name, game_id)
                 else:
-                    logger.warning(f"Não foi possível obter dados de performance para o mapa {map_name} (ID: {game_id})")
+                    logger.warning("Não foi possível obter dados de performance para o mapa %s (ID: %s)", map_name, game_id)
         
         # Extrair estatísticas dos jogadores da página principal
         map_stats = []
@@ -397,23 +663,28 @@ def extract_match_maps(soup, match_url):
         detailed_stats = extract_map_stats(map_div)
         if detailed_stats:
             map_stats = detailed_stats
-            logger.info(f"Extraídas estatísticas detalhadas para {len(map_stats)} jogadores no mapa {map_name}")
+            logger.debug("Extraídas estatísticas detalhadas para %s jogadores no mapa %s", len(map_stats), map_name)
         
         # Buscar dados de performance para adicionar informações complementares
         # Estes vêm de uma requisição separada feita pelo matrix_extractor
-        performance_data = {
-            'player_matrix': None,
-            'adv_stats': None
-        }
-        
-        # Obter a matriz de jogador vs jogador da aba de performance
-        # O matrix_extractor faz a requisição para a aba de performance
-        matrix_data = extract_player_matrix(None, game_id, match_url)
-        if matrix_data:
-            performance_data['player_matrix'] = matrix_data
-            logger.info(f"Matriz de jogador vs jogador extraída para o mapa {map_name}")
-        else:
-            logger.warning(f"Não foi possível extrair matriz de jogador para o mapa {map_name}")
+        performance_data = None
+        matrix_data = None
+        if want_matrix or want_adv_stats:
+            performance_data = {
+                'player_matrix': None,
+                'adv_stats': None
+            }
+        if performance_data is not None and position not in pending:
+            # Obter a matriz de jogador vs jogador da aba de performance
+            # O matrix_extractor faz a requisição para a aba de performance
+            matrix_data = await extract_player_matrix(
+                None, game_id, match_url, documents, matrix=want_matrix, adv_stats=want_adv_stats
+            )
+            if matrix_data:
+                performance_data['player_matrix'] = matrix_data
+                logger.debug("Matriz de jogador vs jogador extraída para o mapa %s", map_name)
+            else:
+                logger.warning("Não foi possível extrair matriz de jogador para o mapa %s", map_name)
         
         # Se temos dados de matrix, usar os jogadores de lá para complementar estatísticas
         if matrix_data and not map_stats:
@@ -427,72 +698,75 @@ def extract_match_maps(soup, match_url):
                     })
             
             # Extrair jogadores de coluna (geralmente time 2)
+            seen_players = {p['player'] for p in map_stats}
             column_players = matrix_data.get('column_players', [])
             for player_data in column_players:
                 if isinstance(player_data, dict) and 'name' in player_data:
                     # Verificar se o jogador já foi adicionado
-                    if not any(p.get('player') == player_data.get('name') for p in map_stats):
+                    if player_data.get('name') not in seen_players:
+                        seen_players.add(player_data.get('name'))
                         map_stats.append({
                             'player': player_data.get('name'),
                             'team': player_data.get('team', teams[1] if len(teams) > 1 else None)
                         })
             
-            logger.info(f"Extraídos {len(map_stats)} jogadores das informações de matrix para o mapa {map_name}")
+            logger.debug("Extraídos %s jogadores das informações de matrix para o mapa %s", len(map_stats), map_name)
         
         # Se não encontrou estatísticas detalhadas, tentar apenas extrair informações básicas dos jogadores
         if not map_stats and map_div:
-            overview_table = map_div.select_one('table.wf-table-inset.mod-overview')
+            overview_table = map_div.css_first('table.wf-table-inset.mod-overview')
             if overview_table:
                 # Extrair dados de cada jogador
-                for row in overview_table.select('tbody tr'):
+                for row in overview_table.css('tbody tr'):
                     player = {}
                     
                     # Nome e time do jogador
-                    player_name_div = row.select_one('.mod-player .text-of')
-                    player['player'] = player_name_div.get_text(strip=True) if player_name_div else None
+                    player_name_div = row.css_first('.mod-player .text-of')
+                    player['player'] = player_name_div.text(strip=True) if player_name_div else None
                     
-                    team_div = row.select_one('.mod-player .ge-text-light')
-                    player['team'] = team_div.get_text(strip=True) if team_div else None
+                    team_div = row.css_first('.mod-player .ge-text-light')
+                    player['team'] = team_div.text(strip=True) if team_div else None
                     
                     map_stats.append(player)
                 
-                logger.info(f"Extraídos {len(map_stats)} jogadores da tabela mod-overview para o mapa {map_name}")
+                logger.debug("Extraídos %s jogadores da tabela mod-overview para o mapa %s", len(map_stats), map_name)
         
         # Verificar tabela mod-adv-stats (estatísticas avançadas)
         if not map_stats and map_div:
-            adv_stats_table = map_div.select_one('table.wf-table-inset.mod-adv-stats')
+            adv_stats_table = map_div.css_first('table.wf-table-inset.mod-adv-stats')
             if adv_stats_table:
                 # Extrair dados de cada jogador
-                for row in adv_stats_table.select('tbody tr'):
-                    cells = row.select('td')
+                for row in adv_stats_table.css('tbody tr'):
+                    cells = row.css('td')
                     if len(cells) >= 2:
-                        player_name = cells[0].get_text(strip=True)
-                        team_name = cells[1].get_text(strip=True)
+                        player_name = cells[0].text(strip=True)
+                        team_name = cells[1].text(strip=True)
                         
                         map_stats.append({
                             'player': player_name,
                             'team': team_name
                         })
                 
-                logger.info(f"Extraídos {len(map_stats)} jogadores da tabela mod-adv-stats para o mapa {map_name}")
+                logger.debug("Extraídos %s jogadores da tabela mod-adv-stats para o mapa %s", len(map_stats), map_name)
         
         # Se ainda não temos jogadores, tentar outras tabelas
         if not map_stats and map_div:
             # Verificar se há alguma outra tabela com dados de jogadores
-            all_tables = map_div.select('table.wf-table-inset')
+            all_tables = map_div.css('table.wf-table-inset')
+            seen_players = set()
             
             for table in all_tables:
-                rows = table.select('tbody tr')
+                rows = table.css('tbody tr')
                 
                 # Se a tabela tem linhas, tentar extrair informações
                 if rows:
                     for row in rows:
-                        cells = row.select('td')
+                        cells = row.css('td')
                         
                         # Se tem pelo menos duas células, assumir que as primeiras são jogador e time
                         if len(cells) >= 2:
-                            player_name = cells[0].get_text(strip=True)
-                            team_name = cells[1].get_text(strip=True)
+                            player_name = cells[0].text(strip=True)
+                            team_name = cells[1].text(strip=True)
                             
                             # Se não tem time, tentar inferir pelo contexto
                             if not team_name and teams and len(teams) >= 2:
@@ -503,17 +777,18 @@ def extract_match_maps(soup, match_url):
                                     team_name = teams[1]
                             
                             # Adicionar apenas se não estiver duplicado
-                            if not any(p.get('player') == player_name for p in map_stats):
+                            if player_name not in seen_players:
+                                seen_players.add(player_name)
                                 map_stats.append({
                                     'player': player_name,
                                     'team': team_name
                                 })
             
-            logger.info(f"Extraídos {len(map_stats)} jogadores de tabelas alternativas para o mapa {map_name}")
+            logger.debug("Extraídos %s jogadores de tabelas alternativas para o mapa %s", len(map_stats), map_name)
         
         # Se tudo falhar, usar estrutura mínima com os jogadores da matrix se disponíveis
         if not map_stats and len(teams) >= 2:
-            logger.warning(f"Não foi possível extrair estatísticas detalhadas para o mapa {map_name}. Usando estrutura mínima.")
+            logger.warning("Não foi possível extrair estatísticas detalhadas para o mapa %s. Usando estrutura mínima.", map_name)
             
             # Se temos dados de matrix, usar nomes reais dos jogadores
             if matrix_data:
@@ -572,43 +847,36 @@ def extract_match_maps(soup, match_url):
         
         # Procurar na página principal pelo cabeçalho do mapa com este game_id
         # Os cabeçalhos com vm-stats-game-header estão na página principal, não na aba de performance
-        vm_stats_games = soup.select('.vm-stats-game')
-        target_game = None
-        for game in vm_stats_games:
-            if game.get('data-game-id') == game_id:
-                target_game = game
-                break
-                
-        if target_game:
-            game_header = target_game.select_one('.vm-stats-game-header')
+        if game_id in index.games:
+            game_header = index.headers[game_id]
             if game_header:
-                logger.debug(f"Encontrou vm-stats-game-header para mapa {map_name} (ID: {game_id})")
+                logger.debug("Encontrou vm-stats-game-header para mapa %s (ID: %s)", map_name, game_id)
                 
                 # Extrair pontuações dos elementos .score
-                score_elements = game_header.select('.score')
+                score_elements = game_header.css('.score')
                 for i, score_elem in enumerate(score_elements):
-                    score_text = score_elem.get_text(strip=True)
+                    score_text = score_elem.text(strip=True)
                     try:
                         if i < len(team_scores):
                             team_scores[i] = int(score_text)
                     except (ValueError, TypeError):
                         pass
                 
-                logger.debug(f"Pontuações extraídas do cabeçalho do mapa: {team_scores}")
+                logger.debug("Pontuações extraídas do cabeçalho do mapa: %s", team_scores)
                 
                 # Também extrair nomes de times se necessário
                 if not teams or len(teams) < 2:
                     map_team_names = []
-                    for team_div in game_header.select('.team'):
-                        team_name_div = team_div.select_one('.team-name')
+                    for team_div in game_header.css('.team'):
+                        team_name_div = team_div.css_first('.team-name')
                         if team_name_div:
-                            team_name = team_name_div.get_text(strip=True)
+                            team_name = team_name_div.text(strip=True)
                             if team_name:
                                 map_team_names.append(team_name)
                     
                     if len(map_team_names) >= 2:
                         teams = map_team_names
-                        logger.debug(f"Times extraídos do cabeçalho do mapa: {teams}")
+                        logger.debug("Times extraídos do cabeçalho do mapa: %s", teams)
         
         # Se não conseguiu extrair pontuações do cabeçalho, tentar outros métodos
         if team_scores[0] is None or team_scores[1] is None:
@@ -616,10 +884,10 @@ def extract_match_maps(soup, match_url):
             extracted_scores = []
             
             if map_div is not None:
-                score_elements = map_div.select('.score, .mod-t, .mod-ct, .mod-score')
+                score_elements = map_div.css('.score, .mod-t, .mod-ct, .mod-score')
                 if score_elements:
                     for score_elem in score_elements:
-                        score_text = score_elem.get_text(strip=True)
+                        score_text = score_elem.text(strip=True)
                         try:
                             score = int(score_text)
                             extracted_scores.append(score)
@@ -628,11 +896,11 @@ def extract_match_maps(soup, match_url):
             
             # Tentar nas abas
             if not extracted_scores or len(extracted_scores) < 2:
-                score_container = soup.select_one(f'.vm-stats-gamesnav-item[data-game-id="{game_id}"]')
+                score_container = index.nav_items.get(game_id)
                 if score_container:
-                    score_items = score_container.select('.team-score, .score')
+                    score_items = score_container.css('.team-score, .score')
                     for score_item in score_items:
-                        score_text = score_item.get_text(strip=True)
+                        score_text = score_item.text(strip=True)
                         try:
                             score = int(score_text)
                             extracted_scores.append(score)
@@ -645,103 +913,9 @@ def extract_match_maps(soup, match_url):
                 team_scores[1] = extracted_scores[1]
         
         # Extrair informações sobre os rounds do mapa
-        rounds_data = []
-        vlr_rounds = soup.select('.vlr-rounds')
-        
-        # Encontrar o vlr-rounds correspondente ao mapa atual
-        target_vlr_rounds = None
-        if vlr_rounds:
-            # Se houver apenas um elemento vlr-rounds, usamos ele
-            if len(vlr_rounds) == 1:
-                target_vlr_rounds = vlr_rounds[0]
-            # Se houver vários, tentamos encontrar o que corresponde ao game_id atual
-            elif len(vlr_rounds) > 1:
-                # Tenta encontrar o div de rounds correspondente a este mapa
-                # Assume que a ordem dos vlr-rounds corresponde à ordem dos mapas
-                if game_id and game_id.isdigit():
-                    map_index = int(game_id) - 1
-                    if map_index < len(vlr_rounds):
-                        target_vlr_rounds = vlr_rounds[map_index]
-                    else:
-                        target_vlr_rounds = vlr_rounds[0]
-                else:
-                    # Se não conseguir determinar, usa o primeiro
-                    target_vlr_rounds = vlr_rounds[0]
-        
-        if target_vlr_rounds:
-            # Extrair os times
-            team_elements = target_vlr_rounds.select('.team')
-            round_teams = []
-            for team_elem in team_elements:
-                team_name = team_elem.get_text(strip=True)
-                team_img = None
-                img_elem = team_elem.select_one('img')
-                if img_elem:
-                    team_img = img_elem.get('src')
-                    if team_img and team_img.startswith('//'):
-                        team_img = 'https:' + team_img
-                round_teams.append({
-                    'name': team_name,
-                    'img': team_img
-                })
-            
-            # Extrair os rounds
-            round_cols = target_vlr_rounds.select('.vlr-rounds-row-col:not(.mod-spacing)')
-            
-            for col in round_cols:
-                # Pular a coluna de rótulos de times
-                if not col.select_one('.rnd-num'):
-                    continue
-                
-                round_num = col.select_one('.rnd-num')
-                if not round_num:
-                    continue
-                
-                round_data = {
-                    'round_number': round_num.get_text(strip=True),
-                    'title': col.get('title', ''),
-                    'winner': None,
-                    'winner_team': None,
-                    'win_type': None,
-                    'win_side': None
-                }
-                
-                # Procurar pelo quadrado vencedor
-                win_square = col.select_one('.rnd-sq.mod-win')
-                if win_square:
-                    # Determinar o time vencedor
-                    winner_index = None
-                    if 'mod-t' in win_square.get('class', []):
-                        round_data['win_side'] = 'attack'
-                        winner_index = 0 if win_square == col.select('.rnd-sq')[0] else 1
-                    elif 'mod-ct' in win_square.get('class', []):
-                        round_data['win_side'] = 'defense'
-                        winner_index = 0 if win_square == col.select('.rnd-sq')[0] else 1
-                    
-                    # Definir o índice do vencedor e o nome do time vencedor
-                    if winner_index is not None:
-                        round_data['winner'] = winner_index
-                        if winner_index < len(teams):
-                            round_data['winner_team'] = teams[winner_index]
-                    
-                    # Extrair o tipo de vitória com base na imagem
-                    img_elem = win_square.select_one('img')
-                    if img_elem:
-                        img_src = img_elem.get('src', '')
-                        if 'elim' in img_src:
-                            round_data['win_type'] = 'elimination'
-                        elif 'boom' in img_src:
-                            round_data['win_type'] = 'spike_detonation'
-                        elif 'defuse' in img_src:
-                            round_data['win_type'] = 'spike_defuse'
-                        elif 'time' in img_src:
-                            round_data['win_type'] = 'time_out'
-                
-                rounds_data.append(round_data)
-            
-            logger.debug(f"Extraídos {len(rounds_data)} rounds para o mapa {map_name}")
-        else:
-            logger.debug(f"Não foi possível encontrar dados de rounds para o mapa {map_name}")
+        rounds_data = None
+        if want_rounds:
+            rounds_data = [] if position in pending else extract_map_rounds(index, game_id, teams, map_name)
         
         # Inicializar dados do mapa
         map_data = {
@@ -751,10 +925,13 @@ def extract_match_maps(soup, match_url):
                 {'name': teams[0], 'score': team_scores[0]} if len(teams) > 0 else {'name': None, 'score': None},
                 {'name': teams[1], 'score': team_scores[1]} if len(teams) > 1 else {'name': None, 'score': None}
             ],
-            'stats': map_stats,
-            'rounds': rounds_data,
-            'performance': performance_data
+            'stats': map_stats
         }
+        # Seções não pedidas em include= ficam fora da resposta
+        if want_rounds:
+            map_data['rounds'] = rounds_data
+        if performance_data is not None:
+            map_data['performance'] = performance_data
         
         # Garantir que os campos teams e stats estão presentes
         if 'teams' not in map_data:
@@ -770,8 +947,214 @@ def extract_match_maps(soup, match_url):
     
     return match_maps
 
+def _compact_table(table):
+    # As grades só são montadas para a forma compacta, a partir dos matchups
+    compact = {key: value for key, value in table.items() if key != "matchups"}
+    compact["matrix"] = dense_matrix(table.get("matchups") or [])
+    return compact
+
+def _compact_matrix(matrix):
+    compact = _compact_table(matrix)
+    for table in ("fk_fd", "op_kills"):
+        if isinstance(matrix.get(table), dict):
+            compact[table] = _compact_table(matrix[table])
+    return compact
+
+def _compact_map(map_data):
+    performance = map_data.get("performance")
+    if isinstance(performance, dict) and isinstance(performance.get("player_matrix"), dict):
+        performance = {**performance, "player_matrix": _compact_matrix(performance["player_matrix"])}
+        return {**map_data, "performance": performance}
+    return map_data
+
+def compact_match_details(data):
+    """
+    Return match details with every player matrix reduced to its integer grids.
+
+    The per-cell "matchups" dicts repeat both player names in every cell; the
+    "matrix" grids built here hold the same numbers indexed by row_players
+    and column_players positions. The full payload does not carry the grids
+    and the cached copy is left untouched.
+    """
+    details = data["data"].get("match_details")
+    if not details or not details.get("match_maps"):
+        return data
+    maps = [_compact_map(map_data) for map_data in details["match_maps"]]
+    return {**data, "data": {**data["data"], "match_details": {**details, "match_maps": maps}}}
+
+def _match_cache_key(match_url, compact=False, include=None):
+    return normalize_match_url(match_url), compact, match_sections(include)
+
 # Alias for compatibility with imports
-def vlr_match_details(match_url):
-    return get_match_details(match_url)
+@cached("match", key=_match_cache_key, ttl=_match_cache_ttl)
+async def vlr_match_details(match_url, compact=False, include=None):
+    if compact:
+        # Built from the cached full payload, so both shapes share one scrape
+        return compact_match_details(await vlr_match_details(match_url, include=include))
+    return await get_match_details(match_url, match_sections(include))
+
+
+async def get_match_map(match_url, game_id, sections=None):
+    """
+    Scrape a single map of a match.
+
+    Only the match page and, for the matrix and advanced stats, the
+    performance tab of that one game are fetched. Both come through the
+    shared document cache, so requests for several maps of a match (or for
+    the full details) made close together reuse the parsed pages.
+
+    Args:
+        match_url (str): Match ID, path or URL
+        game_id (str): data-game-id of the map, as in match_maps[].game_id
+        sections (frozenset, optional): As for get_match_details; only
+            "maps", "rounds", "matrix" and "adv_stats" apply to a map
+
+    Returns:
+        dict: {"data": {"status", "match_id", "match_status", "match_map"}},
+            or {"data": {"status", "error"}} if the page or map was not found.
+            "degraded" is set in "data" when the performance tab failed to load
+    """
+    url = normalize_match_url(match_url)
+    if sections is None:
+        sections = ALL_SECTIONS
+    documents = DocumentCache()
+    status, soup = await documents.get(url)
+    if status != 200:
+        return {
+            "data": {
+                "status": status,
+                "error": f"Failed to fetch match details. Status code: {status}"
+            }
+        }
+    match_status = extract_match_status(soup)
+    # Partidas que ainda não começaram não têm mapas para extrair
+    match_maps = []
+    if match_status != "Upcoming":
+        match_maps = await extract_match_maps(
+            soup, url, documents, sections, only_game=game_id, match_status=match_status
+        )
+    if not match_maps or match_maps[0].get('game_id') != game_id:
+        return {"data": {"status": 404, "error": f"Map {game_id} not found in this match"}}
+    segments = {
+        "status": status,
+        "match_id": re.sub(r'[^0-9]', '', url.split("/")[3]),
+        "match_status": match_status,
+        "match_map": match_maps[0],
+    }
+    if _is_degraded(documents, match_maps, sections):
+        segments["degraded"] = True
+    return {"data": segments}
+
+def _map_cache_ttl(data):
+    # Same rules as the full details: errors, live matches and incomplete
+    # payloads are not cached
+    if "error" in data["data"] or data["data"]["match_status"] == "Live" or data["data"].get("degraded"):
+        return False
+    return None
+
+def _map_cache_key(match_url, game_id, compact=False, include=None):
+    return normalize_match_url(match_url), game_id, compact, match_sections(include)
+
+@cached("match_map", key=_map_cache_key, ttl=_map_cache_ttl)
+async def vlr_match_map(match_url, game_id, compact=False, include=None):
+    if compact:
+        data = await vlr_match_map(match_url, game_id, include=include)
+        if "error" in data["data"]:
+            return data
+        return {"data": {**data["data"], "match_map": _compact_map(data["data"]["match_map"])}}
+    return await get_match_map(match_url, game_id, match_sections(include))
+
+
+async def iter_match_details(match_urls, concurrency=None):
+    """
+    Scrape several matches concurrently and yield each one as soon as it is done.
+
+    Args:
+        match_urls (list): Match IDs, paths or URLs; duplicates are scraped once
+        concurrency (int, optional): Matches in progress at once, defaults to BATCH_CONCURRENCY
+
+    Yields:
+        tuple: (match_url, data, error); data is what vlr_match_details returns,
+            or None with the exception that stopped the scrape as error
+    """
+    queue = deque(dict.fromkeys(match_urls))
+    limit = concurrency or BATCH_CONCURRENCY
+    running = {}
+    try:
+        while queue or running:
+            while queue and len(running) < limit:
+                match_url = queue.popleft()
+                running[asyncio.ensure_future(vlr_match_details(match_url))] = match_url
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                match_url = running.pop(task)
+                error = task.exception()
+                if error is not None:
+                    logger.warning("Batch scrape of match %s failed: %s", match_url, error)
+                    yield match_url, None, error
+                else:
+                    yield match_url, task.result(), None
+    finally:
+        for task in running:
+            task.cancel()
+
+
+def _batch_record(match_url, data, error):
+    if error is not None:
+        return {"match": match_url, "error": str(error) or type(error).__name__}
+    return {"match": match_url, **data}
+
+
+def _batch_meta(match_urls, records):
+    # records holds one record per distinct match, so both response formats
+    # count successes and failures the same way
+    failed = sum(1 for record in records if "error" in record or "error" in record["data"])
+    return {
+        "requested": len(match_urls),
+        "unique": len(records),
+        "successful": len(records) - failed,
+        "failed": failed,
+    }
+
+
+async def vlr_match_details_batch(match_urls, concurrency=None):
+    """
+    Scrape the details of several matches.
+
+    Args:
+        match_urls (list): Match IDs, paths or URLs, in any format vlr_match_details accepts
+        concurrency (int, optional): Matches in progress at once, defaults to BATCH_CONCURRENCY
+
+    Returns:
+        dict: One record per requested match, in request order. A record holds
+            the "data" /match/{match_id} would return, or an "error" message
+    """
+    records = {}
+    async for match_url, data, error in iter_match_details(match_urls, concurrency):
+        records[match_url] = _batch_record(match_url, data, error)
+    segments = [records[match_url] for match_url in match_urls]
+    return {
+        "data": {
+            "status": 200,
+            "segments": segments,
+            "meta": _batch_meta(match_urls, list(records.values())),
+        }
+    }
+
+
+async def vlr_match_details_stream(match_urls, concurrency=None):
+    """
+    Stream the details of several matches in the order they finish.
 
+    Args:
+        Same as vlr_match_details_batch.
 
+    Yields:
+        dict: One record per distinct match, then a trailing {"meta": {...}} record
+    """
+    records = []
+    async for match_url, data, error in iter_match_details(match_urls, concurrency):
+        record = _batch_record(match_url, data, error)
+        records.append(record)
+        yield record
+    yield {"meta": _batch_meta(match_urls, records)}
@@ -1,29 +1,37 @@
+import asyncio
+import logging
+import os
+import random
 import re
 import time
+from collections import deque
+from dataclasses import replace
 from datetime import datetime, timezone
 
-import requests
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 from selectolax.parser import HTMLParser
 
-from utils.utils import headers
+from api.scrapers.models import LiveMatch, MatchResult, UpcomingMatch
+from utils import timing
+from utils.cache import cached
+from utils.fetch import fetch, fetch_parsed
+from utils.metrics import CACHE_LOOKUPS, PARSE_LATENCY, UPSTREAM_RETRIES
+from utils.ratelimit import TokenBucket
+from utils.singleflight import coalesce
+from utils.store import store, ttl_for
 
+logger = logging.getLogger(__name__)
+
+# Results pages fetched at the same time by one /match?q=results request.
+RESULTS_CONCURRENCY = int(os.environ.get("VLR_RESULTS_CONCURRENCY", 8))
+# Process-wide budget for results page requests (pages per second).
+RESULTS_RATE = float(os.environ.get("VLR_RESULTS_RATE", 5))
+results_rate_limit = TokenBucket(RESULTS_RATE, RESULTS_CONCURRENCY)
 
-def vlr_upcoming_matches(num_pages=1, from_page=None, to_page=None):
-    """
-    Get upcoming matches from VLR.GG.
-    
-    Args:
-        num_pages (int): Number of pages to scrape from page 1 (ignored if from_page/to_page specified)
-        from_page (int, optional): Starting page number (1-based)
-        to_page (int, optional): Ending page number (1-based, inclusive)
-    """
-    # Note: VLR.GG upcoming matches are typically only on the homepage
-    # Page range parameters are included for API consistency but may not apply
-    url = "https://www.vlr.gg"
-    resp = requests.get(url, headers=headers)
-    html = HTMLParser(resp.text)
-    status = resp.status_code
 
+def _parse_upcoming(text):
+    html = HTMLParser(text)
     result = []
     for item in html.css(".js-home-matches-upcoming a.wf-module-item"):
         is_upcoming = item.css_first(".h-match-eta.mod-upcoming")
@@ -54,43 +62,147 @@ def vlr_upcoming_matches(num_pages=1, from_page=None, to_page=None):
             url_path = "https://www.vlr.gg/" + item.attributes["href"]
 
             result.append(
-                {
-                    "team1": teams[0],
-                    "team2": teams[1],
-                    "flag1": flags[0],
-                    "flag2": flags[1],
-                    "time_until_match": eta,
-                    "match_series": match_series,
-                    "match_event": match_event,
-                    "unix_timestamp": timestamp,
-                    "match_page": url_path,
-                }
+                UpcomingMatch(
+                    team1=teams[0],
+                    team2=teams[1],
+                    flag1=flags[0],
+                    flag2=flags[1],
+                    time_until_match=eta,
+                    match_series=match_series,
+                    match_event=match_event,
+                    unix_timestamp=timestamp,
+                    match_page=url_path,
+                )
             )
+    return result
 
-    segments = {"status": status, "segments": result}
-    data = {"data": segments}
-
-    if status != 200:
-        raise Exception("API response: {}".format(status))
-    return data
 
-
-def vlr_live_score(num_pages=1, from_page=None, to_page=None):
+@coalesce("upcoming")
+async def vlr_upcoming_matches(num_pages=1, from_page=None, to_page=None):
     """
-    Get live match scores from VLR.GG.
+    Get upcoming matches from VLR.GG.
     
     Args:
         num_pages (int): Number of pages to scrape from page 1 (ignored if from_page/to_page specified)
         from_page (int, optional): Starting page number (1-based)
         to_page (int, optional): Ending page number (1-based, inclusive)
     """
-    # Note: VLR.GG live matches are typically only on the homepage
+    # Note: VLR.GG upcoming matches are typically only on the homepage
     # Page range parameters are included for API consistency but may not apply
     url = "https://www.vlr.gg"
-    resp = requests.get(url, headers=headers)
-    html = HTMLParser(resp.text)
-    status = resp.status_code
+    status, result = await fetch_parsed(url, _parse_upcoming)
+
+    if status != 200:
+        raise Exception("API response: {}".format(status))
+    segments = {"status": status, "segments": result}
+    data = {"data": segments}
+    return data
+
+
+# Seconds a live match page is reused while its series score is unchanged.
+LIVE_PAGE_MAX_AGE = float(os.environ.get("VLR_LIVE_PAGE_MAX_AGE", 60))
+
+
+class _LiveMatch:
+    __slots__ = ("team_logos", "current_map", "map_number", "score", "fetched_at")
+
+    def __init__(self, team_logos):
+        self.team_logos = team_logos
+        self.current_map = "Unknown"
+        self.map_number = "Unknown"
+        self.score = None
+        self.fetched_at = 0.0
+
+
+class LiveMatchPages:
+    """
+    Details only found on live match pages, kept across live score polls.
+
+    Team logos never change during a match, so they are parsed once. The
+    current map only changes when a map ends, so a match page is fetched again
+    only when its series score on the homepage changes or after max_age
+    seconds. Matches that are no longer live are forgotten.
+    """
+
+    def __init__(self, max_age=LIVE_PAGE_MAX_AGE):
+        self.max_age = max_age
+        self._matches = {}
+
+    def clear(self):
+        self._matches.clear()
+
+    def _needs_fetch(self, url, score, now):
+        match = self._matches.get(url)
+        return match is None or match.score != score or now - match.fetched_at > self.max_age
+
+    async def _fetch(self, url, score):
+        resp = await fetch(url)
+        if resp.status_code != 200:
+            raise Exception("API response: {}".format(resp.status_code))
+        with PARSE_LATENCY.labels("live_match").time(), timing.parsing(url):
+            self._update(url, score, HTMLParser(resp.text))
+
+    def _update(self, url, score, match_html):
+        match = self._matches.get(url)
+        if match is None:
+            match = _LiveMatch(
+                ["https:" + img.attributes.get("src", "") for img in match_html.css(".match-header-vs img")]
+            )
+            self._matches[url] = match
+
+        current_map_element = match_html.css_first(
+            ".vm-stats-gamesnav-item.js-map-switch.mod-active.mod-live"
+        )
+        if current_map_element:
+            map_text = (
+                current_map_element.css_first("div", default="Unknown")
+                .text()
+                .strip()
+                .replace("\n", "")
+                .replace("\t", "")
+            )
+            map_number_match = re.search(r"^\d+", map_text)
+            match.current_map = re.sub(r"^\d+", "", map_text)
+            match.map_number = map_number_match.group(0) if map_number_match else "Unknown"
+        else:
+            match.current_map = "Unknown"
+            match.map_number = "Unknown"
+        match.score = score
+        match.fetched_at = time.monotonic()
+
+    async def get(self, scores):
+        """
+        Return the details of every live match, fetching only pages that are out of date.
 
+        Args:
+            scores (dict): Match page URL to its current series score on the homepage
+
+        Returns:
+            dict: Match page URL to its _LiveMatch, or None if its page could not be fetched
+        """
+        for url in list(self._matches):
+            if url not in scores:
+                del self._matches[url]
+
+        now = time.monotonic()
+        stale = [url for url, score in scores.items() if self._needs_fetch(url, score, now)]
+        CACHE_LOOKUPS.labels("live_page", "live", "hit").inc(len(scores) - len(stale))
+        CACHE_LOOKUPS.labels("live_page", "live", "miss").inc(len(stale))
+        fetched = await asyncio.gather(
+            *(self._fetch(url, scores[url]) for url in stale), return_exceptions=True
+        )
+        for url, error in zip(stale, fetched):
+            if isinstance(error, Exception):
+                # Keep serving what the previous poll found, if anything
+                logger.warning("Failed to fetch live match page %s: %s", url, error)
+        return {url: self._matches.get(url) for url in scores}
+
+
+live_match_pages = LiveMatchPages()
+
+
+def _parse_live(text):
+    html = HTMLParser(text)
     matches = html.css(".js-home-matches-upcoming a.wf-module-item")
     result = []
     for match in matches:
@@ -126,96 +238,92 @@ def vlr_live_score(num_pages=1, from_page=None, to_page=None):
             ).strftime("%Y-%m-%d %H:%M:%S")
             url_path = "https://www.vlr.gg/" + match.attributes["href"]
 
-            match_page = requests.get(url_path, headers=headers)
-            match_html = HTMLParser(match_page.text)
-            
-            team_logos = []
-            for img in match_html.css(".match-header-vs img"):
-                logo_url = "https:" + img.attributes.get("src", "")
-                team_logos.append(logo_url)
-
-            current_map_element = match_html.css_first(
-                ".vm-stats-gamesnav-item.js-map-switch.mod-active.mod-live"
-            )
-            current_map = "Unknown"
-            if current_map_element:
-                current_map = (
-                    current_map_element.css_first("div", default="Unknown")
-                    .text()
-                    .strip()
-                    .replace("\n", "")
-                    .replace("\t", "")
-                )
-                current_map = re.sub(r"^\d+", "", current_map)
-                map_number_match = (
-                    current_map_element.css_first("div", default="Unknown")
-                    .text()
-                    .strip()
-                    .replace("\n", "")
-                    .replace("\t", "")
-                )
-                map_number_match = re.search(r"^\d+", map_number_match)
-                map_number = (
-                    map_number_match.group(0) if map_number_match else "Unknown"
-                )
-
             team1_round_ct = round_texts[0]["ct"] if len(round_texts) > 0 else "N/A"
             team1_round_t = round_texts[0]["t"] if len(round_texts) > 0 else "N/A"
             team2_round_ct = round_texts[1]["ct"] if len(round_texts) > 1 else "N/A"
             team2_round_t = round_texts[1]["t"] if len(round_texts) > 1 else "N/A"
+            # Logos and the current map are filled in from the match page
             result.append(
-                {
-                    "team1": teams[0],
-                    "team2": teams[1],
-                    "flag1": flags[0],
-                    "flag2": flags[1],
-                    "team1_logo": team_logos[0] if len(team_logos) > 0 else "",
-                    "team2_logo": team_logos[1] if len(team_logos) > 1 else "",
-                    "score1": scores[0],
-                    "score2": scores[1],
-                    "team1_round_ct": team1_round_ct,
-                    "team1_round_t": team1_round_t,
-                    "team2_round_ct": team2_round_ct,
-                    "team2_round_t": team2_round_t,
-                    "map_number": map_number,
-                    "current_map": current_map,
-                    "time_until_match": eta,
-                    "match_event": match_event,
-                    "match_series": match_series,
-                    "unix_timestamp": timestamp,
-                    "match_page": url_path,
-                }
+                LiveMatch(
+                    team1=teams[0],
+                    team2=teams[1],
+                    flag1=flags[0],
+                    flag2=flags[1],
+                    team1_logo="",
+                    team2_logo="",
+                    score1=scores[0],
+                    score2=scores[1],
+                    team1_round_ct=team1_round_ct,
+                    team1_round_t=team1_round_t,
+                    team2_round_ct=team2_round_ct,
+                    team2_round_t=team2_round_t,
+                    map_number="Unknown",
+                    current_map="Unknown",
+                    time_until_match=eta,
+                    match_event=match_event,
+                    match_series=match_series,
+                    unix_timestamp=timestamp,
+                    match_page=url_path,
+                )
             )
+    return result
 
-    segments = {"status": status, "segments": result}
-    data = {"data": segments}
-
-    if status != 200:
-        raise Exception("API response: {}".format(status))
-    return data
 
-
-def vlr_match_results(num_pages=1, from_page=None, to_page=None, max_retries=3, request_delay=1.0, timeout=30):
+@coalesce("live_score")
+async def vlr_live_score(num_pages=1, from_page=None, to_page=None):
     """
-    Scrape match results with robust error handling for large page counts.
+    Get live match scores from VLR.GG.
+
+    Scores and rounds come from the homepage on every call; team logos and the
+    current map come from each match page through live_match_pages, which
+    fetches those pages concurrently and only when they may have changed.
     
     Args:
         num_pages (int): Number of pages to scrape from page 1 (ignored if from_page/to_page specified)
         from_page (int, optional): Starting page number (1-based)
         to_page (int, optional): Ending page number (1-based, inclusive)
-        max_retries (int): Maximum retry attempts per page
-        request_delay (float): Delay between requests in seconds
-        timeout (int): Request timeout in seconds
-        
-    Returns:
-        dict: API response with match data
     """
+    # Note: VLR.GG live matches are typically only on the homepage
+    # Page range parameters are included for API consistency but may not apply
+    url = "https://www.vlr.gg"
+    status, live = await fetch_parsed(url, _parse_live)
 
+    if status != 200:
+        raise Exception("API response: {}".format(status))
+
+    # All live match pages that are out of date are fetched concurrently
+    pages = await live_match_pages.get(
+        {match.match_page: (match.score1, match.score2) for match in live}
+    )
     result = []
-    status = 200
-    failed_pages = []
-    
-    # Determine page range
+    for match in live:
+        page = pages[match.match_page]
+        if page is None:
+            result.append(match)
+            continue
+        team_logos = page.team_logos
+        result.append(
+            replace(
+                match,
+                team1_logo=team_logos[0] if len(team_logos) > 0 else "",
+                team2_logo=team_logos[1] if len(team_logos) > 1 else "",
+                map_number=page.map_number,
+                current_map=page.current_map,
+            )
+        )
+
+    segments = {"status": status, "segments": result}
+    data = {"data": segments}
+    return data
+
+
+def _page_range(num_pages=1, from_page=None, to_page=None):
+    """
+    Resolve the page range parameters of the results endpoint.
+
+    Returns:
+        tuple: (start_page, end_page, total_pages)
+    """
     if from_page is not None and to_page is not None:
         if from_page < 1:
             raise ValueError("from_page must be >= 1")
@@ -241,178 +349,371 @@ def vlr_match_results(num_pages=1, from_page=None, to_page=None, max_retries=3,
         start_page = 1
         end_page = num_pages
         total_pages = num_pages
-    
-    # Create a session for connection pooling and efficiency
-    session = requests.Session()
-    session.headers.update(headers)
-    
-    print(f"Starting to scrape pages {start_page}-{end_page} ({total_pages} pages) with {request_delay}s delay between requests...")
-    
-    for page in range(start_page, end_page + 1):
-        page_success = False
-        retry_count = 0
-        
-        while not page_success and retry_count < max_retries:
-            try:
-                if page == 1:
-                    url = "https://www.vlr.gg/matches/results"
+    return start_page, end_page, total_pages
+
+
+def _results_url(page):
+    if page == 1:
+        return "https://www.vlr.gg/matches/results"
+    return f"https://www.vlr.gg/matches/results/?page={page}"
+
+
+# Every field of every item on a results page, in a single query. lexbor
+# returns the matches in document order, so the fields of an item follow
+# its <a> node and the page is walked once with the selector compiled once.
+RESULTS_ITEM_SELECTOR = ", ".join(
+    "a.wf-module-item" + descendant
+    for descendant in (
+        "",
+        " img",
+        " .flag",
+        " .match-item-vs-team-name",
+        " .match-item-vs-team-score",
+        " .ml-eta",
+        " .match-item-event",
+        " .match-item-event-series",
+    )
+)
+_ROUND_INFO_CHARS = str.maketrans({"\u2013": "-", "\n": None, "\t": None})
+_SCORE_CHARS = str.maketrans({" ": None, "\n": None, "\t": None})
+# lexbor tag ids; comparing them is far cheaper than reading node.tag
+_A_TAG = LexborHTMLParser("<a></a>").css_first("a").tag_id
+_IMG_TAG = LexborHTMLParser("<img>").css_first("img").tag_id
+
+
+class _ResultsItem:
+    __slots__ = ("href", "icon", "flags", "names", "scores", "eta", "event", "series")
+
+    def __init__(self, href):
+        self.href = href
+        self.icon = None
+        self.flags = []
+        self.names = []
+        self.scores = []
+        self.eta = None
+        self.event = None
+        self.series = None
+
+    def add_flag(self, node, classes):
+        self.flags.append(classes.replace(" mod-", "_"))
+
+    def add_name(self, node, classes):
+        self.names.append(node.text().strip())
+
+    def add_score(self, node, classes):
+        self.scores.append(node.text().translate(_SCORE_CHARS))
+
+    def set_eta(self, node, classes):
+        if self.eta is None:
+            self.eta = node.text()
+
+    def set_event(self, node, classes):
+        if self.event is None:
+            self.event = node.text()
+
+    def set_series(self, node, classes):
+        if self.series is None:
+            self.series = node.text()
+
+    def to_result(self, page):
+        return MatchResult(
+            team1=self.names[0],
+            team2=self.names[1],
+            score1=self.scores[0],
+            score2=self.scores[-1],
+            flag1=self.flags[0] if len(self.flags) > 0 else "",
+            flag2=self.flags[1] if len(self.flags) > 1 else "",
+            time_completed=self.eta + " ago",
+            round_info=self.series.translate(_ROUND_INFO_CHARS),
+            tournament_name=self.event.replace("\t", " ").strip().split("\n")[1].strip(),
+            match_page=self.href,
+            tournament_icon=f"https:{self.icon}",
+            page_number=page,  # Track which page this came from
+        )
+
+
+# Class matched by each part of RESULTS_ITEM_SELECTOR, and what to do with it.
+_RESULTS_ITEM_FIELDS = {
+    "flag": _ResultsItem.add_flag,
+    "match-item-vs-team-name": _ResultsItem.add_name,
+    "match-item-vs-team-score": _ResultsItem.add_score,
+    "ml-eta": _ResultsItem.set_eta,
+    "match-item-event": _ResultsItem.set_event,
+    "match-item-event-series": _ResultsItem.set_series,
+}
+
+
+def _results_field(classes):
+    # The field class is normally the first one; fall back to scanning the rest
+    first = classes.split(" ", 1)[0]
+    handler = _RESULTS_ITEM_FIELDS.get(first)
+    if handler is None:
+        for name in classes.split():
+            handler = _RESULTS_ITEM_FIELDS.get(name)
+            if handler is not None:
+                break
+    return handler
+
+
+def _parse_results_page(html, page):
+    """
+    Extract the matches of one results page.
+
+    Args:
+        html (LexborHTMLParser): Parsed results page
+        page (int): Page number, copied into every match
+
+    Returns:
+        list: One MatchResult per match; items missing a field are logged and skipped
+    """
+    items = []
+    item = None
+    for node in html.css(RESULTS_ITEM_SELECTOR):
+        tag_id = node.tag_id
+        if tag_id == _A_TAG:
+            item = _ResultsItem(node.attributes.get("href"))
+            items.append(item)
+        elif item is None:
+            continue
+        elif tag_id == _IMG_TAG:
+            if item.icon is None:
+                item.icon = node.attributes.get("src")
+        else:
+            classes = node.attributes.get("class") or ""
+            handler = _results_field(classes)
+            if handler is not None:
+                handler(item, node, classes)
+
+    page_results = []
+    for item in items:
+        try:
+            page_results.append(item.to_result(page))
+        except Exception as e:
+            logger.warning("Failed to parse match item on page %s: %s", page, e)
+    return page_results
+
+
+def _backoff(request_delay, retry_count):
+    # Exponential backoff with jitter so retried pages do not hit vlr.gg in lockstep
+    return request_delay * (2 ** retry_count) * random.uniform(0.5, 1.5)
+
+
+async def _scrape_results_page(page, max_retries, request_delay, timeout):
+    """
+    Fetch and parse one results page, retrying with jittered backoff.
+
+    Every attempt waits for a token from the shared results_rate_limit.
+    Sleeping between retries only holds up this page, not the others.
+
+    Returns:
+        list: Parsed matches, or None if every attempt failed
+    """
+    # Rows of recently scraped pages are shared through the persistent store
+    rows = await store.get("results", str(page)) if timing.current() is None else None
+    if rows is not None:
+        CACHE_LOOKUPS.labels("store", "results", "hit").inc()
+        return [MatchResult(**row) for row in rows]
+    CACHE_LOOKUPS.labels("store", "results", "miss").inc()
+
+    url = _results_url(page)
+    for attempt in range(1, max_retries + 1):
+        await results_rate_limit.acquire()
+        try:
+            resp = await fetch(url, timeout=timeout)
+            if resp.status_code == 200:
+                with PARSE_LATENCY.labels("results").time(), timing.parsing(page):
+                    page_results = _parse_results_page(LexborHTMLParser(resp.text), page)
+                if not page_results:
+                    logger.warning("No match items found on page %s", page)
                 else:
-                    url = f"https://www.vlr.gg/matches/results/?page={page}"
-                
-                current_page_num = page - start_page + 1
-                print(f"Scraping page {page} ({current_page_num}/{total_pages}) (attempt {retry_count + 1}/{max_retries})")
-                
-                # Add timeout and handle potential connection issues
-                resp = session.get(url, timeout=timeout)
-                html = HTMLParser(resp.text)
-                current_status = resp.status_code
-                
-                if current_status != 200:
-                    print(f"Warning: Page {page} returned status {current_status}")
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        time.sleep(request_delay * (2 ** retry_count))  # Exponential backoff
-                    continue
-                
-                page_results = []
-                items = html.css("a.wf-module-item")
-                
-                if not items:
-                    print(f"Warning: No match items found on page {page}")
-                    page_success = True  # Consider empty page as success
-                    break
-                
-                for item in items:
-                    try:
-                        url_path = item.attributes["href"]
-                        eta = item.css_first("div.ml-eta").text() + " ago"
-                        rounds = (
-                            item.css_first("div.match-item-event-series")
-                            .text()
-                            .replace("\u2013", "-")
-                            .replace("\n", "")
-                            .replace("\t", "")
-                        )
-                        tourney = (
-                            item.css_first("div.match-item-event")
-                            .text()
-                            .replace("\t", " ")
-                            .strip()
-                            .split("\n")[1]
-                            .strip()
-                        )
-                        tourney_icon_url = f"https:{item.css_first('img').attributes['src']}"
-
-                        try:
-                            team_array = (
-                                item.css_first("div.match-item-vs").css_first("div:nth-child(2)").text()
-                            )
-                        except Exception:
-                            team_array = "TBD"
-                        team_array = (
-                            team_array.replace("\t", " ")
-                            .replace("\n", " ")
-                            .strip()
-                            .split("                                  ")
-                        )
-                        team1 = team_array[0]
-                        score1 = team_array[1].replace(" ", "").strip()
-                        team2 = team_array[4].strip()
-                        score2 = team_array[-1].replace(" ", "").strip()
-
-                        flag_list = [
-                            flag_parent.attributes["class"].replace(" mod-", "_")
-                            for flag_parent in item.css(".flag")
-                        ]
-                        flag1 = flag_list[0] if len(flag_list) > 0 else ""
-                        flag2 = flag_list[1] if len(flag_list) > 1 else ""
-
-                        page_results.append(
-                            {
-                                "team1": team1,
-                                "team2": team2,
-                                "score1": score1,
-                                "score2": score2,
-                                "flag1": flag1,
-                                "flag2": flag2,
-                                "time_completed": eta,
-                                "round_info": rounds,
-                                "tournament_name": tourney,
-                                "match_page": url_path,
-                                "tournament_icon": tourney_icon_url,
-                                "page_number": page,  # Track which page this came from
-                            }
-                        )
-                    except Exception as e:
-                        print(f"Warning: Failed to parse match item on page {page}: {str(e)}")
-                        continue
-                
-                result.extend(page_results)
-                print(f"Successfully scraped page {page}: {len(page_results)} matches")
-                page_success = True
-                
-                # Rate limiting between successful requests
-                if page < end_page:
-                    time.sleep(request_delay)
-                
-            except requests.exceptions.Timeout:
-                retry_count += 1
-                print(f"Timeout error on page {page}, attempt {retry_count}/{max_retries}")
-                if retry_count < max_retries:
-                    backoff_time = request_delay * (2 ** retry_count)
-                    print(f"Retrying page {page} in {backoff_time:.1f} seconds...")
-                    time.sleep(backoff_time)
-                
-            except requests.exceptions.ConnectionError:
-                retry_count += 1
-                print(f"Connection error on page {page}, attempt {retry_count}/{max_retries}")
-                if retry_count < max_retries:
-                    backoff_time = request_delay * (2 ** retry_count)
-                    print(f"Retrying page {page} in {backoff_time:.1f} seconds...")
-                    time.sleep(backoff_time)
-                
-            except Exception as e:
-                retry_count += 1
-                print(f"Unexpected error on page {page}: {str(e)}")
-                if retry_count < max_retries:
-                    backoff_time = request_delay * (2 ** retry_count)
-                    print(f"Retrying page {page} in {backoff_time:.1f} seconds...")
-                    time.sleep(backoff_time)
+                    await store.put("results", str(page), page_results, ttl_for("results"))
+                logger.info("Scraped page %s: %s matches", page, len(page_results))
+                return page_results
+            logger.warning("Page %s returned status %s (attempt %s/%s)", page, resp.status_code, attempt, max_retries)
+        except httpx.TimeoutException:
+            logger.warning("Timeout error on page %s (attempt %s/%s)", page, attempt, max_retries)
+        except httpx.TransportError:
+            logger.warning("Connection error on page %s (attempt %s/%s)", page, attempt, max_retries)
+        except Exception as e:
+            logger.warning("Unexpected error on page %s (attempt %s/%s): %s", page, attempt, max_retries, e)
+
+        if attempt < max_retries:
+            UPSTREAM_RETRIES.labels("results").inc()
+            await asyncio.sleep(_backoff(request_delay, attempt))
+
+    logger.warning("Failed to scrape page %s after %s attempts", page, max_retries)
+    return None
+
+
+async def iter_results_pages(start_page, end_page, max_retries=3, request_delay=1.0, timeout=30, concurrency=None):
+    """
+    Scrape results pages concurrently and yield them in page order.
+
+    At most `concurrency` pages are in flight or waiting to be consumed, so
+    memory stays bounded however long the range is. Closing the generator
+    early cancels the pages still being fetched.
+
+    Yields:
+        tuple: (page, matches), where matches is None if the page failed
+    """
+    concurrency = concurrency or RESULTS_CONCURRENCY
+    pages = iter(range(start_page, end_page + 1))
+    window = deque()
+
+    def schedule():
+        for page in pages:
+            task = asyncio.ensure_future(
+                _scrape_results_page(page, max_retries, request_delay, timeout)
+            )
+            window.append((page, task))
+            if len(window) >= concurrency:
+                return
+
+    schedule()
+    try:
+        while window:
+            page, task = window.popleft()
+            matches = await task
+            schedule()
+            yield page, matches
+    finally:
+        for _, task in window:
+            task.cancel()
+
+
+def _results_cache_key(num_pages=1, from_page=None, to_page=None, *args, **kwargs):
+    # Retry and concurrency settings do not change what a complete result holds
+    return _page_range(num_pages, from_page, to_page)[:2]
+
+
+def _results_cache_ttl(data):
+    # A result missing pages is not reused; the next request retries them
+    return False if data["data"]["meta"]["failed_pages"] else None
+
+
+@cached("results", key=_results_cache_key, ttl=_results_cache_ttl)
+async def vlr_match_results(
+    num_pages=1,
+    from_page=None,
+    to_page=None,
+    max_retries=3,
+    request_delay=1.0,
+    timeout=30,
+    concurrency=None,
+):
+    """
+    Scrape match results with robust error handling for large page counts.
+
+    Pages are fetched concurrently, at most `concurrency` at a time and within
+    the process-wide results_rate_limit, and reassembled in page order.
+    
+    Args:
+        num_pages (int): Number of pages to scrape from page 1 (ignored if from_page/to_page specified)
+        from_page (int, optional): Starting page number (1-based)
+        to_page (int, optional): Ending page number (1-based, inclusive)
+        max_retries (int): Maximum retry attempts per page
+        request_delay (float): Base delay in seconds for the backoff between retries of a page
+        timeout (int): Request timeout in seconds
+        concurrency (int, optional): Maximum number of pages in flight, defaults to RESULTS_CONCURRENCY
         
-        if not page_success:
+    Returns:
+        dict: API response with match data
+    """
+    status = 200
+    start_page, end_page, total_pages = _page_range(num_pages, from_page, to_page)
+
+    logger.info(
+        "Scraping results pages %s-%s (%s pages), %s in flight",
+        start_page, end_page, total_pages, concurrency or RESULTS_CONCURRENCY,
+    )
+
+    result = []
+    failed_pages = []
+    async for page, matches in iter_results_pages(
+        start_page, end_page, max_retries, request_delay, timeout, concurrency
+    ):
+        if matches is None:
             failed_pages.append(page)
-            print(f"Failed to scrape page {page} after {max_retries} attempts")
-    
-    # Close the session
-    session.close()
-    
+        else:
+            result.extend(matches)
+
     # Report results
     total_matches = len(result)
     successful_pages = total_pages - len(failed_pages)
-    
-    print(f"\nScraping completed:")
-    print(f"  Page range: {start_page}-{end_page}")
-    print(f"  Total matches: {total_matches}")
-    print(f"  Successful pages: {successful_pages}/{total_pages}")
-    
-    if failed_pages:
-        print(f"  Failed pages: {failed_pages}")
-        print(f"  Consider retrying failed pages or adjusting parameters")
+
+    logger.info(
+        "Scraped pages %s-%s: %s matches, %s/%s pages successful, failed pages: %s",
+        start_page, end_page, total_matches, successful_pages, total_pages, failed_pages,
+    )
     
     segments = {
         "status": status, 
         "segments": result,
-        "meta": {
-            "page_range": f"{start_page}-{end_page}",
-            "total_pages_requested": total_pages,
-            "successful_pages": successful_pages,
-            "failed_pages": failed_pages,
-            "total_matches": total_matches
-        }
+        "meta": _results_meta(start_page, end_page, total_pages, failed_pages, total_matches),
     }
     data = {"data": segments}
 
     if not result:
         raise Exception(f"No data retrieved. Failed pages: {failed_pages}")
     
-    return data
\ No newline at end of file
+    return data
+
+
+def _results_meta(start_page, end_page, total_pages, failed_pages, total_matches):
+    return {
+        "page_range": f"{start_page}-{end_page}",
+        "total_pages_requested": total_pages,
+        "successful_pages": total_pages - len(failed_pages),
+        "failed_pages": failed_pages,
+        "total_matches": total_matches
+    }
+
+
+async def vlr_match_results_stream(
+    num_pages=1,
+    from_page=None,
+    to_page=None,
+    max_retries=3,
+    request_delay=1.0,
+    timeout=30,
+    concurrency=None,
+):
+    """
+    Streaming variant of vlr_match_results for large page ranges.
+
+    Yields every match as soon as its page has been parsed, in page order,
+    followed by a single {"meta": {...}} record with the same fields as the
+    meta block of vlr_match_results. Nothing is accumulated, so memory does
+    not grow with the number of pages.
+
+    Args:
+        Same as vlr_match_results.
+
+    Yields:
+        MatchResult: One per match, then the trailing meta record (dict)
+    """
+    # Resolved eagerly so an invalid range fails before anything is sent.
+    start_page, end_page, total_pages = _page_range(num_pages, from_page, to_page)
+    return _stream_results(
+        start_page, end_page, total_pages, max_retries, request_delay, timeout, concurrency
+    )
+
+
+async def _stream_results(start_page, end_page, total_pages, max_retries, request_delay, timeout, concurrency):
+    failed_pages = []
+    total_matches = 0
+    async for page, matches in iter_results_pages(
+        start_page, end_page, max_retries, request_delay, timeout, concurrency
+    ):
+        if matches is None:
+            failed_pages.append(page)
+            continue
+        total_matches += len(matches)
+        for match in matches:
+            yield match
+
+    logger.info(
+        "Streamed pages %s-%s: %s matches, failed pages: %s",
+        start_page, end_page, total_matches, failed_pages,
+    )
+    yield {"meta": _results_meta(start_page, end_page, total_pages, failed_pages, total_matches)}
@@ -1,126 +1,242 @@
-import requests
 import logging
-from bs4 import BeautifulSoup
 import re
-from utils.utils import headers
+from selectolax.lexbor import LexborHTMLParser
+from api.scrapers.documents import (
+    DocumentCache,
+    child_elements,
+    class_list,
+    descendants,
+    first_descendant,
+    performance_url,
+)
+from api.scrapers.models import MatchupMatrix
+from utils.timing import timed
 
-def get_performance_data(match_url, game_id=None):
+logger = logging.getLogger(__name__)
+
+async def get_performance_data(match_url, game_id=None, documents=None):
     """
     Obtém dados de performance específicos de um URL de partida
     Adiciona automaticamente os parâmetros ?game=all&tab=performance
+
+    Se documents (DocumentCache) for informado, a página é baixada e
+    analisada apenas uma vez por requisição.
     """
-    logger = logging.getLogger("scraper")
-    
-    # Garantir que a URL tenha os parâmetros necessários para a aba de performance
-    if "?" in match_url:
-        if "tab=performance" not in match_url:
-            url = f"{match_url}&tab=performance"
-        else:
-            url = match_url
-    else:
-        url = f"{match_url}?tab=performance"
-        
-    # Adicionar game=all se não houver game específico
-    if "game=" not in url:
-        url = f"{url}&game=all"
+    if documents is None:
+        documents = DocumentCache()
+    url = performance_url(match_url)
     
-    logger.debug(f"Buscando dados de performance da URL: {url}")
+    logger.debug("Buscando dados de performance da URL: %s", url)
     
     try:
-        resp = requests.get(url, headers=headers)
-        if resp.status_code == 200:
-            return BeautifulSoup(resp.text, 'html.parser')
+        status_code, performance_soup = await documents.get(url)
+        if performance_soup is not None:
+            return performance_soup
         else:
-            logger.error(f"Erro ao buscar dados de performance. Status code: {resp.status_code}")
+            logger.error("Erro ao buscar dados de performance. Status code: %s", status_code)
             return None
     except Exception as e:
-        logger.error(f"Exceção ao buscar dados de performance: {str(e)}")
+        logger.error("Exceção ao buscar dados de performance: %s", e)
         return None
 
-def extract_player_matrix(map_div, game_id, match_url=None):
+def find_matrix_tables(game_div):
+    """
+    Localiza as tabelas de matriz de um mapa numa única varredura
+
+    Returns:
+        tuple: (tabelas candidatas, tabela mod-normal, tabela mod-fkfd, tabela mod-op).
+            As candidatas têm as tabelas mod-matrix primeiro, na ordem do
+            documento, seguidas das demais wf-table-inset.
+    """
+    matrix_tables = []
+    other_tables = []
+    matrix_table = fk_fd_table = op_table = None
+    for table in game_div.css('table.mod-matrix, table.wf-table-inset'):
+        classes = class_list(table)
+        if 'mod-matrix' in classes:
+            matrix_tables.append(table)
+        else:
+            other_tables.append(table)
+        
+        if 'mod-normal' in classes:
+            matrix_table = table
+        elif 'mod-fkfd' in classes:
+            fk_fd_table = table
+        elif 'mod-op' in classes:
+            op_table = table
+    
+    return matrix_tables + other_tables, matrix_table, fk_fd_table, op_table
+
+def parse_matchup_cell(cell):
+    """
+    Extrai (value1, value2, diff) de uma célula de confronto, como texto ou None
+    """
+    value1 = value2 = diff = None
+    
+    # Busca a div com flex para stats (várias abordagens)
+    stats_div = None
+    
+    # Abordagem 1: Div com estilo display: flex
+    for div in child_elements(cell, 'div'):
+        style = div.attributes.get('style') or ''
+        if 'display: flex' in style:
+            stats_div = div
+            break
+    
+    # Abordagem 2: Se não encontrou, busca divs com classes específicas
+    if not stats_div:
+        stats_div = cell.css_first('div.stats-container')
+    
+    # Abordagem 3: Busca divs que contenham stats-sq
+    if not stats_div:
+        for div in cell.css('div'):
+            if first_descendant(div, 'div.stats-sq'):
+                stats_div = div
+                break
+    
+    # Extrai os valores se encontrou a div de estatísticas
+    if stats_div:
+        stats_squares = descendants(stats_div, 'div.stats-sq')
+        if len(stats_squares) >= 3:
+            # Os valores nas stats-sq são respectivamente:
+            # 1. Primeiro valor (geralmente kills do jogador da linha para o da coluna)
+            # 2. Segundo valor (geralmente kills do jogador da coluna para o da linha)
+            # 3. Diferença entre os valores (com sinal + ou -)
+            value1 = stats_squares[0].text(strip=True) or None
+            value2 = stats_squares[1].text(strip=True) or None
+            diff = stats_squares[2].text(strip=True) or None
+    
+    # Abordagem alternativa: se ainda não temos valores, tentar extrair diretamente da célula
+    if not value1 and not value2:
+        # Tentar encontrar qualquer div com texto numérico
+        for div in cell.css('div'):
+            text = div.text(strip=True)
+            if text and text.replace('+', '').replace('-', '').isdigit():
+                # Se parece com um valor de diferença (+2, -3, etc)
+                if (text.startswith('+') or text.startswith('-')) and diff is None:
+                    diff = text
+                # Se é um número simples, pode ser um valor de kills
+                elif value1 is None:
+                    value1 = text
+                elif value2 is None:
+                    value2 = text
+        
+        # Se encontramos apenas o valor1 mas não o diff, vamos definir um diff padrão
+        if value1 and not diff:
+            diff = f"+{value1}"
+    
+    return value1, value2, diff
+
+def _to_int(text):
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return None
+
+def dense_matrix(matchups):
+    """
+    Converte as linhas de confrontos em grades de inteiros (MatchupMatrix).
+    Só é usada pela forma compacta da resposta; a resposta completa traz
+    apenas os matchups
+    """
+    kills, deaths, diff = [], [], []
+    for row in matchups:
+        kills.append([_to_int(matchup['value1']) for matchup in row])
+        deaths.append([_to_int(matchup['value2']) for matchup in row])
+        diff.append([_to_int(matchup['diff']) for matchup in row])
+    return MatchupMatrix(kills, deaths, diff)
+
+@timed
+async def extract_player_matrix(map_div, game_id, match_url=None, documents=None, matrix=True, adv_stats=True):
     """
     Extrai a matriz de confrontos entre jogadores para um mapa específico
     
     Args:
-        map_div: O elemento BeautifulSoup contendo os dados do mapa. Se None, tentará buscar via match_url.
+        map_div: O elemento selectolax contendo os dados do mapa. Se None, tentará buscar via match_url.
         game_id: O ID do mapa para o qual extrair os dados de matriz.
         match_url: URL opcional da partida, para buscar dados quando map_div não está disponível.
+        documents: DocumentCache opcional compartilhado com o restante da requisição.
+        matrix: Se False, as tabelas de matriz não são analisadas e só
+            game_id e adv_stats são retornados.
+        adv_stats: Se False, a tabela de estatísticas avançadas não é analisada
+            e a chave adv_stats é omitida.
     """
-    import logging
-    
-    logger = logging.getLogger("scraper")
-    
     matrix_data = {
         'game_id': game_id,
         'column_players': [],  # jogadores nas colunas (time 1)
         'row_players': [],     # jogadores nas linhas (time 2)
         'matchups': [],        # dados de confronto entre jogadores
-        'adv_stats': []        # estatísticas avançadas (multi-kills, clutches, etc)
     }
+    if adv_stats:
+        matrix_data['adv_stats'] = []  # estatísticas avançadas (multi-kills, clutches, etc)
     
-    logger.debug(f"Procurando matrix para game_id: {game_id}")
+    logger.debug("Procurando matrix para game_id: %s", game_id)
     
-    # Verifica se estamos recebendo um HTML como string ou um objeto BeautifulSoup
+    # Verifica se estamos recebendo um HTML como string ou um nó já analisado
     if isinstance(map_div, str):
-        map_div = BeautifulSoup(map_div, 'html.parser')
+        map_div = LexborHTMLParser(map_div).root
     
     # Se não temos map_div, mas temos a URL da partida, buscar os dados de performance
     if map_div is None and match_url:
-        logger.debug(f"Map_div não fornecido, buscando dados de performance para game_id={game_id}")
+        logger.debug("Map_div não fornecido, buscando dados de performance para game_id=%s", game_id)
         
         # Construir URL com os parâmetros corretos para a aba de performance e o mapa específico
-        if game_id:
-            performance_url = f"{match_url}?tab=performance&game={game_id}"
-        else:
-            performance_url = f"{match_url}?tab=performance&game=all"
+        if documents is None:
+            documents = DocumentCache()
+        game_url = performance_url(match_url, game_id)
             
-        logger.debug(f"Buscando dados de performance em: {performance_url}")
+        logger.debug("Buscando dados de performance em: %s", game_url)
         
         try:
-            resp = requests.get(performance_url, headers=headers)
-            if resp.status_code == 200:
-                performance_soup = BeautifulSoup(resp.text, 'html.parser')
-                map_div = performance_soup.select_one(f'.vm-stats-game[data-game-id="{game_id}"]')
+            status_code, performance_soup = await documents.get(game_url)
+            if performance_soup is not None:
+                map_div = performance_soup.css_first(f'.vm-stats-game[data-game-id="{game_id}"]')
                 if not map_div:
                     # Se não encontrou o mapa específico, tenta encontrar qualquer vm-stats-game
-                    map_div = performance_soup.select_one('.vm-stats-game')
+                    map_div = performance_soup.css_first('.vm-stats-game')
                     if not map_div:
-                        logger.error(f"Não foi possível encontrar a div do mapa na página de performance")
+                        logger.error("Não foi possível encontrar a div do mapa na página de performance")
                         return matrix_data
             else:
-                logger.error(f"Erro ao buscar dados de performance. Status code: {resp.status_code}")
+                logger.error("Erro ao buscar dados de performance. Status code: %s", status_code)
                 return matrix_data
         except Exception as e:
-            logger.error(f"Exceção ao buscar dados de performance: {str(e)}")
+            logger.error("Exceção ao buscar dados de performance: %s", e)
             return matrix_data
     
     # Procura a div do jogo com o game_id correto
     game_div = None
     
     # Tenta encontrar a div vm-stats-game específica
-    for div in map_div.find_all('div', {'class': 'vm-stats-game'}):
-        if div.get('data-game-id') == game_id:
+    for div in descendants(map_div, 'div.vm-stats-game'):
+        if div.attributes.get('data-game-id') == game_id:
             game_div = div
-            logger.debug(f"Encontrou vm-stats-game com data-game-id={game_id}")
+            logger.debug("Encontrou vm-stats-game com data-game-id=%s", game_id)
             break
     
     # Se não encontrou especificamente, use o que foi passado
     if not game_div:
         game_div = map_div
-        logger.debug(f"Usando div passada como parâmetro")
+        logger.debug("Usando div passada como parâmetro")
+    
+    # Só as estatísticas avançadas foram pedidas: a matriz não é analisada
+    if not matrix:
+        adv_data = {'game_id': game_id, 'adv_stats': []}
+        extract_advanced_stats(map_div, game_id, adv_data)
+        return adv_data
     
     # Busca adicional para jogadores quando não os encontra nas tabelas
     # Isso é útil quando temos jogadores na página mas não na matriz
     fallback_players = []
-    player_name_divs = game_div.select('.mod-player .text-of')
-    player_team_divs = game_div.select('.mod-player .ge-text-light')
+    player_name_divs = game_div.css('.mod-player .text-of')
+    player_team_divs = game_div.css('.mod-player .ge-text-light')
     
     if player_name_divs and len(player_name_divs) > 0:
-        logger.debug(f"Encontrados {len(player_name_divs)} jogadores via fallback")
+        logger.debug("Encontrados %s jogadores via fallback", len(player_name_divs))
         
         for i, name_div in enumerate(player_name_divs):
-            player_name = name_div.get_text(strip=True)
-            player_team = player_team_divs[i].get_text(strip=True) if i < len(player_team_divs) else None
+            player_name = name_div.text(strip=True)
+            player_team = player_team_divs[i].text(strip=True) if i < len(player_team_divs) else None
             
             if player_name:
                 fallback_players.append({
@@ -129,90 +245,33 @@ def extract_player_matrix(map_div, game_id, match_url=None):
                     'team_logo': None
                 })
     
-    # Encontrar todas as tabelas que podem ser matrizes
-    all_tables = []
-    
-    # Abordagem 1: Procurar diretamente por tabelas mod-matrix
-    for table in game_div.find_all('table'):
-        classes = table.get('class', [])
-        if not isinstance(classes, list):
-            classes = classes.split() if classes else []
-        
-        if 'mod-matrix' in classes:
-            all_tables.append(table)
-            logger.debug(f"Encontrou tabela diretamente: {' '.join(classes)}")
-    
-    # Abordagem 2: Procurar em divs com overflow
-    overflow_divs = []
-    for div in game_div.find_all('div'):
-        style = div.get('style')
-        if style and 'overflow-x: auto' in style:
-            overflow_divs.append(div)
-    
-    for div in overflow_divs:
-        for table in div.find_all('table'):
-            classes = table.get('class', [])
-            if not isinstance(classes, list):
-                classes = classes.split() if classes else []
-            
-            if 'mod-matrix' in classes:
-                all_tables.append(table)
-                logger.debug(f"Encontrou tabela em div overflow: {' '.join(classes)}")
-    
-    # Abordagem 3: Procurar tabelas com classes específicas
-    for table in game_div.find_all('table', class_=lambda c: c and ('mod-matrix' in c or 'wf-table-inset' in c)):
-        if table not in all_tables:
-            all_tables.append(table)
-            logger.debug(f"Encontrou tabela com classe específica: {table.get('class')}")
-    
-    logger.debug(f"Total de tabelas encontradas: {len(all_tables)}")
-    
-    # Filtrar para encontrar as tabelas específicas
-    matrix_table = None  # mod-normal (Kills/Deaths)
-    fk_fd_table = None   # mod-fkfd (First Kills/First Deaths)
-    op_table = None      # mod-op (Operator Kills)
-    
-    for table in all_tables:
-        classes = table.get('class', [])
-        if not isinstance(classes, list):
-            classes = classes.split() if classes else []
-        classes_str = ' '.join(classes)
-        
-        if 'mod-normal' in classes:
-            matrix_table = table
-            logger.debug(f"Encontrou tabela mod-normal")
-        elif 'mod-fkfd' in classes:
-            fk_fd_table = table
-            logger.debug(f"Encontrou tabela mod-fkfd")
-        elif 'mod-op' in classes:
-            op_table = table
-            logger.debug(f"Encontrou tabela mod-op")
+    # Localiza e classifica as tabelas de matriz numa única varredura
+    all_tables, matrix_table, fk_fd_table, op_table = find_matrix_tables(game_div)
+    logger.debug("Total de tabelas encontradas: %s", len(all_tables))
     
     # Se não encontrou mod-normal específica, tenta uma heurística
     if not matrix_table and all_tables:
         # Tenta encontrar uma tabela que não seja mod-fkfd nem mod-op
         for table in all_tables:
-            classes = table.get('class', [])
-            if not isinstance(classes, list):
-                classes = classes.split() if classes else []
+            classes = class_list(table)
             
             if 'mod-fkfd' not in classes and 'mod-op' not in classes:
                 matrix_table = table
-                logger.debug(f"Usando tabela como mod-normal por exclusão: {' '.join(classes)}")
+                logger.debug("Usando tabela como mod-normal por exclusão: %s", classes)
                 break
         
         # Se ainda não encontrou, usa a primeira tabela
         if not matrix_table:
             matrix_table = all_tables[0]
-            logger.debug(f"Usando primeira tabela encontrada como fallback")
+            logger.debug("Usando primeira tabela encontrada como fallback")
     
     # Se mesmo assim não temos tabela, retorna dados vazios
     if not matrix_table:
-        logger.debug(f"Nenhuma tabela matrix encontrada para game_id: {game_id}")
+        logger.debug("Nenhuma tabela matrix encontrada para game_id: %s", game_id)
         
         # Se temos fallback_players, vamos usá-los
         if fallback_players:
-            logger.debug(f"Usando fallback players ({len(fallback_players)})")
+            logger.debug("Usando fallback players (%s)", len(fallback_players))
             
             # Dividir jogadores entre times com base no team
             team_players = {}
@@ -227,23 +286,23 @@ def extract_player_matrix(map_div, game_id, match_url=None):
                 teams = list(team_players.keys())
                 matrix_data['column_players'] = team_players[teams[0]]
                 matrix_data['row_players'] = team_players[teams[1]]
-                logger.debug(f"Criada estrutura com {len(matrix_data['column_players'])} jogadores de coluna e {len(matrix_data['row_players'])} jogadores de linha")
+                logger.debug("Criada estrutura com %s jogadores de coluna e %s jogadores de linha", len(matrix_data['column_players']), len(matrix_data['row_players']))
             # Se temos apenas um time ou mais de dois, distribuir entre colunas e linhas
             elif fallback_players:
                 half = len(fallback_players) // 2
                 matrix_data['column_players'] = fallback_players[:half]
                 matrix_data['row_players'] = fallback_players[half:]
-                logger.debug(f"Distribuídos jogadores: {len(matrix_data['column_players'])} nas colunas e {len(matrix_data['row_players'])} nas linhas")
+                logger.debug("Distribuídos jogadores: %s nas colunas e %s nas linhas", len(matrix_data['column_players']), len(matrix_data['row_players']))
         
         return matrix_data
     
     # Extrair jogadores das colunas (cabeçalho)
-    header_row = matrix_table.find('tr')  # Primeira linha (cabeçalho)
+    header_row = matrix_table.css_first('tr')  # Primeira linha (cabeçalho)
     if not header_row:
-        logger.debug(f"Tabela não contém linhas")
+        logger.debug("Tabela não contém linhas")
         return matrix_data
     
-    header_cells = header_row.find_all('td')
+    header_cells = header_row.css('td')
     
     # Primeira célula é vazia, as outras contêm os jogadores das colunas
     if len(header_cells) > 1:
@@ -253,27 +312,27 @@ def extract_player_matrix(map_div, game_id, match_url=None):
                 # Tenta extrair informações do jogador usando diferentes abordagens
             
             # Abordagem 1: Busca a div da equipe
-            team_div = cell.find('div', class_='team')
+            team_div = cell.css_first('div.team')
             if team_div:
                 # Encontra a div principal que contém o nome do jogador
-                player_div = team_div.find('div', recursive=False)
+                player_div = next(iter(child_elements(team_div, 'div')), None)
                 if player_div:
                     # Extrai o texto direto desta div, sem incluir o texto da div team-tag
-                    player_text = player_div.contents[0]
-                    if isinstance(player_text, str):
-                        player_name = player_text.strip()
+                    player_text = player_div.child
+                    if player_text is not None and player_text.tag == '-text':
+                        player_name = player_text.text().strip()
                         if player_name:
                             player_info['name'] = player_name
                 
                 # Tag da equipe
-                team_tag = team_div.find('div', class_='team-tag')
+                team_tag = team_div.css_first('div.team-tag')
                 if team_tag:
-                    team_name = team_tag.get_text(strip=True)
+                    team_name = team_tag.text(strip=True)
                     if team_name:
                         player_info['team'] = team_name                # Logo da equipe
-                team_logo = team_div.find('img', class_='team-logo')
-                if team_logo and team_logo.get('src'):
-                    logo_src = team_logo.get('src')
+                team_logo = team_div.css_first('img.team-logo')
+                if team_logo and team_logo.attributes.get('src'):
+                    logo_src = team_logo.attributes.get('src')
                     if logo_src.startswith('//'):
                         player_info['team_logo'] = 'https:' + logo_src
                     else:
@@ -281,23 +340,23 @@ def extract_player_matrix(map_div, game_id, match_url=None):
             
             # Abordagem 2: Se não encontrou nome na abordagem 1, busca texto diretamente
             if not player_info['name']:
-                player_text = cell.get_text(strip=True)
+                player_text = cell.text(strip=True)
                 if player_text:
                     player_info['name'] = player_text
             
             # Só adiciona se encontrou pelo menos o nome
             if player_info['name']:
                 matrix_data['column_players'].append(player_info)
-                logger.debug(f"Extraído jogador de coluna: {player_info['name']}")
+                logger.debug("Extraído jogador de coluna: %s", player_info['name'])
             else:
-                logger.debug(f"Célula de coluna sem nome de jogador")
+                logger.debug("Célula de coluna sem nome de jogador")
         
-        logger.debug(f"Extraídos {len(matrix_data['column_players'])} jogadores de coluna")
+        logger.debug("Extraídos %s jogadores de coluna", len(matrix_data['column_players']))
     
     # Extrair jogadores das linhas e confrontos (linhas de dados)
-    data_rows = matrix_table.find_all('tr')[1:]  # Pula a linha de cabeçalho
+    data_rows = matrix_table.css('tr')[1:]  # Pula a linha de cabeçalho
     for row in data_rows:
-        cells = row.find_all('td')
+        cells = row.css('td')
         if not cells or len(cells) <= 1:  # Precisa de pelo menos a célula do jogador e uma de confronto
             continue
         
@@ -306,29 +365,29 @@ def extract_player_matrix(map_div, game_id, match_url=None):
         player_info = {'name': None, 'team': None, 'team_logo': None}
         
         # Abordagem 1: Busca a div da equipe
-        team_div = player_cell.find('div', class_='team')
+        team_div = player_cell.css_first('div.team')
         if team_div:
             # Encontra a div principal que contém o nome do jogador
-            player_div = team_div.find('div', recursive=False)
+            player_div = next(iter(child_elements(team_div, 'div')), None)
             if player_div:
                 # Extrai o texto direto desta div, sem incluir o texto da div team-tag
-                player_text = player_div.contents[0]
-                if isinstance(player_text, str):
-                    player_name = player_text.strip()
+                player_text = player_div.child
+                if player_text is not None and player_text.tag == '-text':
+                    player_name = player_text.text().strip()
                     if player_name:
                         player_info['name'] = player_name
             
             # Tag da equipe
-            team_tag = team_div.find('div', class_='team-tag')
+            team_tag = team_div.css_first('div.team-tag')
             if team_tag:
-                team_name = team_tag.get_text(strip=True)
+                team_name = team_tag.text(strip=True)
                 if team_name:
                     player_info['team'] = team_name
             
             # Logo da equipe
-            team_logo = team_div.find('img', class_='team-logo')
-            if team_logo and team_logo.get('src'):
-                logo_src = team_logo.get('src')
+            team_logo = team_div.css_first('img.team-logo')
+            if team_logo and team_logo.attributes.get('src'):
+                logo_src = team_logo.attributes.get('src')
                 if logo_src.startswith('//'):
                     player_info['team_logo'] = 'https:' + logo_src
                 else:
@@ -336,115 +395,57 @@ def extract_player_matrix(map_div, game_id, match_url=None):
         
         # Abordagem 2: Se não encontrou nome na abordagem 1, busca texto diretamente
         if not player_info['name']:
-            player_text = player_cell.get_text(strip=True)
+            player_text = player_cell.text(strip=True)
             if player_text:
                 player_info['name'] = player_text
         
         # Só continua se encontrou pelo menos o nome do jogador
         if not player_info['name']:
-            logger.debug(f"Linha sem nome de jogador, pulando")
+            logger.debug("Linha sem nome de jogador, pulando")
             continue
         
         matrix_data['row_players'].append(player_info)
-        logger.debug(f"Extraído jogador de linha: {player_info['name']}")
+        logger.debug("Extraído jogador de linha: %s", player_info['name'])
         
         # Extrair dados de confronto
         matchups_row = []
         for i, cell in enumerate(cells[1:]):  # Pula a primeira célula (jogador da linha)
             if i >= len(matrix_data['column_players']):
-                logger.debug(f"Índice de coluna {i} excede o número de jogadores de coluna {len(matrix_data['column_players'])}")
+                logger.debug("Índice de coluna %s excede o número de jogadores de coluna %s", i, len(matrix_data['column_players']))
                 continue
             
             column_player = matrix_data['column_players'][i]['name']
             row_player = player_info['name']
             
+            value1, value2, diff = parse_matchup_cell(cell)
             matchup = {
                 'row_player': row_player,
                 'column_player': column_player,
-                'value1': None,  # Primeiro valor (não necessariamente kills)
-                'value2': None,  # Segundo valor (não necessariamente deaths)
-                'diff': None     # Diferença entre os valores
+                'value1': value1,  # Primeiro valor (não necessariamente kills)
+                'value2': value2,  # Segundo valor (não necessariamente deaths)
+                'diff': diff       # Diferença entre os valores
             }
             
-            # Busca a div com flex para stats (várias abordagens)
-            stats_div = None
-            
-            # Abordagem 1: Div com estilo display: flex
-            for div in cell.find_all('div', recursive=False):
-                style = div.get('style', '')
-                if 'display: flex' in style:
-                    stats_div = div
-                    break
-            
-            # Abordagem 2: Se não encontrou, busca divs com classes específicas
-            if not stats_div:
-                stats_div = cell.find('div', class_='stats-container')
-            
-            # Abordagem 3: Busca divs que contenham stats-sq
-            if not stats_div:
-                for div in cell.find_all('div'):
-                    if div.find('div', class_='stats-sq'):
-                        stats_div = div
-                        break
-            
-            # Extrai os valores se encontrou a div de estatísticas
-            if stats_div:
-                stats_squares = stats_div.find_all('div', class_='stats-sq')
-                if len(stats_squares) >= 3:
-                    # Os valores nas stats-sq são respectivamente:
-                    # 1. Primeiro valor (geralmente kills do jogador da linha para o da coluna)
-                    # 2. Segundo valor (geralmente kills do jogador da coluna para o da linha)
-                    # 3. Diferença entre os valores (com sinal + ou -)
-                    value1 = stats_squares[0].get_text(strip=True)
-                    value2 = stats_squares[1].get_text(strip=True)
-                    diff = stats_squares[2].get_text(strip=True)
-                    
-                    if value1:
-                        matchup['value1'] = value1
-                    if value2:
-                        matchup['value2'] = value2
-                    if diff:
-                        matchup['diff'] = diff
-            
-            # Abordagem alternativa: se ainda não temos valores, tentar extrair diretamente da célula
-            if not matchup['value1'] and not matchup['value2']:
-                # Tentar encontrar qualquer div com texto numérico
-                for div in cell.find_all('div'):
-                    text = div.get_text(strip=True)
-                    if text and text.replace('+', '').replace('-', '').isdigit():
-                        # Se parece com um valor de diferença (+2, -3, etc)
-                        if (text.startswith('+') or text.startswith('-')) and matchup['diff'] is None:
-                            matchup['diff'] = text
-                        # Se é um número simples, pode ser um valor de kills
-                        elif matchup['value1'] is None:
-                            matchup['value1'] = text
-                        elif matchup['value2'] is None:
-                            matchup['value2'] = text
-                
-                # Se encontramos apenas o valor1 mas não o diff, vamos definir um diff padrão
-                if matchup['value1'] and not matchup['diff']:
-                    matchup['diff'] = f"+{matchup['value1']}"
-            
             matchups_row.append(matchup)
         
         # Só adiciona se extraiu dados de confronto
         if matchups_row:
             matrix_data['matchups'].append(matchups_row)
     
-    logger.debug(f"Extraídos {len(matrix_data['row_players'])} jogadores de linha e seus confrontos")
+    logger.debug("Extraídos %s jogadores de linha e seus confrontos", len(matrix_data['row_players']))
     
     # Extrair dados das tabelas adicionais (FK/FD e OP)
     if fk_fd_table:
-        logger.debug(f"Extraindo dados da tabela mod-fkfd")
+        logger.debug("Extraindo dados da tabela mod-fkfd")
         matrix_data['fk_fd'] = extract_matrix_data(fk_fd_table, matrix_data['row_players'], matrix_data['column_players'])
     
     if op_table:
-        logger.debug(f"Extraindo dados da tabela mod-op")
+        logger.debug("Extraindo dados da tabela mod-op")
         matrix_data['op_kills'] = extract_matrix_data(op_table, matrix_data['row_players'], matrix_data['column_players'])
     
     # Verificar se temos dados de matriz, se não, usar a abordagem de fallback
     if (not matrix_data['column_players'] or not matrix_data['row_players']) and fallback_players:
-        logger.debug(f"Matriz vazia, usando fallback players")
+        logger.debug("Matriz vazia, usando fallback players")
         
         # Dividir jogadores entre times com base no team
         team_players = {}
@@ -459,34 +460,17 @@ def extract_player_matrix(map_div, game_id, match_url=None):
             teams = list(team_players.keys())
             matrix_data['column_players'] = team_players[teams[0]]
             matrix_data['row_players'] = team_players[teams[1]]
-            logger.debug(f"Criada estrutura com {len(matrix_data['column_players'])} jogadores de coluna e {len(matrix_data['row_players'])} jogadores de linha")
+            logger.debug("Criada estrutura com %s jogadores de coluna e %s jogadores de linha", len(matrix_data['column_players']), len(matrix_data['row_players']))
         # Se temos apenas um time ou mais de dois, distribuir entre colunas e linhas
         elif fallback_players:
             half = len(fallback_players) // 2
             matrix_data['column_players'] = fallback_players[:half]
             matrix_data['row_players'] = fallback_players[half:]
-            logger.debug(f"Distribuídos jogadores: {len(matrix_data['column_players'])} nas colunas e {len(matrix_data['row_players'])} nas linhas")
-    
-    # Gerar o formato players_matchup solicitado
-    logger.debug(f"Gerando formato players_matchup")
-    
-    # Processar cada matchup do formato original para o novo formato
-    for i, row_player in enumerate(matrix_data['row_players']):
-        for j, column_player in enumerate(matrix_data['column_players']):
-            # Encontrar o matchup nos dados originais, se existir
-            value1 = None
-            value2 = None
-            diff = None
-            
-            if i < len(matrix_data['matchups']) and j < len(matrix_data['matchups'][i]):
-                matchup = matrix_data['matchups'][i][j]
-                value1 = matchup.get('value1')
-                value2 = matchup.get('value2')
-                diff = matchup.get('diff')
-        
+            logger.debug("Distribuídos jogadores: %s nas colunas e %s nas linhas", len(matrix_data['column_players']), len(matrix_data['row_players']))
     
     # Extrair dados da tabela de estatísticas avançadas
-    extract_advanced_stats(map_div, game_id, matrix_data)
+    if adv_stats:
+        extract_advanced_stats(map_div, game_id, matrix_data)
     
     return matrix_data
 
@@ -494,108 +478,47 @@ def extract_matrix_data(table, row_players, column_players):
     """
     Extrai dados de uma tabela de matriz específica (FK/FD ou OP kills)
     """
-    import logging
-    logger = logging.getLogger("scraper")
-    
     matrix_data = {
         'matchups': []
     }
     
     # Verifica se temos os jogadores necessários
     if not row_players or not column_players:
-        logger.debug(f"Faltam jogadores para extrair matriz: row_players={len(row_players) if row_players else 0}, column_players={len(column_players) if column_players else 0}")
+        logger.debug("Faltam jogadores para extrair matriz: row_players=%s, column_players=%s", len(row_players) if row_players else 0, len(column_players) if column_players else 0)
         return matrix_data
     
     # Processa cada linha (exceto o cabeçalho)
-    data_rows = table.find_all('tr')[1:] if table else []
-    logger.debug(f"Processando {len(data_rows)} linhas na tabela secundária")
+    data_rows = table.css('tr')[1:] if table else []
+    logger.debug("Processando %s linhas na tabela secundária", len(data_rows))
     
     for i, row in enumerate(data_rows):
         if i >= len(row_players):
-            logger.debug(f"Índice de linha {i} excede o número de jogadores de linha {len(row_players)}")
+            logger.debug("Índice de linha %s excede o número de jogadores de linha %s", i, len(row_players))
             continue
         
         matchups_row = []
-        cells = row.find_all('td')
+        cells = row.css('td')
         
         # Pula a primeira célula (contém o jogador da linha)
         matchup_cells = cells[1:] if cells else []
         
         for j, cell in enumerate(matchup_cells):
             if j >= len(column_players):
-                logger.debug(f"Índice de coluna {j} excede o número de jogadores de coluna {len(column_players)}")
+                logger.debug("Índice de coluna %s excede o número de jogadores de coluna %s", j, len(column_players))
                 continue
                 
             row_player_name = row_players[i]['name']
             column_player_name = column_players[j]['name']
             
+            value1, value2, diff = parse_matchup_cell(cell)
             matchup = {
                 'row_player': row_player_name,
                 'column_player': column_player_name,
-                'value1': None,
-                'value2': None,
-                'diff': None
+                'value1': value1,
+                'value2': value2,
+                'diff': diff
             }
             
-            # Busca a div com flex para stats (várias abordagens)
-            stats_div = None
-            
-            # Abordagem 1: Div com estilo display: flex
-            for div in cell.find_all('div', recursive=False):
-                style = div.get('style', '')
-                if 'display: flex' in style:
-                    stats_div = div
-                    break
-            
-            # Abordagem 2: Se não encontrou, busca divs com classes específicas
-            if not stats_div:
-                stats_div = cell.find('div', class_='stats-container')
-            
-            # Abordagem 3: Busca divs que contenham stats-sq
-            if not stats_div:
-                for div in cell.find_all('div'):
-                    if div.find('div', class_='stats-sq'):
-                        stats_div = div
-                        break
-            
-            # Extrai os valores se encontrou a div de estatísticas
-            if stats_div:
-                stats_squares = stats_div.find_all('div', class_='stats-sq')
-                if len(stats_squares) >= 3:
-                    # Os valores nas stats-sq são respectivamente:
-                    # 1. Primeiro valor 
-                    # 2. Segundo valor 
-                    # 3. Diferença entre os valores (com sinal + ou -)
-                    value1 = stats_squares[0].get_text(strip=True)
-                    value2 = stats_squares[1].get_text(strip=True)
-                    diff = stats_squares[2].get_text(strip=True)
-                    
-                    if value1:
-                        matchup['value1'] = value1
-                    if value2:
-                        matchup['value2'] = value2
-                    if diff:
-                        matchup['diff'] = diff
-            
-            # Abordagem alternativa: se ainda não temos valores, tentar extrair diretamente da célula
-            if not matchup['value1'] and not matchup['value2']:
-                # Tentar encontrar qualquer div com texto numérico
-                for div in cell.find_all('div'):
-                    text = div.get_text(strip=True)
-                    if text and text.replace('+', '').replace('-', '').isdigit():
-                        # Se parece com um valor de diferença (+2, -3, etc)
-                        if (text.startswith('+') or text.startswith('-')) and matchup['diff'] is None:
-                            matchup['diff'] = text
-                        # Se é um número simples, pode ser um valor de kills
-                        elif matchup['value1'] is None:
-                            matchup['value1'] = text
-                        elif matchup['value2'] is None:
-                            matchup['value2'] = text
-                
-                # Se encontramos apenas o valor1 mas não o diff, vamos definir um diff padrão
-                if matchup['value1'] and not matchup['diff']:
-                    matchup['diff'] = f"+{matchup['value1']}"
-            
             matchups_row.append(matchup)
         
         # Só adiciona se extraiu dados de confronto
@@ -604,48 +527,47 @@ def extract_matrix_data(table, row_players, column_players):
     
     return matrix_data
 
+@timed
 def extract_advanced_stats(map_div, game_id, matrix_data):
     """
     Extrai dados da tabela de estatísticas avançadas (multi-kills, clutches, etc)
     """
     import logging
-    logger = logging.getLogger("scraper")
-    
-    # Verifica se estamos recebendo um HTML como string ou um objeto BeautifulSoup
+    # Verifica se estamos recebendo um HTML como string ou um nó já analisado
     if isinstance(map_div, str):
-        map_div = BeautifulSoup(map_div, 'html.parser')
+        map_div = LexborHTMLParser(map_div).root
     
     # Procura a div do jogo com o game_id correto
     game_div = None
     
     # Tenta encontrar a div vm-stats-game específica
-    for div in map_div.find_all('div', {'class': 'vm-stats-game'}):
-        if div.get('data-game-id') == game_id:
+    for div in descendants(map_div, 'div.vm-stats-game'):
+        if div.attributes.get('data-game-id') == game_id:
             game_div = div
-            logger.debug(f"Encontrou vm-stats-game com data-game-id={game_id} para adv stats")
+            logger.debug("Encontrou vm-stats-game com data-game-id=%s para adv stats", game_id)
             break
     
     # Se não encontrou especificamente, use o que foi passado
     if not game_div:
         game_div = map_div
-        logger.debug(f"Usando div passada como parâmetro para adv stats")
+        logger.debug("Usando div passada como parâmetro para adv stats")
     
     # Procurar a tabela de estatísticas avançadas
-    adv_stats_table = game_div.find('table', {'class': 'wf-table-inset mod-adv-stats'})
+    adv_stats_table = game_div.css_first('table.wf-table-inset.mod-adv-stats')
     
     if not adv_stats_table:
-        logger.debug(f"Tabela de estatísticas avançadas não encontrada para game_id: {game_id}")
+        logger.debug("Tabela de estatísticas avançadas não encontrada para game_id: %s", game_id)
         return
     
-    logger.debug(f"Encontrou tabela de estatísticas avançadas para game_id: {game_id}")
+    logger.debug("Encontrou tabela de estatísticas avançadas para game_id: %s", game_id)
     
     # Obter as colunas da tabela (cabeçalho)
-    header_row = adv_stats_table.find('tr')
+    header_row = adv_stats_table.css_first('tr')
     if not header_row:
-        logger.debug(f"Tabela de estatísticas avançadas não contém linhas de cabeçalho")
+        logger.debug("Tabela de estatísticas avançadas não contém linhas de cabeçalho")
         return
     
-    header_cells = header_row.find_all('th')
+    header_cells = header_row.css('th')
     column_names = []
     
     # Primeira e segunda colunas geralmente são vazias ou contêm informações do jogador
@@ -653,15 +575,15 @@ def extract_advanced_stats(map_div, game_id, matrix_data):
         if i < 2:  # Pular as duas primeiras colunas (jogador e agente)
             continue
         
-        column_name = cell.get_text(strip=True)
+        column_name = cell.text(strip=True)
         column_names.append(column_name)
     
-    logger.debug(f"Colunas encontradas: {', '.join(column_names)}")
+    logger.debug("Colunas encontradas: %s", column_names)
     
     # Processar cada linha (jogador)
-    data_rows = adv_stats_table.find_all('tr')[1:]  # Pular a linha de cabeçalho
+    data_rows = adv_stats_table.css('tr')[1:]  # Pular a linha de cabeçalho
     for row in data_rows:
-        cells = row.find_all('td')
+        cells = row.css('td')
         if len(cells) < 3:  # Precisamos de pelo menos jogador, agente e uma stat
             continue
         
@@ -672,33 +594,33 @@ def extract_advanced_stats(map_div, game_id, matrix_data):
         player_info = {'name': None, 'team': None, 'team_logo': None, 'agent': None}
         
         # Extrair o nome do jogador e equipe
-        team_div = player_cell.find('div', class_='team')
+        team_div = player_cell.css_first('div.team')
         if team_div:
             # Nome do jogador
-            player_div = team_div.find('div', recursive=False)
+            player_div = next(iter(child_elements(team_div, 'div')), None)
             if player_div:
-                player_text = player_div.get_text(strip=True)
+                player_text = player_div.text(strip=True)
                 player_info['name'] = player_text
             
             # Tag da equipe
-            team_tag = team_div.find('div', class_='team-tag')
+            team_tag = team_div.css_first('div.team-tag')
             if team_tag:
-                team_name = team_tag.get_text(strip=True)
+                team_name = team_tag.text(strip=True)
                 player_info['team'] = team_name
             
             # Logo da equipe
-            team_logo = team_div.find('img', class_='team-logo')
-            if team_logo and team_logo.get('src'):
-                logo_src = team_logo.get('src')
+            team_logo = team_div.css_first('img.team-logo')
+            if team_logo and team_logo.attributes.get('src'):
+                logo_src = team_logo.attributes.get('src')
                 if logo_src.startswith('//'):
                     player_info['team_logo'] = 'https:' + logo_src
                 else:
                     player_info['team_logo'] = logo_src
         
         # Extrair o agente
-        agent_img = agent_cell.find('img')
-        if agent_img and agent_img.get('src'):
-            agent_src = agent_img.get('src')
+        agent_img = agent_cell.css_first('img')
+        if agent_img and agent_img.attributes.get('src'):
+            agent_src = agent_img.attributes.get('src')
             agent_name = agent_src.split('/')[-1].split('.')[0] if '/' in agent_src else None
             player_info['agent'] = agent_name
         
@@ -717,34 +639,34 @@ def extract_advanced_stats(map_div, game_id, matrix_data):
             
             # Extrair o valor da estatística
             stat_value = None
-            stats_sq = cell.find('div', class_='stats-sq')
+            stats_sq = cell.css_first('div.stats-sq')
             if stats_sq:
-                stat_text = stats_sq.get_text(strip=True)
+                stat_text = stats_sq.text(strip=True)
                 if stat_text and stat_text != "":
                     stat_value = stat_text
             
             # Extrair detalhes adicionais para estatísticas com popups
             details = []
-            if stats_sq and 'wf-popable' in stats_sq.get('class', []):
-                details_div = stats_sq.find('div', class_='wf-popable-contents')
+            if stats_sq and 'wf-popable' in class_list(stats_sq):
+                details_div = first_descendant(stats_sq, 'div.wf-popable-contents')
                 if details_div:
-                    for round_div in details_div.find_all('div', style=lambda s: s and 'margin-top: 10px' in s):
+                    for round_div in descendants(details_div, 'div[style*="margin-top: 10px"]'):
                         round_info = {'round': None, 'opponents': []}
                         
                         # Extrair o número da rodada
-                        round_number_div = round_div.find('div', style=lambda s: s and 'white-space: nowrap' in s)
+                        round_number_div = first_descendant(round_div, 'div[style*="white-space: nowrap"]')
                         if round_number_div:
-                            round_span = round_number_div.find('span')
+                            round_span = round_number_div.css_first('span')
                             if round_span:
-                                round_info['round'] = round_span.get_text(strip=True)
+                                round_info['round'] = round_span.text(strip=True)
                         
                         # Extrair os oponentes
-                        for opponent_div in round_div.find_all('div', style=lambda s: s and 'display: flex' in s):
-                            opponent_img = opponent_div.find('img')
-                            opponent_text = opponent_div.get_text(strip=True) if opponent_div else None
+                        for opponent_div in descendants(round_div, 'div[style*="display: flex"]'):
+                            opponent_img = opponent_div.css_first('img')
+                            opponent_text = opponent_div.text(strip=True) if opponent_div else None
                             
                             if opponent_img and opponent_text:
-                                agent_src = opponent_img.get('src')
+                                agent_src = opponent_img.attributes.get('src')
                                 agent_name = agent_src.split('/')[-1].split('.')[0] if '/' in agent_src else None
                                 opponent_info = {
                                     'agent': agent_name,
@@ -763,4 +685,4 @@ def extract_advanced_stats(map_div, game_id, matrix_data):
         # Adicionar estatísticas do jogador aos dados da matriz
         matrix_data['adv_stats'].append(player_stats)
     
-    logger.debug(f"Extraídas estatísticas avançadas para {len(matrix_data['adv_stats'])} jogadores")
+    logger.debug("Extraídas estatísticas avançadas para %s jogadores", len(matrix_data['adv_stats']))
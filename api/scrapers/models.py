@@ -0,0 +1,263 @@
+"""
+Result objects returned by the scrapers.
+
+They are slotted dataclasses so the many small objects of a large response
+(results pages, per-player map stats) take as little memory as possible,
+and orjson serializes them natively without building intermediate dicts.
+Field order is the key order of the JSON output.
+
+Python 3.9 has no dataclass(slots=True), so __slots__ is spelled out and no
+field may have a default.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class NewsItem:
+    __slots__ = ("title", "description", "date", "author", "url_path")
+
+    title: str
+    description: str
+    date: str
+    author: str
+    url_path: str
+
+
+@dataclass
+class StatsRow:
+    __slots__ = (
+        "player",
+        "org",
+        "agents",
+        "rounds_played",
+        "rating",
+        "average_combat_score",
+        "kill_deaths",
+        "kill_assists_survived_traded",
+        "average_damage_per_round",
+        "kills_per_round",
+        "assists_per_round",
+        "first_kills_per_round",
+        "first_deaths_per_round",
+        "headshot_percentage",
+        "clutch_success_percentage",
+    )
+
+    player: str
+    org: str
+    agents: List[str]
+    rounds_played: str
+    rating: str
+    average_combat_score: str
+    kill_deaths: str
+    kill_assists_survived_traded: str
+    average_damage_per_round: str
+    kills_per_round: str
+    assists_per_round: str
+    first_kills_per_round: str
+    first_deaths_per_round: str
+    headshot_percentage: str
+    clutch_success_percentage: str
+
+
+@dataclass
+class RankingEntry:
+    __slots__ = (
+        "rank",
+        "team",
+        "country",
+        "last_played",
+        "last_played_team",
+        "last_played_team_logo",
+        "record",
+        "earnings",
+        "logo",
+    )
+
+    rank: str
+    team: str
+    country: str
+    last_played: str
+    last_played_team: str
+    last_played_team_logo: str
+    record: str
+    earnings: str
+    logo: str
+
+
+@dataclass
+class UpcomingMatch:
+    __slots__ = (
+        "team1",
+        "team2",
+        "flag1",
+        "flag2",
+        "time_until_match",
+        "match_series",
+        "match_event",
+        "unix_timestamp",
+        "match_page",
+    )
+
+    team1: str
+    team2: str
+    flag1: str
+    flag2: str
+    time_until_match: str
+    match_series: str
+    match_event: str
+    unix_timestamp: str
+    match_page: str
+
+
+@dataclass
+class LiveMatch:
+    __slots__ = (
+        "team1",
+        "team2",
+        "flag1",
+        "flag2",
+        "team1_logo",
+        "team2_logo",
+        "score1",
+        "score2",
+        "team1_round_ct",
+        "team1_round_t",
+        "team2_round_ct",
+        "team2_round_t",
+        "map_number",
+        "current_map",
+        "time_until_match",
+        "match_event",
+        "match_series",
+        "unix_timestamp",
+        "match_page",
+    )
+
+    team1: str
+    team2: str
+    flag1: str
+    flag2: str
+    team1_logo: str
+    team2_logo: str
+    score1: str
+    score2: str
+    team1_round_ct: str
+    team1_round_t: str
+    team2_round_ct: str
+    team2_round_t: str
+    map_number: str
+    current_map: str
+    time_until_match: str
+    match_event: str
+    match_series: str
+    unix_timestamp: str
+    match_page: str
+
+
+@dataclass
+class MatchResult:
+    __slots__ = (
+        "team1",
+        "team2",
+        "score1",
+        "score2",
+        "flag1",
+        "flag2",
+        "time_completed",
+        "round_info",
+        "tournament_name",
+        "match_page",
+        "tournament_icon",
+        "page_number",
+    )
+
+    team1: str
+    team2: str
+    score1: str
+    score2: str
+    flag1: str
+    flag2: str
+    time_completed: str
+    round_info: str
+    tournament_name: str
+    match_page: str
+    tournament_icon: str
+    page_number: int
+
+
+@dataclass
+class Agent:
+    __slots__ = ("name", "img")
+
+    name: Optional[str]
+    img: Optional[str]
+
+
+@dataclass
+class SideStat:
+    """One stat of a player on a map: overall, on attack and on defense."""
+
+    __slots__ = ("both", "attack", "defend")
+
+    both: Optional[str]
+    attack: Optional[str]
+    defend: Optional[str]
+
+
+@dataclass
+class PlayerStats:
+    """A row of the overview table of a map (or of all maps)."""
+
+    __slots__ = (
+        "player",
+        "team",
+        "agents",
+        "rating",
+        "acs",
+        "kills",
+        "deaths",
+        "assists",
+        "kd_diff",
+        "kast",
+        "adr",
+        "hs_pct",
+        "fk",
+        "fd",
+        "fk_diff",
+    )
+
+    player: Optional[str]
+    team: Optional[str]
+    agents: List[Agent]
+    rating: SideStat
+    acs: SideStat
+    kills: SideStat
+    deaths: SideStat
+    assists: SideStat
+    kd_diff: SideStat
+    kast: SideStat
+    adr: SideStat
+    hs_pct: SideStat
+    fk: SideStat
+    fd: SideStat
+    fk_diff: SideStat
+
+
+@dataclass
+class MatchupMatrix:
+    """
+    One player matrix as integer grids, indexed [row][column] by the positions
+    of row_players and column_players. A cell is None when it had no number.
+
+    For the kills table "kills" are the row player's kills on the column
+    player and "deaths" the reverse; the first kills and operator tables use
+    the same layout.
+    """
+
+    __slots__ = ("kills", "deaths", "diff")
+
+    kills: List[List[Optional[int]]]
+    deaths: List[List[Optional[int]]]
+    diff: List[List[Optional[int]]]
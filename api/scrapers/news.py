@@ -1,15 +1,12 @@
-import requests
 from selectolax.parser import HTMLParser
 
-from utils.utils import headers
+from api.scrapers.models import NewsItem
+from utils.cache import cached
+from utils.fetch import fetch_parsed
 
 
-def vlr_news():
-    url = "https://www.vlr.gg/news"
-    resp = requests.get(url, headers=headers)
-    html = HTMLParser(resp.text)
-    status = resp.status_code
-
+def _parse_news(text):
+    html = HTMLParser(text)
     result = []
     for item in html.css("a.wf-module-item"):
         date_author = item.css_first("div.ge-text-light").text()
@@ -23,17 +20,24 @@ def vlr_news():
         url = item.css_first("a.wf-module-item").attributes["href"]
 
         result.append(
-            {
-                "title": title,
-                "description": desc,
-                "date": date.split("\u2022")[1].strip(),
-                "author": author.strip(),
-                "url_path": "https://vlr.gg" + url,
-            }
+            NewsItem(
+                title=title,
+                description=desc,
+                date=date.split("\u2022")[1].strip(),
+                author=author.strip(),
+                url_path="https://vlr.gg" + url,
+            )
         )
 
-    data = {"data": {"status": status, "segments": result}}
+    return result
+
+
+@cached("news")
+async def vlr_news():
+    url = "https://www.vlr.gg/news"
+    status, result = await fetch_parsed(url, _parse_news)
 
     if status != 200:
         raise Exception("API response: {}".format(status))
+    data = {"data": {"status": status, "segments": result}}
     return data
@@ -1,17 +1,15 @@
 import re
 
-import requests
 from selectolax.parser import HTMLParser
 
-from utils.utils import headers, region
+from api.scrapers.models import RankingEntry
+from utils.cache import cached
+from utils.fetch import fetch_parsed
+from utils.utils import region
 
 
-def vlr_rankings(region_key):
-    url = "https://www.vlr.gg/rankings/" + region[str(region_key)]
-    resp = requests.get(url, headers=headers)
-    html = HTMLParser(resp.text)
-    status = resp.status_code
-
+def _parse_rankings(text):
+    html = HTMLParser(text)
     result = []
     for item in html.css("div.rank-item"):
         rank = item.css_first("div.rank-item-rank-num").text().strip()
@@ -51,21 +49,28 @@ def vlr_rankings(region_key):
         )
 
         result.append(
-            {
-                "rank": rank,
-                "team": team.strip(),
-                "country": country,
-                "last_played": last_played.strip(),
-                "last_played_team": last_played_team.strip(),
-                "last_played_team_logo": last_played_team_logo,
-                "record": record,
-                "earnings": earnings,
-                "logo": logo,
-            }
+            RankingEntry(
+                rank=rank,
+                team=team.strip(),
+                country=country,
+                last_played=last_played.strip(),
+                last_played_team=last_played_team.strip(),
+                last_played_team_logo=last_played_team_logo,
+                record=record,
+                earnings=earnings,
+                logo=logo,
+            )
         )
 
-    data = {"status": status, "data": result}
+    return result
+
+
+@cached("rankings", key=lambda region_key: (str(region_key),))
+async def vlr_rankings(region_key):
+    url = "https://www.vlr.gg/rankings/" + region[str(region_key)]
+    status, result = await fetch_parsed(url, _parse_rankings)
 
     if status != 200:
         raise Exception("API response: {}".format(status))
+    data = {"status": status, "data": result}
     return data
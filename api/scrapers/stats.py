@@ -1,21 +1,12 @@
-import requests
 from selectolax.parser import HTMLParser
 
-from utils.utils import headers
+from api.scrapers.models import StatsRow
+from utils.cache import cached
+from utils.fetch import fetch_parsed
 
 
-def vlr_stats(region: str, timespan: str):
-    base_url = f"https://www.vlr.gg/stats/?event_group_id=all&event_id=all&region={region}&country=all&min_rounds=200&min_rating=1550&agent=all&map_id=all"
-    url = (
-        f"{base_url}&timespan=all"
-        if timespan.lower() == "all"
-        else f"{base_url}&timespan={timespan}d"
-    )
-
-    resp = requests.get(url, headers=headers)
-    html = HTMLParser(resp.text)
-    status = resp.status_code
-
+def _parse_stats(text):
+    html = HTMLParser(text)
     result = []
     for item in html.css("tbody tr"):
         player = item.text().replace("\t", "").replace("\n", " ").strip().split()
@@ -30,28 +21,47 @@ def vlr_stats(region: str, timespan: str):
         rnd = item.css_first("td.mod-rnd").text()
 
         result.append(
-            {
-                "player": player_name,
-                "org": org,
-                "agents": agents,
-                "rounds_played": rnd,
-                "rating": color_sq[0],
-                "average_combat_score": color_sq[1],
-                "kill_deaths": color_sq[2],
-                "kill_assists_survived_traded": color_sq[3],
-                "average_damage_per_round": color_sq[4],
-                "kills_per_round": color_sq[5],
-                "assists_per_round": color_sq[6],
-                "first_kills_per_round": color_sq[7],
-                "first_deaths_per_round": color_sq[8],
-                "headshot_percentage": color_sq[9],
-                "clutch_success_percentage": color_sq[10],
-            }
+            StatsRow(
+                player=player_name,
+                org=org,
+                agents=agents,
+                rounds_played=rnd,
+                rating=color_sq[0],
+                average_combat_score=color_sq[1],
+                kill_deaths=color_sq[2],
+                kill_assists_survived_traded=color_sq[3],
+                average_damage_per_round=color_sq[4],
+                kills_per_round=color_sq[5],
+                assists_per_round=color_sq[6],
+                first_kills_per_round=color_sq[7],
+                first_deaths_per_round=color_sq[8],
+                headshot_percentage=color_sq[9],
+                clutch_success_percentage=color_sq[10],
+            )
         )
 
-    segments = {"status": status, "segments": result}
-    data = {"data": segments}
+    return result
+
+
+@cached(
+    "stats",
+    key=lambda region, timespan: (
+        region,
+        "all" if timespan.lower() == "all" else timespan,
+    ),
+)
+async def vlr_stats(region: str, timespan: str):
+    base_url = f"https://www.vlr.gg/stats/?event_group_id=all&event_id=all&region={region}&country=all&min_rounds=200&min_rating=1550&agent=all&map_id=all"
+    url = (
+        f"{base_url}&timespan=all"
+        if timespan.lower() == "all"
+        else f"{base_url}&timespan={timespan}d"
+    )
+
+    status, result = await fetch_parsed(url, _parse_stats)
 
     if status != 200:
         raise Exception("API response: {}".format(status))
+    segments = {"status": status, "segments": result}
+    data = {"data": segments}
     return data
@@ -0,0 +1,86 @@
+"""
+Compare per-map lookups through MatchIndex with the document-wide selectors they replaced.
+
+For every saved match page (a BO5 shows the difference best) it reports the
+median time to find each map's stats div, header, nav item and rounds block
+both ways, on an already parsed page, and whether both found the same nodes.
+
+Usage:
+    python -m benchmarks.bench_match_index page.html [page.html ...] [-n 200]
+"""
+import argparse
+import statistics
+import time
+
+from selectolax.lexbor import LexborHTMLParser
+
+from api.scrapers.documents import MatchIndex
+
+
+def per_map(tree):
+    """The previous lookups: document-wide selectors and linear scans once per map."""
+    found = []
+    map_tabs = tree.css('.vm-stats-gamesnav-item:not([data-game-id="all"])')
+    for tab in map_tabs:
+        game_id = tab.attributes.get("data-game-id") or str(map_tabs.index(tab) + 1)
+        game = tree.css_first(f'.vm-stats-game[data-game-id="{game_id}"]')
+        header = None
+        for candidate in tree.css(".vm-stats-game"):
+            if candidate.attributes.get("data-game-id") == game_id:
+                header = candidate.css_first(".vm-stats-game-header")
+                break
+        nav_item = tree.css_first(f'.vm-stats-gamesnav-item[data-game-id="{game_id}"]')
+        rounds = tree.css(".vlr-rounds")
+        found.append((game, header, nav_item, rounds))
+    return found
+
+
+def indexed(tree):
+    found = []
+    index = MatchIndex(tree)
+    for position, tab in enumerate(index.map_tabs(), 1):
+        game_id = tab.attributes.get("data-game-id") or str(position)
+        found.append((
+            index.games.get(game_id),
+            index.headers.get(game_id),
+            index.nav_items.get(game_id),
+            index.rounds_for(game_id),
+        ))
+    return found
+
+
+def median_time(func, tree, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(tree)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _ids(found):
+    return [tuple(getattr(node, "mem_id", None) for node in nodes[:3]) for nodes in found]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("pages", nargs="+", help="saved vlr.gg match pages")
+    arg_parser.add_argument("-n", "--iterations", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    print(f"{'page':40} {'maps':>5} {'per-map ms':>11} {'index ms':>9} {'speedup':>8}  same")
+    for path in args.pages:
+        with open(path, encoding="utf-8") as f:
+            tree = LexborHTMLParser(f.read())
+        old = per_map(tree)
+        new = indexed(tree)
+        old_time = median_time(per_map, tree, args.iterations)
+        new_time = median_time(indexed, tree, args.iterations)
+        print(
+            f"{path[-40:]:40} {len(new):5d} {old_time * 1000:11.3f} {new_time * 1000:9.3f} "
+            f"{old_time / new_time:7.1f}x  {_ids(old) == _ids(new)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
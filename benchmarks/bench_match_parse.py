@@ -0,0 +1,138 @@
+"""
+Compare BeautifulSoup (html.parser) with selectolax/lexbor on saved match pages.
+
+For every page it reports the time to build the tree and run the selector
+workload of the match-details extractors, and the peak RSS growth of a
+fresh process that does the same. beautifulsoup4 is only needed for the
+comparison and is not an application dependency; it is listed in
+requirements-dev.txt.
+
+Usage:
+    python -m benchmarks.bench_match_parse page.html [page.html ...] [-n 20]
+"""
+import argparse
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from selectolax.lexbor import LexborHTMLParser
+
+try:
+    import bs4
+except ImportError:  # only this benchmark needs it, see requirements-dev.txt
+    bs4 = None
+
+# The selectors the match-details pipeline evaluates on a match page.
+SELECTORS = [
+    ".match-header-vs-note",
+    ".match-header-event div[style='font-weight: 700;']",
+    ".match-header-date .moment-tz-convert",
+    ".match-header-vs-team .match-header-vs-team-name",
+    ".vm-stats-gamesnav-item",
+    ".vm-stats-game",
+    "table.wf-table-inset.mod-overview tbody tr",
+    "td.mod-stat .side",
+    "table.mod-matrix tr td",
+    "table.mod-adv-stats tr",
+    ".vlr-rounds-row-col .rnd-sq",
+]
+
+
+def run_bs4(html):
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    for selector in SELECTORS:
+        for node in soup.select(selector):
+            node.get_text(strip=True)
+    return soup
+
+
+def run_lexbor(html):
+    tree = LexborHTMLParser(html)
+    for selector in SELECTORS:
+        for node in tree.css(selector):
+            node.text(strip=True)
+    return tree
+
+
+PARSERS = {"bs4": run_bs4, "lexbor": run_lexbor}
+
+
+def time_parser(func, html, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(html)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _high_water_kb():
+    # ru_maxrss survives fork/exec on Linux, so the child would report the
+    # parent's peak; VmHWM is reset for the new process image.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def peak_rss_kb(parser, path):
+    """Peak RSS growth in KiB of a fresh interpreter parsing path with parser."""
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_match_parse", "--rss-child", parser, path],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return int(out.stdout.strip())
+
+
+def rss_child(parser, path):
+    # Both libraries are imported at module level, so only the parse is measured
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    before = _high_water_kb()
+    tree = PARSERS[parser](html)
+    after = _high_water_kb()
+    del tree
+    print(after - before)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("pages", nargs="*", help="saved vlr.gg match pages")
+    arg_parser.add_argument("-n", "--iterations", type=int, default=20)
+    arg_parser.add_argument("--rss-child", nargs=2, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if bs4 is None:
+        sys.exit(
+            "bench_match_parse compares against BeautifulSoup, which is not installed; "
+            "run pip3 install -r requirements-dev.txt"
+        )
+    if args.rss_child:
+        rss_child(*args.rss_child)
+        return
+    if not args.pages:
+        arg_parser.error("pass at least one saved match page")
+
+    print(f"{'page':40} {'bs4 ms':>9} {'lexbor ms':>10} {'speedup':>8} {'bs4 KiB':>9} {'lexbor KiB':>11}")
+    for path in args.pages:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        bs4_time = time_parser(run_bs4, html, args.iterations)
+        lexbor_time = time_parser(run_lexbor, html, args.iterations)
+        print(
+            f"{path[-40:]:40} {bs4_time * 1000:9.2f} {lexbor_time * 1000:10.2f} "
+            f"{bs4_time / lexbor_time:7.1f}x {peak_rss_kb('bs4', path):9d} "
+            f"{peak_rss_kb('lexbor', path):11d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
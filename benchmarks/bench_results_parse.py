@@ -0,0 +1,128 @@
+"""
+Compare the results-page extractor with the per-item one it replaced.
+
+For every saved /matches/results page it reports the median time to parse
+the page and extract its matches with each extractor, the number of matches
+each one found and whether they agree.
+
+Usage:
+    python -m benchmarks.bench_results_parse page.html [page.html ...] [-n 50]
+"""
+import argparse
+import statistics
+import time
+
+from selectolax.lexbor import LexborHTMLParser
+from selectolax.parser import HTMLParser
+
+from api.scrapers.matches import _parse_results_page
+from utils.serialize import to_builtins
+
+
+def per_item(text, page=1):
+    """The previous extractor: several css_first() scans and string splits per item."""
+    html = HTMLParser(text)
+    page_results = []
+    for item in html.css("a.wf-module-item"):
+        try:
+            url_path = item.attributes["href"]
+            eta = item.css_first("div.ml-eta").text() + " ago"
+            rounds = (
+                item.css_first("div.match-item-event-series")
+                .text()
+                .replace("\u2013", "-")
+                .replace("\n", "")
+                .replace("\t", "")
+            )
+            tourney = (
+                item.css_first("div.match-item-event")
+                .text()
+                .replace("\t", " ")
+                .strip()
+                .split("\n")[1]
+                .strip()
+            )
+            tourney_icon_url = f"https:{item.css_first('img').attributes['src']}"
+
+            try:
+                team_array = (
+                    item.css_first("div.match-item-vs").css_first("div:nth-child(2)").text()
+                )
+            except Exception:
+                team_array = "TBD"
+            team_array = (
+                team_array.replace("\t", " ")
+                .replace("\n", " ")
+                .strip()
+                .split("                                  ")
+            )
+            team1 = team_array[0]
+            score1 = team_array[1].replace(" ", "").strip()
+            team2 = team_array[4].strip()
+            score2 = team_array[-1].replace(" ", "").strip()
+
+            flag_list = [
+                flag_parent.attributes["class"].replace(" mod-", "_")
+                for flag_parent in item.css(".flag")
+            ]
+            flag1 = flag_list[0] if len(flag_list) > 0 else ""
+            flag2 = flag_list[1] if len(flag_list) > 1 else ""
+
+            page_results.append(
+                {
+                    "team1": team1,
+                    "team2": team2,
+                    "score1": score1,
+                    "score2": score2,
+                    "flag1": flag1,
+                    "flag2": flag2,
+                    "time_completed": eta,
+                    "round_info": rounds,
+                    "tournament_name": tourney,
+                    "match_page": url_path,
+                    "tournament_icon": tourney_icon_url,
+                    "page_number": page,
+                }
+            )
+        except Exception:
+            continue
+    return page_results
+
+
+def single_pass(text, page=1):
+    return _parse_results_page(LexborHTMLParser(text), page)
+
+
+EXTRACTORS = {"per-item": per_item, "single-pass": single_pass}
+
+
+def time_extractor(func, text, iterations):
+    samples = []
+    result = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = func(text)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the results-page extractors.")
+    parser.add_argument("pages", nargs="+", help="saved vlr.gg /matches/results pages")
+    parser.add_argument("-n", "--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'page':28} {'extractor':12} {'median ms':>10} {'matches':>8}")
+    for path in args.pages:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        results = {}
+        for name, func in EXTRACTORS.items():
+            median, results[name] = time_extractor(func, text, args.iterations)
+            print(f"{path[-28:]:28} {name:12} {median * 1000:10.2f} {len(results[name]):8}")
+        same = results["per-item"] == to_builtins(results["single-pass"])
+        print(f"{'':28} {'outputs':12} {'identical' if same else 'differ':>10}")
+
+
+if __name__ == "__main__":
+    main()
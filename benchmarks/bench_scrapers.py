@@ -0,0 +1,99 @@
+"""
+Run every scraper offline against the recorded corpus.
+
+For each scenario it reports the median wall time, the peak Python memory
+allocated during one run (tracemalloc) and whether the output still matches
+the output recorded with the corpus.
+
+Usage:
+    python -m benchmarks.bench_scrapers [-n 10] [-k match_]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.fixtures import (
+    FIXTURES_DIR,
+    FixtureFetcher,
+    expected_path,
+    normalize,
+    scenarios,
+)
+from api.scrapers.documents import shared_documents
+from api.scrapers.matches import live_match_pages
+from utils.cache import response_cache
+from utils.fetch import clear_parsed, set_fetcher
+from utils.store import store
+
+
+def reset():
+    # Every iteration must do the full fetch and parse, as on a cold process
+    response_cache.clear()
+    clear_parsed()
+    shared_documents.clear()
+    live_match_pages.clear()
+
+
+async def measure(run, iterations):
+    samples = []
+    result = None
+    for _ in range(iterations):
+        reset()
+        start = time.perf_counter()
+        result = await run()
+        samples.append(time.perf_counter() - start)
+
+    reset()
+    tracemalloc.start()
+    await run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak, result
+
+
+def compare(name, result, directory):
+    path = expected_path(name, directory)
+    if not os.path.exists(path):
+        return "no baseline"
+    with open(path, encoding="utf-8") as f:
+        return "ok" if json.load(f) == normalize(result) else "DIFFERS"
+
+
+async def bench(iterations, keyword, directory):
+    fetcher = FixtureFetcher(directory)
+    set_fetcher(fetcher)
+    # Every iteration must scrape, not read back the previous one from disk
+    store.enabled = False
+    failures = 0
+    print(f"{'scenario':16} {'median ms':>10} {'peak KiB':>9}  output")
+    try:
+        for name, run in scenarios(fetcher.match_ids):
+            if keyword and keyword not in name:
+                continue
+            median, peak, result = await measure(run, iterations)
+            status = compare(name, result, directory)
+            failures += status == "DIFFERS"
+            print(f"{name:16} {median * 1000:10.2f} {peak / 1024:9.0f}  {status}")
+    finally:
+        set_fetcher(None)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers on the offline corpus.")
+    parser.add_argument("-n", "--iterations", type=int, default=10)
+    parser.add_argument("-k", "--keyword", help="only run scenarios whose name contains this")
+    parser.add_argument("--dir", default=FIXTURES_DIR)
+    args = parser.parse_args()
+    if not os.path.exists(os.path.join(args.dir, "manifest.json")):
+        parser.error(f"no corpus in {args.dir}; record one with python -m benchmarks.record_fixtures")
+    failures = asyncio.run(bench(args.iterations, args.keyword, args.dir))
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
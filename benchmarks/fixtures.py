@@ -0,0 +1,119 @@
+"""
+Offline vlr.gg page corpus for the benchmarks.
+
+The corpus lives in benchmarks/fixtures/: pages/ holds the saved HTML,
+manifest.json maps each fetched URL to its page and status code, and
+expected/ holds the output every scenario produced when the pages were
+recorded. record_fixtures.py builds it from the live site and
+build_fixtures.py from hand-built pages; FixtureFetcher serves it back
+through utils.fetch.set_fetcher so the scrapers run offline.
+"""
+import hashlib
+import json
+import os
+
+import httpx
+
+from api.scrapers import (
+    vlr_live_score,
+    vlr_match_details,
+    vlr_match_results,
+    vlr_news,
+    vlr_rankings,
+    vlr_stats,
+    vlr_upcoming_matches,
+)
+from utils.fetch import get_client
+from utils.serialize import to_builtins
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+MANIFEST = "manifest.json"
+
+
+def scenarios(match_ids):
+    """
+    Return (name, coroutine factory) pairs for every scraper in the corpus.
+
+    Args:
+        match_ids (dict): Label (e.g. "bo3") to vlr.gg match ID
+    """
+    items = [
+        ("news", lambda: vlr_news()),
+        ("stats", lambda: vlr_stats("na", "30")),
+        ("rankings", lambda: vlr_rankings("na")),
+        ("upcoming", lambda: vlr_upcoming_matches()),
+        ("live_score", lambda: vlr_live_score()),
+        ("results", lambda: vlr_match_results(num_pages=3, request_delay=0)),
+    ]
+    for label, match_id in sorted(match_ids.items()):
+        items.append((f"match_{label}", lambda match_id=match_id: vlr_match_details(match_id)))
+    return items
+
+
+def normalize(result):
+    """Round-trip a scraper result through JSON so it compares like a response body."""
+    return to_builtins(result)
+
+
+def _page_name(url):
+    return hashlib.sha1(url.encode()).hexdigest()[:16] + ".html"
+
+
+class FixtureFetcher:
+    """Serve recorded pages; unknown URLs get a 404 like a missing page would."""
+
+    def __init__(self, directory=FIXTURES_DIR):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self._pages = {}
+
+    @property
+    def match_ids(self):
+        return self.manifest.get("match_ids", {})
+
+    def _read(self, name):
+        if name not in self._pages:
+            with open(os.path.join(self.directory, "pages", name), encoding="utf-8") as f:
+                self._pages[name] = f.read()
+        return self._pages[name]
+
+    async def __call__(self, url, timeout=None):
+        request = httpx.Request("GET", url)
+        entry = self.manifest["urls"].get(url)
+        if entry is None:
+            return httpx.Response(404, text="", request=request)
+        return httpx.Response(entry["status"], text=self._read(entry["page"]), request=request)
+
+
+class RecordingFetcher:
+    """
+    Fetch through the shared client (or upstream, a fetcher of the same
+    signature) and save every response into a corpus.
+    """
+
+    def __init__(self, directory=FIXTURES_DIR, upstream=None):
+        self.directory = directory
+        self.upstream = upstream
+        self.urls = {}
+        os.makedirs(os.path.join(directory, "pages"), exist_ok=True)
+
+    async def __call__(self, url, timeout=None):
+        if self.upstream is not None:
+            resp = await self.upstream(url, timeout)
+        else:
+            client = get_client()
+            resp = await (client.get(url) if timeout is None else client.get(url, timeout=timeout))
+        name = _page_name(url)
+        with open(os.path.join(self.directory, "pages", name), "w", encoding="utf-8") as f:
+            f.write(resp.text)
+        self.urls[url] = {"page": name, "status": resp.status_code}
+        return resp
+
+    def save_manifest(self, match_ids):
+        with open(os.path.join(self.directory, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump({"match_ids": match_ids, "urls": self.urls}, f, indent=1, sort_keys=True)
+
+
+def expected_path(name, directory=FIXTURES_DIR):
+    return os.path.join(directory, "expected", f"{name}.json")
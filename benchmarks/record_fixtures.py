@@ -0,0 +1,65 @@
+"""
+Record the offline corpus from the live site.
+
+Runs every scraper against vlr.gg with a RecordingFetcher installed, saves
+each page it downloads and the output it produced as the expected result.
+
+Usage:
+    python -m benchmarks.record_fixtures --match bo1=123456 --match bo3=234567 --match bo5=345678
+"""
+import argparse
+import asyncio
+import json
+import os
+
+from benchmarks.fixtures import (
+    FIXTURES_DIR,
+    RecordingFetcher,
+    expected_path,
+    normalize,
+    scenarios,
+)
+from utils.fetch import close_client, set_fetcher
+from utils.store import store
+
+
+async def record(match_ids, directory, upstream=None):
+    recorder = RecordingFetcher(directory, upstream)
+    set_fetcher(recorder)
+    # Every page has to be downloaded to end up in the corpus
+    store.enabled = False
+    os.makedirs(os.path.join(directory, "expected"), exist_ok=True)
+    try:
+        for name, run in scenarios(match_ids):
+            try:
+                result = normalize(await run())
+            except Exception as e:
+                print(f"{name}: failed ({e}), not recorded")
+                continue
+            with open(expected_path(name, directory), "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=1, sort_keys=True)
+            print(f"{name}: recorded")
+    finally:
+        set_fetcher(None)
+        await close_client()
+    recorder.save_manifest(match_ids)
+    print(f"{len(recorder.urls)} pages saved to {directory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record the offline vlr.gg corpus.")
+    parser.add_argument(
+        "--match",
+        action="append",
+        default=[],
+        metavar="LABEL=ID",
+        help="match page to include, e.g. bo3=234567 (repeatable)",
+    )
+    parser.add_argument("--dir", default=FIXTURES_DIR)
+    args = parser.parse_args()
+    match_ids = dict(item.split("=", 1) for item in args.match)
+    asyncio.run(record(match_ids, args.dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,42 @@
 import logging
+import time
+from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
+from api.live_feed import live_feed
 from routers.vlr_router import router as vlr_router
+from utils import timing
+from utils.fetch import close_client
+from utils.log import configure_logging
+from utils.metrics import HTTP_IN_FLIGHT, HTTP_LATENCY
+from utils.store import store
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await store.purge()
+    yield
+    await live_feed.stop()
+    await close_client()
+
+
 app = FastAPI(
     title="vlrggapi",
     description="An Unofficial REST API for [vlr.gg](https://www.vlr.gg/), a site for Valorant Esports match and news coverage. Made by [axsddlr](https://github.com/axsddlr)",
     docs_url="/",
     redoc_url=None,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -26,10 +46,44 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.include_router(vlr_router)
 
 
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    HTTP_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    try:
+        return await call_next(request)
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # Label by route template so /match/{match_id} is a single series
+        route = request.scope.get("route")
+        HTTP_LATENCY.labels(getattr(route, "path", "unmatched")).observe(
+            time.perf_counter() - start
+        )
+
+
+@app.middleware("http")
+async def debug_timing(request: Request, call_next):
+    mode = request.query_params.get("debug_timing") or request.headers.get("x-debug-timing")
+    if not timing.ALLOW_TIMING or not mode or mode == "0":
+        return await call_next(request)
+    token = timing.start(profile=mode == "profile")
+    try:
+        return await call_next(request)
+    finally:
+        timing.stop(token)
+
+
 @app.get("/", include_in_schema=False)
 def root():
     return RedirectResponse(url="/docs")
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=3001)
+    # Without a log config uvicorn's loggers propagate to the root logger
+    # and share its queue and format
+    uvicorn.run("main:app", host="0.0.0.0", port=3001, log_config=None)
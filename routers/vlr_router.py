@@ -1,18 +1,98 @@
-from fastapi import APIRouter, Query, Request
+import asyncio
+import time
+
+from fastapi import APIRouter, Body, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from api.live_feed import live_feed
 from api.scrape import Vlr
+from api.scrapers.matchDetails import MATCH_SECTIONS
+from utils import timing
+from utils.cache import response_cache
+from utils.serialize import dumps, encode
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
 vlr = Vlr()
 
+# Seconds without events after which an SSE comment is sent to keep proxies from
+# closing the connection.
+SSE_KEEPALIVE = 15
+# Most matches a single /matches/details request may ask for.
+MAX_BATCH_SIZE = 100
+MATCH_SECTIONS_PATTERN = f"({'|'.join(MATCH_SECTIONS)})"
+
+
+def json_response(request, payload):
+    """
+    Send a payload as pre-encoded JSON.
+
+    Payloads held by the response cache reuse their stored body, compressed
+    variants and ETag, so a cache hit is served without encoding anything. A
+    matching If-None-Match gets an empty 304.
+    """
+    request_timing = timing.current()
+    if request_timing is None:
+        body = response_cache.encoded(payload)
+    else:
+        body = encode_timed(payload, request_timing)
+    coding = body.negotiate(request.headers.get("accept-encoding"))
+    headers = {"ETag": body.etag_for(coding), "Vary": "Accept-Encoding"}
+    if request_timing is not None:
+        headers["Server-Timing"] = request_timing.server_timing()
+    if body.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+    return Response(body.content(coding), media_type="application/json", headers=headers)
+
+
+def encode_timed(payload, request_timing):
+    """
+    Encode a payload with the timing breakdown of its request added.
+
+    Match details get it as debug_info.timing; other payloads get a
+    top-level debug_info block.
+    """
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if isinstance(data, dict) and isinstance(data.get("match_details"), dict):
+        debug_info = data["match_details"].setdefault("debug_info", {})
+    else:
+        debug_info = payload.setdefault("debug_info", {})
+    debug_info["timing"] = request_timing.breakdown()
+    started = time.perf_counter()
+    body = encode(payload)
+    request_timing.serialize = time.perf_counter() - started
+    return body
+
+
+async def ndjson_lines(records):
+    async for record in records:
+        yield dumps(record) + b"\n"
+
+
+async def live_events():
+    queue = live_feed.subscribe()
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {dumps(event).decode()}\n\n"
+    finally:
+        live_feed.unsubscribe(queue)
+
 
+# Routes build their responses themselves so the result dataclasses are
+# serialized by orjson directly instead of going through jsonable_encoder.
 @router.get("/news")
 @limiter.limit("600/minute")
 async def VLR_news(request: Request):
-    return vlr.vlr_news()
+    return json_response(request, await vlr.vlr_news())
 
 
 @router.get("/stats")
@@ -34,7 +114,7 @@ async def VLR_stats(
         "oce": "oceania",\n
         "mn": "mena"\n
     """
-    return vlr.vlr_stats(region, timespan)
+    return json_response(request, await vlr.vlr_stats(region, timespan))
 
 
 @router.get("/rankings")
@@ -61,7 +141,7 @@ async def VLR_ranks(
         "jp": "japan",\n
         "col": "collegiate",\n
     """
-    return vlr.vlr_rankings(region)
+    return json_response(request, await vlr.vlr_rankings(region))
 
 
 @router.get("/match")
@@ -73,8 +153,10 @@ async def VLR_match(
     from_page: int = Query(None, description="Starting page number (1-based, optional)", ge=1, le=600),
     to_page: int = Query(None, description="Ending page number (1-based, inclusive, optional)", ge=1, le=600),
     max_retries: int = Query(3, description="Maximum retry attempts per page (default: 3)", ge=1, le=5),
-    request_delay: float = Query(1.0, description="Delay between requests in seconds (default: 1.0)", ge=0.5, le=5.0),
-    timeout: int = Query(30, description="Request timeout in seconds (default: 30)", ge=10, le=120)
+    request_delay: float = Query(1.0, description="Base backoff delay between retries of a page in seconds (default: 1.0)", ge=0.5, le=5.0),
+    timeout: int = Query(30, description="Request timeout in seconds (default: 30)", ge=10, le=120),
+    concurrency: int = Query(None, description="Maximum number of pages fetched at the same time (default: 8)", ge=1, le=16),
+    format: str = Query("json", description="Response format for results: json or ndjson (default: json)", pattern="^(json|ndjson)$")
 ):
     """
     query parameters:\n
@@ -89,30 +171,88 @@ async def VLR_match(
     
     Additional parameters for robust scraping:
     - max_retries: Maximum retry attempts per failed page (1-5, default: 3)
-    - request_delay: Delay between requests in seconds (0.5-5.0, default: 1.0)
+    - request_delay: Base backoff delay between retries of a page in seconds (0.5-5.0, default: 1.0)
     - timeout: Request timeout in seconds (10-120, default: 30)
+    - concurrency: Maximum number of pages fetched at the same time (1-16, default: 8)
+    - format: "ndjson" streams results as newline-delimited JSON, one match per line as
+      soon as its page is parsed, followed by a final {"meta": {...}} line (default: "json")
     
     Examples:
     - /match?q=results&num_pages=5 (scrapes pages 1-5)
     - /match?q=results&from_page=10&to_page=15 (scrapes pages 10-15)
     - /match?q=results&from_page=5&num_pages=3 (scrapes pages 5-7)
+    - /match?q=results&from_page=1&to_page=300&format=ndjson (streams pages 1-300)
     """
     if q == "upcoming":
-        return vlr.vlr_upcoming_matches(num_pages, from_page, to_page)
+        return json_response(request, await vlr.vlr_upcoming_matches(num_pages, from_page, to_page))
     elif q == "live_score":
-        return vlr.vlr_live_score(num_pages, from_page, to_page)
+        return json_response(request, await vlr.vlr_live_score(num_pages, from_page, to_page))
+    elif q == "results" and format == "ndjson":
+        records = await vlr.vlr_match_results_stream(num_pages, from_page, to_page, max_retries, request_delay, timeout, concurrency)
+        return StreamingResponse(ndjson_lines(records), media_type="application/x-ndjson")
     elif q == "results":
-        return vlr.vlr_match_results(num_pages, from_page, to_page, max_retries, request_delay, timeout)
+        return json_response(request, await vlr.vlr_match_results(num_pages, from_page, to_page, max_retries, request_delay, timeout, concurrency))
 
     else:
-        return {"error": "Invalid query parameter"}
+        return ORJSONResponse({"error": "Invalid query parameter"})
+
+
+@router.get("/match/live/stream")
+@limiter.limit("600/minute")
+async def VLR_live_stream(request: Request):
+    """
+    Server-Sent Events stream of live scores.
+
+    The first event is a "snapshot" with every live match (same fields as
+    /match?q=live_score). After that an "update" event is sent whenever a poll
+    finds a difference:\n
+        "added": matches that went live,\n
+        "removed": match_page of matches that are no longer live,\n
+        "changed": [{"match_page": ..., "fields": {...}}] with only the changed
+        score, round and map fields.\n
+    """
+    return StreamingResponse(live_events(), media_type="text/event-stream")
+
+
+@router.websocket("/match/live/ws")
+async def VLR_live_ws(websocket: WebSocket):
+    """WebSocket variant of /match/live/stream; every event is sent as one JSON message."""
+    await websocket.accept()
+    queue = live_feed.subscribe()
+    # Clients only listen, but receiving is what notices a disconnect while
+    # no events are published, so the feed stops polling for a closed socket
+    receiving = asyncio.ensure_future(websocket.receive())
+    getting = asyncio.ensure_future(queue.get())
+    try:
+        while True:
+            done, _ = await asyncio.wait({receiving, getting}, return_when=asyncio.FIRST_COMPLETED)
+            if receiving in done:
+                if receiving.result()["type"] == "websocket.disconnect":
+                    break
+                # Messages sent by the client are ignored
+                receiving = asyncio.ensure_future(websocket.receive())
+            if getting in done:
+                await websocket.send_text(dumps(getting.result()).decode())
+                getting = asyncio.ensure_future(queue.get())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiving.cancel()
+        getting.cancel()
+        live_feed.unsubscribe(queue)
 
 
 @router.get("/match/{match_id}")
 @limiter.limit("600/minute")
 async def VLR_match_details(
     request: Request,
-    match_id: str
+    match_id: str,
+    compact: bool = Query(False, description="Return player matrices as integer grids only (default: false)"),
+    include: str = Query(
+        None,
+        description="Comma-separated sections to build: header, stats, maps, rounds, matrix, adv_stats, debug (default: all)",
+        pattern=f"^{MATCH_SECTIONS_PATTERN}(,{MATCH_SECTIONS_PATTERN})*$",
+    )
 ):
     """
     Get detailed information about a specific match.
@@ -123,12 +263,86 @@ async def VLR_match_details(
                         - A full match URL path (e.g. "/123456/team1-vs-team2")
                         - A complete VLR.GG URL (e.g. "https://www.vlr.gg/123456/team1-vs-team2")
     
+        compact (bool): Replace the per-cell "matchups" of every player matrix
+                        with "matrix" integer grids (kills, deaths, diff),
+                        indexed by row_players and column_players positions.
+        include (str): Comma-separated sections to build, e.g. "maps" or
+                       "stats,maps,rounds". The header (teams, score, streams,
+                       tournament, date, patch, notes) is always returned. "rounds",
+                       "matrix" and "adv_stats" are added to each entry of
+                       match_maps; the performance tab of each map is only
+                       fetched for "matrix" and "adv_stats". Sections not listed
+                       are left out of the response. Defaults to everything.
+                       Upcoming matches only build the header; their stats and
+                       match_maps are empty.
+    
     Returns:
         Match details including teams, score, maps, player stats, and stream links.
     """
-    return vlr.vlr_match_details(match_id)
+    return json_response(request, await vlr.vlr_match_details(match_id, compact, include))
+
+
+@router.get("/match/{match_id}/maps/{game_id}")
+@limiter.limit("600/minute")
+async def VLR_match_map(
+    request: Request,
+    match_id: str,
+    game_id: str,
+    compact: bool = Query(False, description="Return the player matrix as integer grids only (default: false)"),
+    include: str = Query(
+        None,
+        description="Comma-separated sections to build: maps, rounds, matrix, adv_stats (default: all)",
+        pattern=f"^{MATCH_SECTIONS_PATTERN}(,{MATCH_SECTIONS_PATTERN})*$",
+    )
+):
+    """
+    Get a single map of a match: its scoreboard, rounds, player matrix and advanced stats.
+
+    Only the match page and the performance tab of this game are fetched,
+    instead of the tabs of every map as /match/{match_id} does.
+
+    Args:
+        match_id (str): The match, in any form /match/{match_id} accepts.
+        game_id (str): The map's game_id, as listed in match_maps of /match/{match_id}.
+        compact (bool): Same as for /match/{match_id}.
+        include (str): Same as for /match/{match_id}; "rounds", "matrix" and
+                       "adv_stats" select what is added to the map's scoreboard.
+
+    Returns:
+        The match_id and match_status of the match, and the map under match_map
+        with the same fields as an entry of match_maps. Status 404 with an error
+        if the match has no such map.
+    """
+    return json_response(request, await vlr.vlr_match_map(match_id, game_id, compact, include))
+
+
+@router.post("/matches/details")
+@limiter.limit("60/minute")
+async def VLR_match_details_batch(
+    request: Request,
+    matches: list[str] = Body(..., embed=True, min_length=1, max_length=MAX_BATCH_SIZE),
+    concurrency: int = Query(None, description="Maximum number of matches scraped at the same time (default: 8)", ge=1, le=16),
+    format: str = Query("json", description="Response format: json or ndjson (default: json)", pattern="^(json|ndjson)$")
+):
+    """
+    Get the details of several matches in one request.
+
+    The body is {"matches": [...]} with up to 100 match IDs, paths or URLs, in
+    any form /match/{match_id} accepts. Matches are scraped concurrently; page
+    fetches still share the process-wide limit on requests to vlr.gg.
+
+    Every match gets a record: {"match": ..., "data": ...} with what
+    /match/{match_id} returns, or {"match": ..., "error": ...} if scraping it
+    raised. With format=json the records come in request order under
+    data.segments; "ndjson" streams one record per line as soon as the match
+    is done, followed by a final {"meta": {...}} line.
+    """
+    if format == "ndjson":
+        records = vlr.vlr_match_details_stream(matches, concurrency)
+        return StreamingResponse(ndjson_lines(records), media_type="application/x-ndjson")
+    return json_response(request, await vlr.vlr_match_details_batch(matches, concurrency))
 
 
 @router.get("/health")
-def health():
-    return vlr.check_health()
+async def health():
+    return ORJSONResponse(await vlr.check_health())
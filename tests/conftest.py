@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Keep the tests off the on-disk store and quiet; both are read at import time
+os.environ.setdefault("VLR_STORE_PATH", "")
+os.environ.setdefault("VLR_LOG_LEVEL", "WARNING")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,31 @@
+import asyncio
+
+from api.scrapers import matchDetails
+
+
+async def _fake_details(match_url, compact=False, include=None):
+    if match_url == "bad":
+        raise ValueError("boom")
+    return {"data": {"status": 200, "match_details": {"match_id": match_url}}}
+
+
+def _stream(match_urls):
+    async def collect():
+        return [record async for record in matchDetails.vlr_match_details_stream(match_urls)]
+
+    return asyncio.run(collect())
+
+
+def test_batch_meta_is_the_same_for_json_and_ndjson(monkeypatch):
+    monkeypatch.setattr(matchDetails, "vlr_match_details", _fake_details)
+    match_urls = ["1", "2", "1", "bad"]
+
+    batch = asyncio.run(matchDetails.vlr_match_details_batch(match_urls))["data"]
+    records = _stream(match_urls)
+
+    expected = {"requested": 4, "unique": 3, "successful": 2, "failed": 1}
+    assert batch["meta"] == expected
+    assert records[-1] == {"meta": expected}
+    # The JSON body still has one record per requested entry, in order
+    assert [segment["match"] for segment in batch["segments"]] == match_urls
+    assert len(records) == 4
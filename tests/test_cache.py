@@ -0,0 +1,97 @@
+import asyncio
+
+from utils import cache
+
+
+def test_concurrent_misses_encode_once(monkeypatch):
+    monkeypatch.setattr(cache, "response_cache", cache.TTLCache())
+    calls = []
+    encodes = []
+    real_encode = cache.encode
+
+    def counting_encode(value):
+        encodes.append(value)
+        return real_encode(value)
+
+    monkeypatch.setattr(cache, "encode", counting_encode)
+
+    @cache.cached("news")
+    async def scrape(page):
+        calls.append(page)
+        await asyncio.sleep(0.01)
+        return {"page": page}
+
+    async def run():
+        return await asyncio.gather(*(scrape(1) for _ in range(20)))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert len(encodes) == 1
+    assert all(result is results[0] for result in results)
+
+
+def _counting_scraper(calls, ttl=None):
+    @cache.cached("news", ttl=ttl)
+    async def scrape(page):
+        calls.append(page)
+        return {"page": page, "call": len(calls)}
+
+    return scrape
+
+
+def test_fresh_hit_does_not_scrape_again(monkeypatch):
+    monkeypatch.setattr(cache, "response_cache", cache.TTLCache())
+    calls = []
+    scrape = _counting_scraper(calls)
+
+    async def run():
+        return await scrape(1), await scrape(1), await scrape(2)
+
+    first, second, other = asyncio.run(run())
+    assert calls == [1, 2]
+    assert second is first
+    assert other["page"] == 2
+
+
+def test_stale_hit_is_served_and_refreshed_once(monkeypatch):
+    monkeypatch.setattr(cache, "response_cache", cache.TTLCache())
+    calls = []
+    # Entries are stale as soon as they are stored
+    scrape = _counting_scraper(calls, ttl=lambda value: 0)
+
+    async def run():
+        first = await scrape(1)
+        stale = await asyncio.gather(*(scrape(1) for _ in range(5)))
+        await asyncio.gather(*cache._background_tasks)
+        return first, stale, cache.response_cache.get(("news", 1)).value
+
+    first, stale, refreshed = asyncio.run(run())
+    assert all(value is first for value in stale)
+    assert calls == [1, 1]
+    assert refreshed["call"] == 2
+
+
+def test_least_recently_used_entries_are_evicted_over_max_bytes():
+    probe = cache.TTLCache()
+    probe.set("probe", {"n": 0}, 60)
+    size = probe._bytes
+
+    # Room for two entries of this size, not three
+    lru = cache.TTLCache(max_bytes=size * 2)
+    lru.set("a", {"n": 1}, 60)
+    lru.set("b", {"n": 2}, 60)
+    assert lru.get("a") is not None
+    lru.set("c", {"n": 3}, 60)
+
+    assert lru.get("b") is None
+    assert lru.get("a").value == {"n": 1}
+    assert lru.get("c").value == {"n": 3}
+    assert lru._bytes <= lru.max_bytes
+
+
+def test_payload_larger_than_max_bytes_is_not_cached():
+    small = cache.TTLCache(max_bytes=8)
+    small.set("big", {"text": "x" * 100}, 60)
+    assert small.get("big") is None
+    assert len(small) == 0
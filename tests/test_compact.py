@@ -0,0 +1,36 @@
+from api.scrapers.matchDetails import compact_match_details
+from api.scrapers.models import MatchupMatrix
+
+
+def _cell(row, column, kills, deaths, diff):
+    return {"row_player": row, "column_player": column, "value1": kills, "value2": deaths, "diff": diff}
+
+
+def _details():
+    matchups = [[_cell("a", "x", "3", "1", "+2"), _cell("a", "y", "", "", "")]]
+    player_matrix = {
+        "game_id": "1",
+        "row_players": [{"name": "a"}],
+        "column_players": [{"name": "x"}, {"name": "y"}],
+        "matchups": matchups,
+        "fk_fd": {"matchups": [[_cell("a", "x", "1", "0", "+1")]]},
+    }
+    return {
+        "data": {
+            "status": 200,
+            "match_details": {"match_maps": [{"game_id": "1", "performance": {"player_matrix": player_matrix}}]},
+        }
+    }
+
+
+def test_compact_builds_grids_without_touching_the_full_payload():
+    data = _details()
+    compact = compact_match_details(data)
+
+    player_matrix = compact["data"]["match_details"]["match_maps"][0]["performance"]["player_matrix"]
+    assert "matchups" not in player_matrix
+    assert player_matrix["matrix"] == MatchupMatrix([[3, None]], [[1, None]], [[2, None]])
+    assert player_matrix["fk_fd"] == {"matrix": MatchupMatrix([[1]], [[0]], [[1]])}
+
+    full = data["data"]["match_details"]["match_maps"][0]["performance"]["player_matrix"]
+    assert "matrix" not in full and "matrix" not in full["fk_fd"]
@@ -0,0 +1,20 @@
+import asyncio
+
+import httpx
+
+from api.scrapers.health import check_health
+from utils import fetch
+
+
+def test_health_does_not_wait_for_upstream_slots(monkeypatch):
+    async def fetcher(url, timeout):
+        return httpx.Response(200, text="ok")
+
+    async def run():
+        # Every upstream slot is taken, as during a large batch request
+        monkeypatch.setattr(fetch, "_upstream_slots", asyncio.Semaphore(0))
+        return await asyncio.wait_for(check_health(), timeout=1)
+
+    monkeypatch.setattr(fetch, "_fetcher", fetcher)
+    results = asyncio.run(run())
+    assert {result["status"] for result in results.values()} == {"Healthy"}
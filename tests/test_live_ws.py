@@ -0,0 +1,33 @@
+import asyncio
+
+from api.live_feed import live_feed
+from routers.vlr_router import VLR_live_ws
+
+
+class ClosingSocket:
+    """A client that connects, sends nothing and disconnects."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def receive(self):
+        await asyncio.sleep(0.01)
+        return {"type": "websocket.disconnect", "code": 1000}
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+
+def test_disconnect_unsubscribes_without_events(monkeypatch):
+    async def idle():
+        # No scores change, so the feed publishes nothing
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(live_feed, "_run", idle)
+    socket = ClosingSocket()
+    asyncio.run(asyncio.wait_for(VLR_live_ws(socket), timeout=1))
+    assert socket.sent == []
+    assert not live_feed._subscribers
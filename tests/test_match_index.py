@@ -0,0 +1,38 @@
+import json
+import os
+
+from selectolax.lexbor import LexborHTMLParser
+
+from api.scrapers.documents import MatchIndex
+from api.scrapers.matchDetails import extract_map_rounds
+from benchmarks.fixtures import FIXTURES_DIR, MANIFEST
+
+
+def _corpus_page(label):
+    with open(os.path.join(FIXTURES_DIR, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    entry = manifest["urls"][f"https://www.vlr.gg/{manifest['match_ids'][label]}"]
+    with open(os.path.join(FIXTURES_DIR, "pages", entry["page"]), encoding="utf-8") as f:
+        return LexborHTMLParser(f.read())
+
+
+def test_each_map_reads_the_rounds_in_its_own_stats_div():
+    # On the BO5 page the game ids are 301..305 and map k has 18 + k rounds
+    index = MatchIndex(_corpus_page("bo5"))
+    game_ids = [tab.attributes["data-game-id"] for tab in index.map_tabs()]
+    assert game_ids == ["301", "302", "303", "304", "305"]
+    for position, game_id in enumerate(game_ids):
+        rounds = extract_map_rounds(index, game_id, ["Team A", "Team B"], "map")
+        assert len(rounds) == 18 + position
+        assert [int(r["round_number"]) for r in rounds] == list(range(1, 19 + position))
+
+
+def test_rounds_outside_the_stats_divs_are_taken_in_map_order():
+    tree = LexborHTMLParser(
+        '<div class="vm-stats-game" data-game-id="1"></div>'
+        '<div class="vm-stats-game" data-game-id="2"></div>'
+        '<div class="vlr-rounds" id="first"></div><div class="vlr-rounds" id="second"></div>'
+    )
+    index = MatchIndex(tree)
+    assert index.rounds_for("1").attributes["id"] == "first"
+    assert index.rounds_for("2").attributes["id"] == "second"
@@ -0,0 +1,59 @@
+import asyncio
+import sqlite3
+
+import httpx
+import pytest
+
+from api.scrapers.matchDetails import get_match_details
+from benchmarks.bench_scrapers import reset
+from benchmarks.fixtures import FixtureFetcher
+from utils import fetch
+from utils import store as store_module
+from utils.store import Store
+
+CORPUS = FixtureFetcher()
+BO3 = CORPUS.match_ids["bo3"]
+
+
+class FailingTabs:
+    """Serve the corpus, but answer 503 for every performance tab."""
+
+    async def __call__(self, url, timeout=None):
+        if "tab=performance" in url:
+            return httpx.Response(503, text="", request=httpx.Request("GET", url))
+        return await CORPUS(url, timeout)
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    store = Store(str(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(store_module, "store", store)
+    reset()
+    yield store
+    reset()
+
+
+def _expires_at(store):
+    conn = sqlite3.connect(store.path)
+    try:
+        return conn.execute(
+            "SELECT expires_at FROM entries WHERE kind = 'match' AND key = ?", (BO3,)
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+def test_completed_match_is_stored_forever(monkeypatch, store):
+    monkeypatch.setattr(fetch, "_fetcher", CORPUS)
+    data = asyncio.run(get_match_details(BO3))
+    assert "degraded" not in data["data"]
+    assert _expires_at(store) == (None,)
+
+
+def test_match_with_failed_performance_tabs_is_not_stored_forever(monkeypatch, store):
+    monkeypatch.setattr(fetch, "_fetcher", FailingTabs())
+    data = asyncio.run(get_match_details(BO3))
+    assert data["data"]["degraded"] is True
+    assert data["data"]["match_details"]["match_status"] == "Completed"
+    row = _expires_at(store)
+    assert row is not None and row[0] is not None
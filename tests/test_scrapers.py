@@ -0,0 +1,29 @@
+"""Replay every scraper against the checked-in corpus and compare with its expected output."""
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.bench_scrapers import reset
+from benchmarks.fixtures import FixtureFetcher, expected_path, normalize, scenarios
+from utils import fetch
+from utils.store import store
+
+FETCHER = FixtureFetcher()
+SCENARIOS = dict(scenarios(FETCHER.match_ids))
+
+
+@pytest.fixture(autouse=True)
+def corpus(monkeypatch):
+    monkeypatch.setattr(fetch, "_fetcher", FETCHER)
+    monkeypatch.setattr(store, "enabled", False)
+    reset()
+    yield
+    reset()
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_scraper_output_matches_corpus(name):
+    with open(expected_path(name), encoding="utf-8") as f:
+        expected = json.load(f)
+    assert normalize(asyncio.run(SCENARIOS[name]())) == expected
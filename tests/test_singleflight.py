@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from utils.singleflight import coalesce
+
+
+def test_concurrent_callers_share_one_call():
+    calls = []
+
+    @coalesce("test_shared")
+    async def scrape(page):
+        calls.append(page)
+        await asyncio.sleep(0.01)
+        return {"page": page}
+
+    async def run():
+        return await asyncio.gather(*(scrape(1) for _ in range(10)), scrape(2))
+
+    results = asyncio.run(run())
+    assert sorted(calls) == [1, 2]
+    assert all(result is results[0] for result in results[:10])
+    assert results[10] == {"page": 2}
+
+
+def test_calls_after_completion_run_again():
+    calls = []
+
+    @coalesce("test_again")
+    async def scrape(page):
+        calls.append(page)
+        return page
+
+    async def run():
+        await scrape(1)
+        await scrape(1)
+
+    asyncio.run(run())
+    assert calls == [1, 1]
+
+
+def test_waiters_share_the_exception():
+    calls = []
+
+    @coalesce("test_error")
+    async def scrape(page):
+        calls.append(page)
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def run():
+        return await asyncio.gather(*(scrape(1) for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(isinstance(error, ValueError) for error in errors)
+    with pytest.raises(ValueError):
+        asyncio.run(scrape(1))
@@ -0,0 +1,85 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from utils import store as store_module
+from utils.store import Store, persisted
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    store = Store(str(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(store_module, "store", store)
+    return store
+
+
+def _scraper(calls, lifetime):
+    @persisted("test", key=lambda name: name, ttl=lambda value: lifetime)
+    async def scrape(name):
+        calls.append(name)
+        return {"name": name, "call": len(calls)}
+
+    return scrape
+
+
+def _expires_at(store, key):
+    conn = sqlite3.connect(store.path)
+    try:
+        row = conn.execute(
+            "SELECT expires_at FROM entries WHERE kind = 'test' AND key = ?", (key,)
+        ).fetchone()
+    finally:
+        conn.close()
+    return row
+
+
+def _twice(scrape, name):
+    async def run():
+        return await scrape(name), await scrape(name)
+
+    return asyncio.run(run())
+
+
+def test_ttl_none_keeps_the_entry_forever(store):
+    calls = []
+    first, second = _twice(_scraper(calls, None), "forever")
+    assert calls == ["forever"]
+    assert second == first
+    assert _expires_at(store, "forever") == (None,)
+
+
+def test_ttl_false_does_not_store(store):
+    calls = []
+    _twice(_scraper(calls, False), "never")
+    assert calls == ["never", "never"]
+    assert _expires_at(store, "never") is None
+
+
+def test_ttl_seconds_sets_the_expiry(store):
+    calls = []
+    before = time.time()
+    _twice(_scraper(calls, 120), "later")
+    assert calls == ["later"]
+    (expires_at,) = _expires_at(store, "later")
+    assert before + 120 <= expires_at <= time.time() + 120
+
+
+def test_expired_entries_are_scraped_again(store):
+    calls = []
+    first, second = _twice(_scraper(calls, -1), "expired")
+    assert calls == ["expired", "expired"]
+    assert second["call"] == 2
+
+
+def test_key_none_bypasses_the_store(store):
+    calls = []
+
+    @persisted("test", key=lambda name: None, ttl=lambda value: None)
+    async def scrape(name):
+        calls.append(name)
+        return {"name": name}
+
+    _twice(scrape, "partial")
+    assert calls == ["partial", "partial"]
@@ -0,0 +1,49 @@
+import asyncio
+import sys
+
+import httpx
+
+from main import app
+from utils import timing
+
+
+def _get(path):
+    # In-process transport: the app runs on this thread, where the profiler
+    # is installed
+    async def request():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(request())
+
+
+def test_debug_timing_is_ignored_unless_allowed(monkeypatch):
+    monkeypatch.setattr(timing, "ALLOW_TIMING", False)
+    started = []
+    monkeypatch.setattr(timing, "start", lambda profile=False: started.append(profile))
+    response = _get("/match?q=bogus&debug_timing=1")
+    assert response.status_code == 200
+    assert started == []
+
+
+def test_profiled_error_response_stops_profiler(monkeypatch):
+    monkeypatch.setattr(timing, "ALLOW_TIMING", True)
+    monkeypatch.setattr(timing, "ALLOW_PROFILING", True)
+    # An error response never reaches json_response, so breakdown() is not called
+    for _ in range(2):
+        response = _get("/match?q=bogus&debug_timing=profile")
+        assert response.status_code == 200
+        assert response.json() == {"error": "Invalid query parameter"}
+        assert sys.getprofile() is None
+
+
+def test_breakdown_includes_profile(monkeypatch):
+    monkeypatch.setattr(timing, "ALLOW_PROFILING", True)
+    token = timing.start(profile=True)
+    try:
+        breakdown = timing.current().breakdown()
+    finally:
+        timing.stop(token)
+    assert "top" in breakdown["profile"]
+    assert sys.getprofile() is None
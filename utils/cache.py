@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from utils import timing
+from utils.metrics import CACHE_LOOKUPS
+from utils.serialize import encode
+from utils.singleflight import flights
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached payload is served as fresh, per endpoint. Each value can
+# be overridden with VLR_CACHE_TTL_<ENDPOINT>, e.g. VLR_CACHE_TTL_NEWS=120.
+DEFAULT_TTLS = {
+    "news": 300,
+    "stats": 900,
+    "rankings": 900,
+    "results": 300,
+    "match": 300,
+    "match_map": 300,
+}
+# Once an entry is past its TTL it is still served for this many seconds
+# while a background refresh runs (stale-while-revalidate).
+MAX_STALE = int(os.environ.get("VLR_CACHE_MAX_STALE", 3600))
+# Upper bound on the encoded size (JSON plus compressed variants) of
+# everything held in the cache.
+MAX_BYTES = int(os.environ.get("VLR_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
+
+def ttl_for(endpoint):
+    """Return the configured TTL in seconds for an endpoint."""
+    override = os.environ.get(f"VLR_CACHE_TTL_{endpoint.upper()}")
+    if override is not None:
+        return float(override)
+    return DEFAULT_TTLS.get(endpoint, 60)
+
+
+def _encode(value):
+    try:
+        return encode(value)
+    except TypeError:
+        return None
+
+
+class _Entry:
+    __slots__ = ("value", "body", "fresh_until", "stale_until", "size")
+
+    def __init__(self, value, body, ttl, max_stale):
+        now = time.monotonic()
+        self.value = value
+        self.body = body
+        self.fresh_until = now + ttl
+        self.stale_until = self.fresh_until + max_stale
+        self.size = body.size if body is not None else 0
+
+
+class TTLCache:
+    """
+    LRU cache with per-entry TTLs and a cap on the encoded payload size.
+
+    Entries past their TTL are kept for a grace period so callers can serve
+    them while a refresh happens in the background.
+
+    Each payload is serialized once when it is stored, and the resulting
+    EncodedBody (JSON bytes, gzip/br variants and ETag) lives next to it, so
+    serving a cached payload over HTTP does no encoding work at all.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, max_stale=MAX_STALE):
+        self.max_bytes = max_bytes
+        self.max_stale = max_stale
+        self._entries = OrderedDict()
+        # id() of each cached payload -> its key, to find the entry of a
+        # payload the caller got back from a cached scraper
+        self._keys = {}
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the entry for key, or None if absent or too stale to serve."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() > entry.stale_until:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key, value, ttl):
+        entry = _Entry(value, _encode(value), ttl, self.max_stale)
+        if entry.size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._keys[id(value)] = key
+        self._bytes += entry.size
+        self._evict()
+
+    def encoded(self, value):
+        """
+        Return the EncodedBody of a payload.
+
+        The body of a payload held by the cache gets its compressed variants
+        on first use and is reused afterwards. Any other payload is encoded
+        for this one response and left uncompressed, since compressing it
+        would be paid again on every request.
+        """
+        entry = self._entries.get(self._keys.get(id(value)))
+        if entry is None or entry.value is not value or entry.body is None:
+            return encode(value)
+        if entry.body.gzip is None:
+            entry.body.compress()
+            self._bytes += entry.body.size - entry.size
+            entry.size = entry.body.size
+            self._evict()
+        return entry.body
+
+    def clear(self):
+        self._entries.clear()
+        self._keys.clear()
+        self._bytes = 0
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        if self._keys.get(id(entry.value)) == key:
+            del self._keys[id(entry.value)]
+        self._bytes -= entry.size
+
+
+response_cache = TTLCache()
+_refreshing = set()
+_background_tasks = set()
+
+
+def cached(endpoint, key=None, ttl=None):
+    """
+    Cache the result of an async scraper in response_cache.
+
+    Args:
+        endpoint (str): Endpoint name, used in the cache key and to look up its TTL
+        key (callable, optional): Maps the scraper's arguments to a normalized,
+            hashable tuple. Defaults to the positional arguments as given.
+        ttl (callable, optional): Maps a result to its TTL in seconds, None for
+            the endpoint's configured TTL, or False to not cache it
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if timing.current() is not None:
+                return await func(*args, **kwargs)
+            params = key(*args, **kwargs) if key else args + tuple(sorted(kwargs.items()))
+            cache_key = (endpoint,) + tuple(params)
+            entry = response_cache.get(cache_key)
+            if entry is not None:
+                if time.monotonic() > entry.fresh_until:
+                    CACHE_LOOKUPS.labels("response", endpoint, "stale").inc()
+                    _refresh(cache_key, endpoint, ttl, func, args, kwargs)
+                else:
+                    CACHE_LOOKUPS.labels("response", endpoint, "hit").inc()
+                return entry.value
+            CACHE_LOOKUPS.labels("response", endpoint, "miss").inc()
+
+            # Concurrent misses for the same key share a single scrape, and
+            # only the caller running it encodes and stores the result
+            async def scrape():
+                value = await func(*args, **kwargs)
+                _store(cache_key, endpoint, ttl, value)
+                return value
+
+            return await flights.do(cache_key, scrape)
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
+
+
+def _store(cache_key, endpoint, ttl, value):
+    lifetime = ttl(value) if ttl else None
+    if lifetime is None:
+        lifetime = ttl_for(endpoint)
+    if lifetime is not False:
+        response_cache.set(cache_key, value, lifetime)
+
+
+def _refresh(cache_key, endpoint, ttl, func, args, kwargs):
+    if cache_key in _refreshing:
+        return
+    _refreshing.add(cache_key)
+
+    async def run():
+        try:
+            _store(cache_key, endpoint, ttl, await func(*args, **kwargs))
+        except Exception as e:
+            logger.warning("Background refresh of %s failed: %s", cache_key, e)
+        finally:
+            _refreshing.discard(cache_key)
+
+    task = asyncio.ensure_future(run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+import httpx
+
+from utils import timing
+from utils.metrics import (
+    CACHE_LOOKUPS,
+    PARSE_LATENCY,
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_LATENCY,
+    UPSTREAM_RESPONSES,
+    page_type,
+)
+from utils.utils import headers
+
+# A single pooled client per process; every scraper goes through it so
+# keep-alive connections to vlr.gg are reused across requests.
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_TIMEOUT = 30.0
+# Requests to vlr.gg in flight at once across the whole process; further
+# fetches wait for a free slot. Kept below MAX_CONNECTIONS.
+UPSTREAM_CONCURRENCY = int(os.environ.get("VLR_UPSTREAM_CONCURRENCY", 16))
+# Number of (url, parser) results kept by fetch_parsed.
+PARSE_MEMO_SIZE = int(os.environ.get("VLR_PARSE_MEMO_SIZE", 128))
+
+_client = None
+_fetcher = None
+_upstream_slots = None
+_parsed = OrderedDict()
+
+
+def get_client():
+    """Return the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers=headers,
+            timeout=httpx.Timeout(DEFAULT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            follow_redirects=True,
+        )
+    return _client
+
+
+def set_fetcher(fetcher):
+    """
+    Route every fetch() through fetcher instead of the HTTP client.
+
+    Args:
+        fetcher (callable): Async callable taking (url, timeout) and returning an
+            httpx.Response, e.g. one that serves saved pages. None restores the
+            shared client.
+
+    Returns:
+        The previously installed fetcher, or None.
+    """
+    global _fetcher
+    previous = _fetcher
+    _fetcher = fetcher
+    return previous
+
+
+async def fetch(url, timeout=None, headers=None, limited=True):
+    """
+    GET a page through the shared client, or the fetcher installed with set_fetcher.
+
+    At most UPSTREAM_CONCURRENCY fetches are in flight at once, whichever
+    requests they belong to.
+
+    Args:
+        url (str): Absolute URL to fetch
+        timeout (float, optional): Per-request timeout overriding the client default
+        headers (dict, optional): Extra request headers; not passed to an installed fetcher
+        limited (bool, optional): False skips the UPSTREAM_CONCURRENCY wait, for
+            probes such as /health that must answer while batch scrapes hold
+            every slot
+
+    Returns:
+        httpx.Response
+    """
+    global _upstream_slots
+    if not limited:
+        return await _fetch(url, timeout, headers)
+    # Created lazily so the semaphore belongs to the running event loop.
+    if _upstream_slots is None:
+        _upstream_slots = asyncio.Semaphore(UPSTREAM_CONCURRENCY)
+    async with _upstream_slots:
+        return await _fetch(url, timeout, headers)
+
+
+async def _fetch(url, timeout, headers):
+    page = page_type(url)
+    status = "error"
+    UPSTREAM_IN_FLIGHT.labels(page).inc()
+    start = time.perf_counter()
+    try:
+        resp = await _get(url, timeout, headers)
+        status = str(resp.status_code)
+        return resp
+    finally:
+        elapsed = time.perf_counter() - start
+        UPSTREAM_IN_FLIGHT.labels(page).dec()
+        UPSTREAM_LATENCY.labels(page).observe(elapsed)
+        UPSTREAM_RESPONSES.labels(page, status).inc()
+        request_timing = timing.current()
+        if request_timing is not None:
+            request_timing.add_fetch(url, status, elapsed)
+
+
+async def _get(url, timeout, headers):
+    if _fetcher is not None:
+        return await _fetcher(url, timeout)
+    client = get_client()
+    if timeout is None:
+        return await client.get(url, headers=headers)
+    return await client.get(url, headers=headers, timeout=timeout)
+
+
+def _scraper_name(parse):
+    # _parse_news -> news
+    return parse.__name__.lstrip("_").replace("parse_", "", 1)
+
+
+class _Parsed:
+    __slots__ = ("value", "digest", "etag", "last_modified")
+
+    def __init__(self, value, digest):
+        self.value = value
+        self.digest = digest
+        self.etag = None
+        self.last_modified = None
+
+
+async def fetch_parsed(url, parse, timeout=None):
+    """
+    Fetch a page and parse it, skipping both steps as far as possible when it has not changed.
+
+    The ETag and Last-Modified of the last 200 response for url are sent back
+    as If-None-Match and If-Modified-Since. On a 304, or when the body hashes
+    to the same digest as last time, the value parse returned last time is
+    reused without parsing again. parse must depend on nothing but the page
+    text, and callers must not mutate the value it returns.
+
+    Args:
+        url (str): Absolute URL to fetch
+        parse (callable): Turns the page text into the value to return
+        timeout (float, optional): Per-request timeout overriding the client default
+
+    Returns:
+        tuple: (status_code, value); value is None unless the page was fetched
+            successfully, and a 304 is reported as 200
+    """
+    key = (url, parse)
+    # A timed request parses every page so the breakdown shows the real cost
+    memo = _parsed.get(key) if timing.current() is None else None
+    conditional = {}
+    if memo is not None:
+        if memo.etag:
+            conditional["If-None-Match"] = memo.etag
+        if memo.last_modified:
+            conditional["If-Modified-Since"] = memo.last_modified
+
+    resp = await fetch(url, timeout, headers=conditional or None)
+    if resp.status_code == 304 and memo is not None:
+        CACHE_LOOKUPS.labels("parse", page_type(url), "hit").inc()
+        _parsed.move_to_end(key)
+        return 200, memo.value
+    if resp.status_code != 200:
+        return resp.status_code, None
+
+    digest = hashlib.blake2b(resp.content, digest_size=16).digest()
+    if memo is None or memo.digest != digest:
+        CACHE_LOOKUPS.labels("parse", page_type(url), "miss").inc()
+        with PARSE_LATENCY.labels(_scraper_name(parse)).time(), timing.parsing(url):
+            memo = _Parsed(parse(resp.text), digest)
+    else:
+        CACHE_LOOKUPS.labels("parse", page_type(url), "hit").inc()
+    memo.etag = resp.headers.get("etag")
+    memo.last_modified = resp.headers.get("last-modified")
+    _parsed[key] = memo
+    _parsed.move_to_end(key)
+    while len(_parsed) > PARSE_MEMO_SIZE:
+        _parsed.popitem(last=False)
+    return 200, memo.value
+
+
+def clear_parsed():
+    """Forget every value memoized by fetch_parsed."""
+    _parsed.clear()
+
+
+async def close_client():
+    """Close the shared client; called on application shutdown."""
+    global _client, _upstream_slots
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _upstream_slots = None
@@ -0,0 +1,93 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+
+import orjson
+
+from utils.serialize import OPTIONS
+
+# Level of the root logger; DEBUG also logs what the extractors find on every page.
+LOG_LEVEL = os.environ.get("VLR_LOG_LEVEL", "INFO").upper()
+# "json" writes one JSON object per line, "text" plain human-readable lines.
+LOG_FORMAT = os.environ.get("VLR_LOG_FORMAT", "json")
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else came in through extra= and
+# is added to the JSON object as is. uvicorn adds an ANSI-coloured copy of
+# its messages as color_message.
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "taskName",
+    "color_message",
+}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as a single-line JSON object."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str, option=OPTIONS).decode()
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    # QueueHandler.prepare() formats the message in the logging thread so the
+    # record can be pickled; the queue never leaves the process, so leave the
+    # formatting to the listener thread. Log arguments must therefore not be
+    # mutated after the call, which holds for the ids, counts and strings
+    # logged here.
+    def prepare(self, record):
+        return record
+
+
+def configure_logging(level=LOG_LEVEL, fmt=LOG_FORMAT):
+    """
+    Send every log record through a queue to a stderr handler on its own thread.
+
+    Callers only pay for the level check and an enqueue; formatting and the
+    write happen on the listener thread. Calling this again is a no-op.
+
+    Returns:
+        logging.handlers.QueueListener: The running listener
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers[:] = [_DeferredQueueHandler(log_queue)]
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Write out the records still queued and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
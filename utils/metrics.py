@@ -0,0 +1,67 @@
+from urllib.parse import urlsplit
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Parsing a page takes milliseconds, well below the default buckets.
+PARSE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+UPSTREAM_LATENCY = Histogram(
+    "vlr_upstream_fetch_seconds",
+    "Time to fetch a page from vlr.gg, by page type",
+    ["page"],
+)
+UPSTREAM_RESPONSES = Counter(
+    "vlr_upstream_responses_total",
+    "Responses from vlr.gg by page type and status code ('error' when no response arrived)",
+    ["page", "status"],
+)
+UPSTREAM_RETRIES = Counter(
+    "vlr_upstream_retries_total",
+    "Fetches of a vlr.gg page retried after a failed attempt",
+    ["page"],
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "vlr_upstream_requests_in_flight",
+    "Requests to vlr.gg currently waiting for a response",
+    ["page"],
+)
+PARSE_LATENCY = Histogram(
+    "vlr_parse_seconds",
+    "Time to parse a page and extract its data, by scraper",
+    ["scraper"],
+    buckets=PARSE_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "vlr_cache_lookups_total",
+    "Cache lookups by cache, entry kind and result (hit, stale or miss)",
+    ["cache", "kind", "result"],
+)
+HTTP_LATENCY = Histogram(
+    "vlr_http_request_seconds",
+    "Time to produce an API response, by route",
+    ["route"],
+)
+HTTP_IN_FLIGHT = Gauge(
+    "vlr_http_requests_in_flight",
+    "API requests currently being handled",
+)
+
+
+def page_type(url):
+    """Classify a vlr.gg URL for the upstream metrics labels."""
+    parts = urlsplit(url)
+    if not parts.netloc.endswith("vlr.gg"):
+        return "other"
+    if "tab=performance" in parts.query:
+        return "performance"
+    segments = [s for s in parts.path.split("/") if s]
+    if not segments:
+        return "homepage"
+    if segments[0].isdigit():
+        return "match"
+    if segments[:2] == ["matches", "results"]:
+        return "results"
+    if segments[0] in ("news", "stats", "rankings"):
+        return segments[0]
+    return "other"
+
@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Async token bucket: at most `rate` acquisitions per second on average,
+    with bursts of up to `capacity`.
+
+    Shared by every caller in the process, so concurrent scrapes together
+    stay within one polite request rate towards vlr.gg.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        # Created lazily so the lock belongs to the running event loop.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+
+import orjson
+
+try:
+    import brotli
+except ImportError:  # br is only offered when the brotli package is installed
+    brotli = None
+
+# Same options as fastapi.responses.ORJSONResponse, so a payload serializes
+# the same way everywhere it is written out.
+OPTIONS = orjson.OPT_NON_STR_KEYS
+# Bodies smaller than this are always sent uncompressed.
+MIN_COMPRESS_SIZE = 500
+# Variants are compressed once per cached payload, so favour ratio over speed.
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+
+def dumps(value):
+    """Serialize a response payload (dicts, lists and result dataclasses) to JSON bytes."""
+    return orjson.dumps(value, option=OPTIONS)
+
+
+def loads(data):
+    return orjson.loads(data)
+
+
+def to_builtins(value):
+    """Return value with every dataclass turned into plain dicts and lists."""
+    return orjson.loads(dumps(value))
+
+
+def _parse_qvalue(param):
+    try:
+        return float(param.split("=", 1)[1])
+    except (IndexError, ValueError):
+        return 1.0
+
+
+class EncodedBody:
+    """
+    The JSON body of a response, ready to send as is.
+
+    The strong ETag is derived from the JSON bytes; each content coding gets
+    its own tag ("<hash>-gzip", "<hash>-br") since the bytes on the wire
+    differ. compress() fills in the gzip and br variants.
+    """
+
+    __slots__ = ("identity", "gzip", "br", "etag")
+
+    def __init__(self, identity):
+        self.identity = identity
+        self.gzip = None
+        self.br = None
+        self.etag = f'"{hashlib.blake2b(identity, digest_size=16).hexdigest()}"'
+
+    @property
+    def size(self):
+        return sum(len(body) for body in (self.identity, self.gzip, self.br) if body)
+
+    def compress(self):
+        """Precompute the compressed variants; a no-op for small or already compressed bodies."""
+        if self.gzip is not None or len(self.identity) < MIN_COMPRESS_SIZE:
+            return
+        self.gzip = gzip.compress(self.identity, compresslevel=GZIP_LEVEL)
+        if brotli is not None:
+            self.br = brotli.compress(self.identity, quality=BROTLI_QUALITY)
+
+    def negotiate(self, accept_encoding):
+        """Return the best coding available for an Accept-Encoding header, or None."""
+        accepted = {}
+        for item in (accept_encoding or "").lower().split(","):
+            coding, *params = [part.strip() for part in item.split(";")]
+            q = next((_parse_qvalue(p) for p in params if p.startswith("q=")), 1.0)
+            accepted[coding] = q
+        for coding in ("br", "gzip"):
+            if getattr(self, coding) is not None and accepted.get(coding, accepted.get("*", 0)) > 0:
+                return coding
+        return None
+
+    def etag_for(self, coding):
+        return self.etag if coding is None else f'{self.etag[:-1]}-{coding}"'
+
+    def content(self, coding):
+        return self.identity if coding is None else getattr(self, coding)
+
+    def matches(self, if_none_match):
+        """Whether an If-None-Match header names any variant of this body."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags:
+            return True
+        return any(self.etag_for(coding) in tags for coding in (None, "gzip", "br"))
+
+
+def encode(value):
+    """Serialize a payload into an EncodedBody (without compressed variants yet)."""
+    return EncodedBody(dumps(value))
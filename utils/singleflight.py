@@ -0,0 +1,63 @@
+import asyncio
+from functools import wraps
+
+from utils import timing
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same task and receive the same result (or
+    exception). The task is shielded, so a disconnecting client does not
+    cancel the scrape for everyone else.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def do(self, key, func):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved even if every waiter went away.
+        if not task.cancelled():
+            task.exception()
+
+
+flights = SingleFlight()
+
+
+def coalesce(name, key=None):
+    """
+    Share one in-flight execution of an async scraper between identical calls.
+
+    Args:
+        name (str): Namespace for the call, usually the endpoint name
+        key (callable, optional): Maps the scraper's arguments to a normalized,
+            hashable tuple. Defaults to the positional arguments as given.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if timing.current() is not None:
+                # A timed request must do its own work to be able to time it
+                return await func(*args, **kwargs)
+            params = key(*args, **kwargs) if key else args + tuple(sorted(kwargs.items()))
+            return await flights.do((name,) + tuple(params), lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from utils import timing
+from utils.metrics import CACHE_LOOKUPS
+from utils.serialize import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# SQLite file shared by every worker on the node. Set VLR_STORE_PATH to an
+# empty string to disable the store.
+STORE_PATH = os.environ.get("VLR_STORE_PATH", "vlr_store.sqlite3")
+
+# Lifetime in seconds of entries that can still change upstream. Each value
+# can be overridden with VLR_STORE_TTL_<KIND>, e.g. VLR_STORE_TTL_LIVE=15.
+DEFAULT_TTLS = {
+    "live": 30,
+    "upcoming": 300,
+    "results": 300,
+    # Payloads built while part of the upstream pages failed to load
+    "degraded": 60,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (kind, key)
+)
+"""
+
+
+def ttl_for(kind):
+    """Return the configured store TTL in seconds for a kind of entry."""
+    override = os.environ.get(f"VLR_STORE_TTL_{kind.upper()}")
+    if override is not None:
+        return float(override)
+    return DEFAULT_TTLS.get(kind, 60)
+
+
+class Store:
+    """
+    Persistent key/value store for parsed payloads, backed by SQLite in WAL mode.
+
+    Entries are addressed by (kind, key), e.g. ("match", "123456"). An entry
+    without an expiry is kept forever. Values are stored as JSON and come
+    back as plain dicts and lists, not as the dataclasses they were made
+    from. All SQLite work runs in worker threads so the event loop never
+    blocks on disk.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self.enabled = bool(path)
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def _get(self, kind, key):
+        row = self._connect().execute(
+            "SELECT payload, expires_at FROM entries WHERE kind = ? AND key = ?",
+            (kind, key),
+        ).fetchone()
+        if row is None:
+            return None
+        payload, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return None
+        return loads(payload)
+
+    def _put(self, kind, key, value, ttl):
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (kind, key, payload, stored_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (kind, key, dumps(value).decode(), now, None if ttl is None else now + ttl),
+        )
+        conn.commit()
+
+    def _purge(self):
+        conn = self._connect()
+        deleted = conn.execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (time.time(),),
+        ).rowcount
+        conn.commit()
+        return deleted
+
+    async def _run(self, func, *args):
+        if not self.enabled:
+            return None
+        try:
+            return await asyncio.to_thread(func, *args)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            # The store is an optimisation; a read-only or broken disk
+            # must not take the API down with it.
+            logger.warning("Store at %s disabled: %s", self.path, e)
+            self.enabled = False
+            return None
+
+    async def get(self, kind, key):
+        """Return the stored value as plain JSON data, or None if absent or expired."""
+        return await self._run(self._get, kind, key)
+
+    async def put(self, kind, key, value, ttl=None):
+        """
+        Store a JSON-serializable value (dicts, lists and result dataclasses).
+
+        Args:
+            ttl (float, optional): Seconds until the entry expires; None keeps it forever
+        """
+        await self._run(self._put, kind, key, value, ttl)
+
+    async def purge(self):
+        """Delete expired entries and return how many were removed."""
+        return await self._run(self._purge) or 0
+
+
+store = Store()
+
+
+def persisted(kind, key, ttl):
+    """
+    Serve an async scraper from the persistent store when possible.
+
+    Args:
+        kind (str): Namespace of the entries in the store
+        key (callable): Maps the scraper's arguments to the entry key (str), or
+            None when the call should bypass the store
+        ttl (callable): Maps a result to its lifetime in seconds, None to keep it
+            forever, or False to not store it at all
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            entry_key = key(*args, **kwargs)
+            if entry_key is None or timing.current() is not None:
+                return await func(*args, **kwargs)
+
+            value = await store.get(kind, entry_key)
+            if value is not None:
+                CACHE_LOOKUPS.labels("store", kind, "hit").inc()
+                return value
+            CACHE_LOOKUPS.labels("store", kind, "miss").inc()
+
+            value = await func(*args, **kwargs)
+            lifetime = ttl(value)
+            if lifetime is not False:
+                await store.put(kind, entry_key, value, lifetime)
+            return value
+
+        wrapper.unpersisted = func
+        return wrapper
+
+    return decorator
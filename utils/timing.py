@@ -0,0 +1,189 @@
+"""
+Opt-in timing breakdown of a single request.
+
+With VLR_ALLOW_DEBUG_TIMING=1, a request sent with ?debug_timing=1 (or an
+X-Debug-Timing: 1 header) runs with a RequestTiming in a context variable. Upstream fetches, page parsing
+and the match detail extractors record into it; every other request pays a
+single ContextVar lookup at each of those points.
+
+Such a request bypasses the response cache, the store, request coalescing
+and the parse memo, so its breakdown covers the actual scraping work.
+"""
+import contextvars
+import cProfile
+import inspect
+import io
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# ?debug_timing is ignored unless VLR_ALLOW_DEBUG_TIMING=1: a timed request
+# skips every cache, so on a public deployment it would let any client force
+# a full scrape of vlr.gg.
+ALLOW_TIMING = os.environ.get("VLR_ALLOW_DEBUG_TIMING") == "1"
+# ?debug_timing=profile also runs the request under cProfile. Off unless
+# VLR_ALLOW_PROFILING=1, since profiling slows down the whole process.
+ALLOW_PROFILING = os.environ.get("VLR_ALLOW_PROFILING") == "1"
+# Directory profile snapshots are written to (as <timestamp>.prof, for
+# pstats or snakeviz); they are only summarized in the response when unset.
+PROFILE_DIR = os.environ.get("VLR_PROFILE_DIR")
+# Functions listed in the profile summary of a response.
+PROFILE_TOP = 25
+
+_current = contextvars.ContextVar("request_timing", default=None)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+class RequestTiming:
+    """Timings collected while one request is handled."""
+
+    def __init__(self, profile=False):
+        self.started = time.perf_counter()
+        self.fetches = []
+        self.parses = []
+        self.stages = {}
+        self.serialize = None
+        self.profile = None
+        self._profiler = None
+        if profile:
+            self._profiler = cProfile.Profile()
+            try:
+                self._profiler.enable()
+            except RuntimeError:
+                # Another profiler (a concurrent profiled request) is running
+                self._profiler = None
+
+    def add_fetch(self, url, status, seconds):
+        self.fetches.append({"url": url, "status": status, "ms": _ms(seconds)})
+
+    def add_parse(self, page, seconds):
+        self.parses.append({"page": page, "ms": _ms(seconds)})
+
+    def add_stage(self, name, seconds):
+        stage = self.stages.setdefault(name, {"ms": 0.0, "calls": 0})
+        stage["ms"] = round(stage["ms"] + _ms(seconds), 3)
+        stage["calls"] += 1
+
+    def close(self):
+        """Disable the profiler, if any; called when the request ends, however it ends."""
+        if self._profiler is not None:
+            self._profiler.disable()
+
+    def _read_profile(self):
+        if self._profiler is None or self.profile is not None:
+            return
+        out = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(PROFILE_TOP)
+        self.profile = {"top": out.getvalue()}
+        if PROFILE_DIR:
+            path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
+            stats.dump_stats(path)
+            self.profile["path"] = path
+
+    def breakdown(self):
+        """
+        Return the breakdown as a dict.
+
+        Stages are inclusive wall times, so nested stages (and the fetches
+        awaited inside them) are counted in their parents too. Serialization
+        happens after this is built and is only reported in Server-Timing.
+        The profile summary covers the request up to this call.
+        """
+        self._read_profile()
+        result = {
+            "total_ms": _ms(time.perf_counter() - self.started),
+            "fetch": {
+                "total_ms": round(sum(f["ms"] for f in self.fetches), 3),
+                "requests": self.fetches,
+            },
+            "parse": {
+                "total_ms": round(sum(p["ms"] for p in self.parses), 3),
+                "pages": self.parses,
+            },
+            "stages": self.stages,
+        }
+        if self.profile is not None:
+            result["profile"] = self.profile
+        return result
+
+    def server_timing(self):
+        """Return the Server-Timing header value summarizing the breakdown."""
+        metrics = [
+            f"fetch;dur={sum(f['ms'] for f in self.fetches):.3f}",
+            f"parse;dur={sum(p['ms'] for p in self.parses):.3f}",
+        ]
+        metrics.extend(f"{name};dur={stage['ms']:.3f}" for name, stage in self.stages.items())
+        if self.serialize is not None:
+            metrics.append(f"serialize;dur={_ms(self.serialize):.3f}")
+        metrics.append(f"total;dur={_ms(time.perf_counter() - self.started):.3f}")
+        return ", ".join(metrics)
+
+
+def current():
+    """Return the RequestTiming of the request being handled, or None."""
+    return _current.get()
+
+
+def start(profile=False):
+    """Start timing the current request; returns the token for stop()."""
+    return _current.set(RequestTiming(profile and ALLOW_PROFILING))
+
+
+def stop(token):
+    """Stop timing the current request; always disables its profiler."""
+    request_timing = _current.get()
+    _current.reset(token)
+    if request_timing is not None:
+        request_timing.close()
+
+
+@contextmanager
+def stage(name):
+    """Time a block as an extractor stage of the current request, if it is timed."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add_stage(name, time.perf_counter() - started)
+
+
+@contextmanager
+def parsing(page):
+    """Time the parsing of a page (URL or page number) for the current request, if it is timed."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add_parse(page, time.perf_counter() - started)
+
+
+def timed(func):
+    """Record every call of a (sync or async) function as a stage named after it."""
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with stage(func.__name__):
+                return await func(*args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with stage(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper